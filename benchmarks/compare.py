@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Compare benchmark results, as written by ``pytest --benchmark-json``, against a baseline.
+
+If the baseline does not exist the results are copied to it.
+
+Exits with a non-zero status if the mean time of any benchmark is more than
+``--threshold`` percent slower than in the baseline.
+"""
+
+# stdlib
+import argparse
+import shutil
+import sys
+from typing import Dict, List, Optional
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+
+
+def load_means(filename: PathPlus) -> Dict[str, float]:
+	"""
+	Returns a mapping of benchmark names to their mean times, in seconds.
+
+	:param filename: A JSON file written by ``pytest --benchmark-json``.
+	"""
+
+	return {benchmark["fullname"]: benchmark["stats"]["mean"] for benchmark in filename.load_json()["benchmarks"]}
+
+
+def compare(baseline: Dict[str, float], results: Dict[str, float], threshold: float) -> List[str]:
+	"""
+	Returns the names of the benchmarks which have regressed.
+
+	:param baseline: Mapping of benchmark names to their mean times in the baseline.
+	:param results: Mapping of benchmark names to their mean times in the new results.
+	:param threshold: The percentage by which a benchmark may be slower than the baseline.
+	"""
+
+	regressions = []
+
+	print(f"{'Benchmark':<60} {'Baseline (ms)':>14} {'Now (ms)':>10} {'Change':>8}")
+
+	for name, mean in sorted(results.items()):
+		if name not in baseline:
+			print(f"{name:<60} {'-':>14} {mean * 1000:>10.2f} {'new':>8}")
+			continue
+
+		change = (mean - baseline[name]) / baseline[name] * 100
+		print(f"{name:<60} {baseline[name] * 1000:>14.2f} {mean * 1000:>10.2f} {change:>+7.1f}%")
+
+		if change > threshold:
+			regressions.append(name)
+
+	return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:  # noqa: D103
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("baseline", type=PathPlus, help="The JSON file containing the baseline results.")
+	parser.add_argument("results", type=PathPlus, help="The JSON file containing the new results.")
+	parser.add_argument(
+			"--threshold",
+			type=float,
+			default=10.0,
+			help="The permitted slowdown, as a percentage of the baseline. Default 10.",
+			)
+	args = parser.parse_args(argv)
+
+	if not args.baseline.is_file():
+		args.baseline.parent.maybe_make(parents=True)
+		shutil.copy2(args.results, args.baseline)
+		print(f"No baseline found. Saved the results as the baseline in {args.baseline}")
+		return 0
+
+	regressions = compare(load_means(args.baseline), load_means(args.results), args.threshold)
+
+	if regressions:
+		print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold}%:", file=sys.stderr)
+		for name in regressions:
+			print(f"  {name}", file=sys.stderr)
+		return 1
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
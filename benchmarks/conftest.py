@@ -0,0 +1,186 @@
+# stdlib
+import socket
+import textwrap
+from typing import Iterator, List
+
+# 3rd party
+import pytest
+import shippinglabel.conda
+from domdf_python_tools.paths import PathPlus
+
+pytest_plugins = ("coincidence", )
+
+#: The number of modules in each of the synthetic repositories.
+sizes = {"small": 10, "medium": 100, "large": 1000}
+
+repo_helper_yml = """\
+modname: synthetic_project
+copyright_years: "2021"
+author: "Joe Bloggs"
+email: "joe@example.com"
+version: "1.2.3"
+username: "joebloggs"
+license: 'MIT'
+short_desc: 'A synthetic project for benchmarking repo_helper.'
+
+enable_conda: True
+conda_channels:
+  - conda-forge
+
+console_scripts:
+  - "synthetic-project = synthetic_project.__main__:main"
+
+python_versions:
+  - '3.6'
+  - '3.7'
+  - '3.8'
+  - '3.9'
+
+classifiers:
+  - 'Development Status :: 4 - Beta'
+  - 'Intended Audience :: Developers'
+
+extras_require:
+  all: []
+"""
+
+requirements = ["click>=7.1.2", "packaging>=20.4", "typing-extensions>=3.7.4.3"]
+
+module_template = '''\
+"""
+Synthetic module number {number}.
+"""
+
+__all__ = ["function_{number}", "Class{number}"]
+
+
+def function_{number}(a: int, b: int) -> int:
+	"""
+	Returns the sum of ``a`` and ``b``.
+	"""
+
+	return a + b
+
+
+class Class{number}:
+	"""
+	A synthetic class.
+	"""
+
+	def method(self, value: str) -> str:
+		return value * {number}
+'''
+
+
+def make_synthetic_repository(repo_dir: PathPlus, n_modules: int) -> PathPlus:
+	"""
+	Create a repository containing a ``repo_helper.yml`` file and a package with ``n_modules`` modules,
+	split into subpackages of ten modules each.
+
+	:param repo_dir:
+	:param n_modules:
+	"""  # noqa: D400
+
+	repo_dir.maybe_make(parents=True)
+	(repo_dir / "repo_helper.yml").write_text(repo_helper_yml)
+	(repo_dir / "requirements.txt").write_lines(requirements)
+	(repo_dir / "pyproject.toml").write_lines([
+			"[build-system]",
+			'requires = [ "repo_helper",]',
+			'build-backend = "repo_helper.build"',
+			])
+	(repo_dir / "LICENSE").write_clean("Permission is hereby granted, free of charge...")
+	(repo_dir / "README.rst").write_lines([
+			"=================",
+			"synthetic_project",
+			"=================",
+			'',
+			".. start short_desc",
+			".. end short_desc",
+			'',
+			".. start shields",
+			".. end shields",
+			'',
+			*textwrap.wrap("Lorem ipsum dolor sit amet. " * n_modules),
+			])
+
+	package = repo_dir / "synthetic_project"
+	package.maybe_make()
+	(package / "__init__.py").write_clean('"""\nA synthetic project.\n"""')
+
+	for number in range(n_modules):
+		subpackage = package / f"subpackage_{number // 10}"
+
+		if not subpackage.is_dir():
+			subpackage.mkdir()
+			(subpackage / "__init__.py").touch()
+
+		(subpackage / f"module_{number}.py").write_clean(module_template.format(number=number))
+
+	return repo_dir
+
+
+def make_ini_file(filename: PathPlus, n_sections: int) -> PathPlus:
+	"""
+	Create a tox.ini-style file with ``n_sections`` sections.
+
+	:param filename:
+	:param n_sections:
+	"""
+
+	lines = ["# A synthetic configuration file", '']
+
+	for number in range(n_sections):
+		lines.extend([
+				f"[testenv:env{number}]",
+				f"basepython = python3.{number % 10}",
+				"setenv =",
+				"    PYTHONDEVMODE = 1",
+				f"    ENV_NUMBER = {number}",
+				"deps =",
+				*(f"    requirement-{dep}>=1.{number}" for dep in range(10)),
+				"commands =",
+				"    python --version",
+				"    python -m pytest tests/ {posargs}",
+				'',
+				])
+
+	filename.write_lines(lines)
+	return filename
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+	"""
+	Ensure the benchmarks do not access the network, so the timings are repeatable.
+
+	The listing of packages in the conda channel, used when building conda packages, is replaced with a static one.
+	"""
+
+	def connect(*args, **kwargs):
+		raise OSError("The benchmarks must not access the network.")
+
+	def get_channel_listing(channel: str) -> List[str]:
+		return ["click", "packaging", "typing-extensions"]
+
+	monkeypatch.setattr(socket.socket, "connect", connect)
+	monkeypatch.setattr(shippinglabel.conda, "get_channel_listing", get_channel_listing)
+
+
+@pytest.fixture(params=list(sizes), scope="module")
+def synthetic_repo(request, tmp_path_factory) -> Iterator[PathPlus]:
+	"""
+	Pytest fixture to return a synthetic repository of each size.
+	"""
+
+	repo_dir = PathPlus(tmp_path_factory.mktemp(request.param)) / "synthetic_project"
+	yield make_synthetic_repository(repo_dir, sizes[request.param])
+
+
+@pytest.fixture(params=list(sizes))
+def ini_file(request, tmp_pathplus: PathPlus) -> PathPlus:
+	"""
+	Pytest fixture to return a tox.ini-style file of each size.
+	"""
+
+	return make_ini_file(tmp_pathplus / "tox.ini", sizes[request.param])
@@ -0,0 +1,21 @@
+# this package
+from repo_helper.blocks import ShieldsBlock
+
+
+def test_shields_block(benchmark):
+	block = ShieldsBlock(
+			username="joebloggs",
+			repo_name="synthetic_project",
+			version="1.2.3",
+			conda=True,
+			tests=True,
+			docs=True,
+			docker_shields=True,
+			docker_name="synthetic-project",
+			platforms=["Windows", "macOS", "Linux"],
+			pre_commit=True,
+			primary_conda_channel="conda-forge",
+			)
+
+	shields = benchmark(block.make)
+	assert shields[0] == ".. start shields"
@@ -0,0 +1,71 @@
+# stdlib
+from typing import Callable
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from repo_helper.build import Builder
+
+
+@pytest.mark.parametrize(
+		"build",
+		[
+				pytest.param(Builder.build_wheel, id="wheel"),
+				pytest.param(Builder.build_sdist, id="sdist"),
+				pytest.param(Builder.build_conda, id="conda"),
+				]
+		)
+def test_build(benchmark, synthetic_repo: PathPlus, tmp_pathplus: PathPlus, build: Callable[[Builder], str]):
+
+	def setup():
+		builder = Builder(synthetic_repo, build_dir=tmp_pathplus / "build", out_dir=tmp_pathplus / "dist")
+		return (builder, ), {}
+
+	filename = benchmark.pedantic(build, setup=setup, rounds=3)
+	assert (tmp_pathplus / "dist" / filename).is_file()
+
+
+@pytest.mark.parametrize("conda_format", ["tar.bz2", "conda"])
+def test_conda_format(benchmark, synthetic_repo: PathPlus, tmp_pathplus: PathPlus, conda_format: str):
+	if conda_format == "conda":
+		pytest.importorskip("zstandard")
+
+	def setup():
+		builder = Builder(
+				synthetic_repo,
+				build_dir=tmp_pathplus / "build",
+				out_dir=tmp_pathplus / "dist",
+				conda_format=conda_format,
+				)
+		wheel_file = builder.build_wheel()
+		return (builder, tmp_pathplus / "dist" / wheel_file), {}
+
+	filename = benchmark.pedantic(Builder.convert_wheel_to_conda, setup=setup, rounds=3)
+	benchmark.extra_info["size"] = (tmp_pathplus / "dist" / filename).stat().st_size
+
+
+def test_build_targets(benchmark, synthetic_repo: PathPlus, tmp_pathplus: PathPlus):
+
+	def setup():
+		builder = Builder(synthetic_repo, build_dir=tmp_pathplus / "build", out_dir=tmp_pathplus / "dist")
+		return (builder, ["wheel", "sdist", "conda"]), {}
+
+	results = benchmark.pedantic(Builder.build_targets, setup=setup, rounds=3)
+	assert [result.target for result in results] == ["wheel", "sdist", "conda"]
+
+
+def test_build_wheel_incremental(benchmark, synthetic_repo: PathPlus, tmp_pathplus: PathPlus):
+	options = dict(build_dir=tmp_pathplus / "build", out_dir=tmp_pathplus / "dist", incremental=True)
+
+	# Populate the cache, then rebuild after changing a single file.
+	Builder(synthetic_repo, **options).build_wheel()
+
+	def setup():
+		module = next((synthetic_repo / "synthetic_project").glob("*.py"))
+		module.write_text(module.read_text() + "\n# changed\n")
+		return (Builder(synthetic_repo, **options), ), {}
+
+	filename = benchmark.pedantic(Builder.build_wheel, setup=setup, rounds=3)
+	assert (tmp_pathplus / "dist" / filename).is_file()
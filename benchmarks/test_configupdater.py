@@ -0,0 +1,13 @@
+# this package
+from repo_helper.configupdater2 import ConfigUpdater
+
+
+def test_read(benchmark, ini_file):
+
+	def read():
+		updater = ConfigUpdater()
+		updater.read(str(ini_file))
+		return updater
+
+	updater = benchmark(read)
+	assert "testenv:env0" in updater.sections()
@@ -0,0 +1,23 @@
+# this package
+from repo_helper import configuration
+from repo_helper.configuration import parse_yaml
+
+
+def test_parse_yaml(benchmark, synthetic_repo, monkeypatch):
+	# Time parsing the configuration, not loading it from the cache.
+	monkeypatch.setenv("REPO_HELPER_NO_CONFIG_CACHE", '1')
+
+	def setup():
+		monkeypatch.setattr(configuration, "_config_cache", {})
+		return (synthetic_repo, ), {"allow_unknown_keys": True}
+
+	config = benchmark.pedantic(parse_yaml, setup=setup, rounds=20)
+	assert config["modname"] == "synthetic_project"
+
+
+def test_parse_yaml_cached(benchmark, synthetic_repo, tmp_pathplus, monkeypatch):
+	monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_pathplus / "cache"))
+	monkeypatch.setattr(configuration, "_config_cache", {})
+
+	config = parse_yaml(synthetic_repo, allow_unknown_keys=True)
+	assert benchmark(parse_yaml, synthetic_repo, allow_unknown_keys=True) == config
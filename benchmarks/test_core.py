@@ -0,0 +1,13 @@
+# this package
+from repo_helper.core import RepoHelper
+
+
+def test_run(benchmark, synthetic_repo):
+
+	def run():
+		rh = RepoHelper(synthetic_repo)
+		rh.load_settings()
+		return rh.run()
+
+	managed_files = benchmark.pedantic(run, rounds=3, warmup_rounds=1)
+	assert "tox.ini" in managed_files
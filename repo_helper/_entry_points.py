@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+#
+#  _entry_points.py
+"""
+Index of entry points, cached on disk and keyed on the installed distributions.
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+# stdlib
+import hashlib
+import importlib
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+__all__ = ["get_cache_dir", "distributions_fingerprint", "EntryPoint", "get_entry_points", "load_entry_points"]
+
+_index: Optional[Dict[str, List[List[str]]]] = None
+
+# Incremented whenever the layout of the cache file changes.
+_cache_version = 2
+
+
+class EntryPoint(NamedTuple):
+	"""
+	An entry point provided by an installed distribution.
+	"""
+
+	#: The name of the distribution providing the entry point.
+	distribution: str
+
+	#: The name of the entry point.
+	name: str
+
+	#: The object the entry point refers to, in the form ``module:attribute``.
+	value: str
+
+
+def get_cache_dir() -> str:
+	"""
+	Returns the directory in which ``repo_helper`` stores per-user cache files.
+
+	This is :file:`$XDG_CACHE_HOME/repo_helper`, falling back to :file:`~/.cache/repo_helper`.
+	"""
+
+	cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser('~'), ".cache")
+	return os.path.join(cache_home, "repo_helper")
+
+
+def distributions_fingerprint() -> str:
+	"""
+	Returns a hash which changes whenever distributions are installed, upgraded or removed.
+
+	Only the directories on :py:obj:`sys.path` and their ``.dist-info`` and ``.egg-info`` entries are stat-ed;
+	no metadata files are read.
+	"""
+
+	sha = hashlib.sha256(sys.version.encode("UTF-8"))
+
+	for path_entry in sys.path:
+		path_entry = path_entry or os.curdir
+
+		try:
+			sha.update(f"{path_entry}\0{os.stat(path_entry).st_mtime_ns}\n".encode("UTF-8"))
+			entries = sorted(os.scandir(path_entry), key=lambda e: e.name)
+		except OSError:
+			continue
+
+		for entry in entries:
+			if entry.name.endswith((".dist-info", ".egg-info", ".egg-link")):
+				sha.update(f"{entry.name}\0{entry.stat().st_mtime_ns}\n".encode("UTF-8"))
+
+	return sha.hexdigest()
+
+
+def _build_index() -> Dict[str, List[List[str]]]:
+	# 3rd party
+	from domdf_python_tools.compat import importlib_metadata
+
+	index: Dict[str, List[List[str]]] = {}
+
+	for dist in importlib_metadata.distributions():
+		for entry_point in dist.entry_points:
+			index.setdefault(entry_point.group, []).append([
+					dist.metadata["Name"] or '',
+					entry_point.name,
+					entry_point.value,
+					])
+
+	return index
+
+
+def get_entry_points(group: str) -> List[EntryPoint]:
+	"""
+	Returns the entry points in the given group.
+
+	Entry points with the same name provided by different distributions are all included.
+
+	The index of all entry points is built once and cached on disk, in :func:`~.get_cache_dir`,
+	until the :func:`~.distributions_fingerprint` changes.
+
+	:param group: The entry point group name, e.g. ``'repo_helper.command'``.
+	"""
+
+	global _index
+
+	if _index is None:
+		fingerprint = distributions_fingerprint()
+		cache_file = os.path.join(get_cache_dir(), "entry_points.json")
+
+		try:
+			with open(cache_file, encoding="UTF-8") as fp:
+				cached = json.load(fp)
+			if cached["version"] == _cache_version and cached["fingerprint"] == fingerprint:
+				_index = cached["groups"]
+		except (OSError, ValueError, KeyError, TypeError):
+			pass
+
+		if _index is None:
+			_index = _build_index()
+
+			try:
+				os.makedirs(get_cache_dir(), exist_ok=True)
+				tmp_file = f"{cache_file}.{os.getpid()}"
+				with open(tmp_file, 'w', encoding="UTF-8") as fp:
+					json.dump({"version": _cache_version, "fingerprint": fingerprint, "groups": _index}, fp)
+				os.replace(tmp_file, cache_file)
+			except OSError:
+				pass
+
+	return [EntryPoint(*entry_point) for entry_point in _index.get(group, [])]
+
+
+def load_entry_points(group: str, match_func: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+	"""
+	Returns a list of the objects referred to by entry points in the given group,
+	optionally filtered by ``match_func``.
+
+	:param group: The entry point group name, e.g. ``'repo_helper.command'``.
+	:param match_func: Function taking an object and returning :py:obj:`True`
+		if the object is to be included in the output.
+	:default match_func: :py:obj:`None`, which includes all objects.
+	"""  # noqa: D400
+
+	matching_objects = []
+
+	for entry_point in get_entry_points(group):
+		module_name, _, attrs = entry_point.value.partition(':')
+		obj = importlib.import_module(module_name.strip())
+
+		for attr in filter(None, attrs.split('[')[0].strip().split('.')):
+			obj = getattr(obj, attr)
+
+		if match_func is None or match_func(obj):
+			matching_objects.append(obj)
+
+	return matching_objects
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+#
+#  _log.py
+"""
+Python implementation of ``git log``, which formats entries as the history is walked.
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+# stdlib
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+# 3rd party
+import southwark.log
+from consolekit.terminal_colours import strip_ansi
+from dulwich.objects import Commit
+
+__all__ = ["Log"]
+
+
+class Log(southwark.log.Log):
+	"""
+	Python implementation of ``git log``.
+
+	Unlike :class:`southwark.log.Log`, the entries can be produced one at a time as the history is walked,
+	so they can be written to a pager before the whole log has been formatted.
+
+	:param repo: The git repository.
+	"""
+
+	def iter_log(
+			self,
+			max_entries: Optional[int] = None,
+			reverse: bool = False,
+			from_date: Optional[datetime] = None,
+			from_tag: Optional[str] = None,
+			colour: bool = True
+			) -> Iterator[str]:
+		"""
+		Returns an iterator over the formatted commit log entries.
+
+		Joining the entries gives the same output as :meth:`~southwark.log.Log.log`.
+		The history is only walked as far as the entries are consumed,
+		and if ``from_tag`` is given the walk stops at the tagged commit.
+
+		:param max_entries: Maximum number of entries to display
+		:default max_entries: all entries
+		:param reverse: Print entries in reverse order.
+		:param from_date: Show commits after the given date.
+		:param from_tag: Show commits after the given tag.
+		:param colour: Show coloured output.
+
+		:raises ValueError: If both ``from_date`` and ``from_tag`` are given, or if the tag does not exist.
+		"""
+
+		since: Optional[float] = None
+		stop_at: Optional[bytes] = None
+
+		if from_date is not None and from_tag is not None:
+			raise ValueError("'from_date' and 'from_tag' are exclusive.")
+		elif from_date:
+			since = from_date.timestamp()
+		elif from_tag:
+			for sha, tag in self.tags.items():
+				if tag == from_tag:
+					stop_at = sha.encode("UTF-8")
+					break
+			else:
+				raise ValueError(f"No such tag {from_tag!r}")
+
+		commits: Iterable[Commit] = self._iter_commits(max_entries, since, stop_at)
+
+		if reverse:
+			commits = reversed(list(commits))
+
+		return self._format_entries(commits, colour)
+
+	def _iter_commits(self, max_entries: Optional[int], since: Optional[float], stop_at: Optional[bytes]):
+		"""
+		Walk the history from ``HEAD``, stopping after the commit ``stop_at`` if it is reached.
+
+		:param max_entries:
+		:param since:
+		:param stop_at:
+		"""
+
+		for entry in self.repo.get_walker(max_entries=max_entries, since=since):
+			yield entry.commit
+
+			if entry.commit.id == stop_at:
+				break
+
+	def _format_entries(self, commits: Iterable[Commit], colour: bool) -> Iterator[str]:
+		"""
+		Format the given commits, separating the entries with blank lines.
+
+		:param commits:
+		:param colour:
+		"""
+
+		for idx, commit in enumerate(commits):
+			entry = str(self.format_commit(commit))
+
+			if not colour:
+				entry = strip_ansi(entry)
+
+			yield entry if idx == 0 else '\n' + entry
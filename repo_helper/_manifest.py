@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+#
+#  _manifest.py
+"""
+Select the files to include in a distribution using ``MANIFEST.in``-style rules,
+in a single walk of the source tree.
+"""  # noqa: D400
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+# stdlib
+import os
+import re
+import warnings
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Pattern, Tuple
+
+__all__ = ["Rule", "ManifestRules", "ignored_directories", "translate_pattern"]
+
+#: Directories which are never walked, as in :mod:`distutils`' ``sdist`` command.
+ignored_directories = frozenset({"__pycache__", ".git", ".hg", ".svn", ".bzr", "_darcs", "CVS", "RCS"})
+
+
+def _translate_component(component: str) -> str:
+	"""
+	Translate a single path component of a glob pattern into a regular expression.
+
+	``*`` and ``?`` do not match ``/``.
+
+	:param component:
+	"""
+
+	regex = []
+	i = 0
+
+	while i < len(component):
+		char = component[i]
+		i += 1
+
+		if char == '*':
+			regex.append("[^/]*")
+		elif char == '?':
+			regex.append("[^/]")
+		elif char == '[':
+			end = component.find(']', i + 1 if component[i:i + 1] in {'!', ']'} else i)
+			if end == -1:
+				regex.append(r"\[")
+			else:
+				chars = component[i:end].replace('\\', r"\\")
+				if chars.startswith('!'):
+					chars = '^' + chars[1:]
+				regex.append(f"[{chars}]")
+				i = end + 1
+		else:
+			regex.append(re.escape(char))
+
+	return ''.join(regex)
+
+
+def translate_pattern(pattern: str) -> str:
+	"""
+	Translate a glob pattern, relative to the root of the tree, into a regular expression.
+
+	The pattern has the same meaning as for :meth:`pathlib.Path.glob`:
+	``*`` and ``?`` do not match ``/``, and a ``**`` component matches any number of directories.
+
+	:param pattern:
+	"""
+
+	regex = ''
+
+	for component in pattern.strip('/').split('/'):
+		if component == "**":
+			regex += "(?:[^/]+/)*"
+		elif component not in {'', '.'}:
+			regex += _translate_component(component) + '/'
+
+	return regex[:-1] if regex.endswith('/') else regex
+
+
+def _directories_regex(components: List[str]) -> Optional[Pattern]:
+	"""
+	Returns a regular expression matching the directories which may contain files matched by a pattern,
+	or :py:obj:`None` if the files can only be in the root of the tree.
+
+	Without a ``**`` component the files can only be at a fixed depth,
+	so only the directories matching the pattern's leading components down to that depth are matched.
+
+	:param components: The directory components of the pattern, e.g. ``['pkg', '*', '**']``.
+	"""
+
+	regex = ''
+
+	for component in reversed([component for component in components if component not in {'', '.'}]):
+		if component == "**":
+			regex = ".*"
+		else:
+			regex = _translate_component(component) + (f"(?:/{regex})?" if regex else '')
+
+	return re.compile(regex, re.DOTALL) if regex else None
+
+
+def _pattern_directories(pattern: str) -> List[str]:
+	"""
+	Returns the components of ``pattern`` for the directories containing the files it matches.
+
+	:param pattern:
+	"""
+
+	*directories, last = pattern.strip('/').split('/')
+	return directories + ["**"] if last == "**" else directories
+
+
+class Rule(NamedTuple):
+	"""
+	A single compiled rule.
+	"""
+
+	#: Whether the files matched by the rule are included (:py:obj:`True`) or excluded (:py:obj:`False`).
+	include: bool
+
+	#: Matches the paths, relative to the root of the tree, of the files the rule applies to.
+	regex: Pattern
+
+	#: Matches the paths, relative to the root of the tree, of the directories which may contain
+	#: files the rule applies to. :py:obj:`None` if the files can only be in the root of the tree.
+	directories: Optional[Pattern]
+
+	#: For ``prune`` rules, matches the paths of the directories which are pruned.
+	prune: Optional[Pattern] = None
+
+	#: Whether the files included by the rule have trailing whitespace removed when they are copied.
+	clean: bool = False
+
+
+def _dir_regex(directory: str) -> str:
+	return translate_pattern(directory).rstrip('/')
+
+
+class ManifestRules:
+	"""
+	A set of ``MANIFEST.in``-style rules, compiled to regular expressions.
+
+	The following directives are supported:
+
+	* ``include pattern ...`` and ``exclude pattern ...``
+	* ``recursive-include dir pattern ...`` and ``recursive-exclude dir pattern ...``
+	* ``global-include pattern ...`` and ``global-exclude pattern ...``
+	* ``graft dir`` and ``prune dir``
+
+	Patterns are relative to the root of the tree, and have the same meaning as for :meth:`pathlib.Path.glob`.
+	The rules are applied in order, so a file is included if the last rule which matches it is an include rule.
+
+	:param entries: The rules, e.g. ``'recursive-include repo_helper/templates *'``.
+	"""
+
+	def __init__(self, entries: Iterable[str] = ()):
+		self.rules: List[Rule] = []
+
+		for entry in entries:
+			self.add(entry)
+
+	def add(self, entry: str, clean: bool = False) -> None:
+		"""
+		Compile and add a rule.
+
+		:param entry: The rule, e.g. ``'recursive-include repo_helper/templates *'``.
+		:param clean: Whether the files included by the rule have trailing whitespace removed when they are copied.
+
+		:raises ValueError: If the directive lacks arguments. Unknown directives are ignored with a warning.
+		"""
+
+		directive, *args = entry.split()
+		minimum_args = 2 if directive.startswith("recursive-") else 1
+
+		if len(args) < minimum_args:
+			raise ValueError(f"Not enough arguments for {directive!r} in manifest entry {entry!r}.")
+
+		if directive in {"include", "exclude"}:
+			for pattern in args:
+				directories = _directories_regex(_pattern_directories(pattern))
+				self._add(directive == "include", translate_pattern(pattern), directories, clean)
+
+		elif directive in {"recursive-include", "recursive-exclude"}:
+			directory, *patterns = args
+			dir_regex = _dir_regex(directory)
+			dir_regex = f"{dir_regex}/" if dir_regex else ''
+
+			for pattern in patterns:
+				regex = f"{dir_regex}(?:[^/]+/)*{translate_pattern(pattern)}"
+				directories = _directories_regex([*directory.split('/'), "**"])
+				self._add(directive == "recursive-include", regex, directories, clean)
+
+		elif directive in {"global-include", "global-exclude"}:
+			for pattern in args:
+				regex = f"(?:[^/]+/)*{translate_pattern(pattern)}"
+				self._add(directive == "global-include", regex, _directories_regex(["**"]), clean)
+
+		elif directive in {"graft", "prune"}:
+			for directory in args:
+				dir_regex = _dir_regex(directory)
+				regex = f"{dir_regex}/.+"
+				prune = re.compile(f"{dir_regex}(?:/.*)?") if directive == "prune" else None
+				directories = _directories_regex([*directory.split('/'), "**"])
+				self._add(directive == "graft", regex, directories, clean, prune)
+
+		else:
+			# As with distutils, which only warns about unknown directives in MANIFEST.in.
+			warnings.warn(f"Ignored unknown directive {directive!r} in manifest entry {entry!r}.")
+
+	def _add(
+			self,
+			include: bool,
+			regex: str,
+			directories: Optional[Pattern],
+			clean: bool,
+			prune: Optional[Pattern] = None,
+			) -> None:
+		self.rules.append(Rule(include, re.compile(regex, re.DOTALL), directories, prune, clean))
+
+	def match(self, filename: str) -> Optional[Rule]:
+		"""
+		Returns the last rule which matches ``filename``, or :py:obj:`None` if no rules match.
+
+		:param filename: The path of the file, relative to the root of the tree, in POSIX form.
+		"""
+
+		for rule in reversed(self.rules):
+			if rule.regex.fullmatch(filename):
+				return rule
+
+		return None
+
+	def should_walk(self, directory: str) -> bool:
+		"""
+		Returns whether ``directory`` might contain files which are included by the rules.
+
+		Directories which no include rule applies to, or which are pruned after the last such rule,
+		need not be walked.
+
+		:param directory: The path of the directory, relative to the root of the tree, in POSIX form.
+		"""
+
+		walk = False
+
+		for rule in self.rules:
+			if rule.include:
+				if rule.directories is not None and rule.directories.fullmatch(directory):
+					walk = True
+			elif rule.prune is not None and rule.prune.fullmatch(directory):
+				walk = False
+
+		return walk
+
+	def iter_files(self, root: str) -> Iterator[Tuple[str, Rule]]:
+		"""
+		Walk the tree, and return the files which are included by the rules, sorted by path.
+
+		Directories which cannot contain any included files, and :data:`~.ignored_directories`, are not walked.
+
+		:param root: The root of the tree.
+
+		:returns: An iterator of tuples of the path of each file, relative to ``root`` and in POSIX form,
+			and the rule which included it.
+		"""
+
+		def walk(directory: str, relative_directory: str) -> Iterator[Tuple[str, Rule]]:
+			try:
+				entries = sorted(os.scandir(directory), key=lambda e: e.name)
+			except OSError:
+				return
+
+			for entry in entries:
+				relative_name = relative_directory + entry.name
+
+				if entry.is_dir():
+					if entry.name not in ignored_directories and self.should_walk(relative_name):
+						yield from walk(entry.path, relative_name + '/')
+				elif entry.is_file():
+					rule = self.match(relative_name)
+					if rule is not None and rule.include:
+						yield relative_name, rule
+
+		yield from walk(os.fspath(root), '')
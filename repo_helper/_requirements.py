@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+#
+#  _requirements.py
+"""
+Resolve the tree of requirements of a project from the distributions installed in an environment.
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+# stdlib
+import json
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+# 3rd party
+from domdf_python_tools.compat import importlib_metadata
+from domdf_python_tools.stringlist import StringList
+from shippinglabel import normalize
+from shippinglabel.requirements import ComparableRequirement, marker_environment
+
+__all__ = ["DistributionIndex", "RequirementsTree", "tree_to_json", "tree_to_dot"]
+
+#: The nested list structure returned by :meth:`DistributionIndex.list_requirements`,
+#: where each requirement is followed by a list of its own requirements, if it has any.
+RequirementsTree = List[Union[str, List]]
+
+
+class _CacheEntry(NamedTuple):
+	"""
+	A resolved tree of requirements, cached by :class:`~.DistributionIndex`.
+	"""
+
+	tree: RequirementsTree
+
+	#: The distributions visited while resolving the tree.
+	visited: FrozenSet[Tuple[str, str]]
+
+	#: Those of the visited distributions which were being resolved further up the tree, where cycles were cut.
+	context: FrozenSet[Tuple[str, str]]
+
+
+class DistributionIndex:
+	"""
+	An in-memory index of the distributions installed in an environment, and their requirements.
+
+	Each distribution's metadata is read once, and the requirements of each distribution are only resolved once,
+	however many times it appears in the tree, unless a cycle means they differ depending on where it appears.
+
+	:param path: The directories to search for distributions, such as a virtualenv's ``site-packages``.
+		Defaults to :py:data:`sys.path`.
+	"""
+
+	def __init__(self, path: Optional[List[str]] = None):
+
+		#: Mapping of normalized distribution names to their unparsed requirements.
+		self.requires: Dict[str, List[str]] = {}
+
+		kwargs = {} if path is None else {"path": path}
+
+		for distribution in importlib_metadata.distributions(**kwargs):
+			name = distribution.metadata["Name"]
+
+			# As with importlib_metadata.requires(), the first distribution on the path is used.
+			if name and normalize(name) not in self.requires:
+				self.requires[normalize(name)] = distribution.requires or []
+
+		self._environments: Dict[str, Dict[str, str]] = {}
+		self._cache: Dict[Tuple[str, str, int], List[_CacheEntry]] = {}
+		self._in_progress: Set[Tuple[str, str]] = set()
+
+	def _environment(self, extra: str) -> Dict[str, str]:
+		if extra not in self._environments:
+			self._environments[extra] = marker_environment(extra)
+
+		return self._environments[extra]
+
+	def list_requirements(self, name: str, depth: int = 1) -> RequirementsTree:
+		"""
+		Returns the requirements of the given library, and the requirements of those requirements.
+
+		The result is the same as :func:`shippinglabel.requirements.list_requirements`.
+		If a requirement depends on itself, directly or indirectly, the cycle is not followed.
+
+		:param name:
+		:param depth: The maximum depth to resolve. ``-1`` means infinite depth.
+		"""
+
+		return self._list_requirements(name, depth)[0]
+
+	def _list_requirements(self, name: str, depth: int) -> Tuple[RequirementsTree, AbstractSet[Tuple[str, str]]]:
+		"""
+		Returns the requirements of the given library, and the distributions visited while resolving them.
+
+		Where a cycle is cut depends on which distributions are being resolved further up the tree,
+		so a cached result is only reused if the same distributions it visited are being resolved.
+
+		:param name:
+		:param depth:
+		"""
+
+		req = ComparableRequirement(name)
+		extra = list(req.extras)[0] if req.extras else ''
+
+		# All negative depths mean infinite depth.
+		depth = max(depth, -1)
+		key = (normalize(req.name), extra, depth)
+		node = key[:2]
+
+		if node in self._in_progress:
+			return [], {node}
+
+		if key[0] not in self.requires:
+			return [], set()
+
+		for entry in self._cache.get(key, ()):
+			if entry.context == self._context(entry.visited):
+				return entry.tree, entry.visited
+
+		self._in_progress.add(node)
+		visited = {node}
+
+		try:
+			tree: RequirementsTree = []
+
+			for requirement in [ComparableRequirement(r) for r in sorted(self.requires[key[0]])]:
+				if requirement.marker and not requirement.marker.evaluate(self._environment(extra)):
+					continue
+
+				if depth:
+					tree.append(str(requirement))
+
+				if depth != 0:
+					deps, deps_visited = self._list_requirements(str(requirement), depth=depth - 1)
+					visited.update(deps_visited)
+					if deps:
+						tree.append(deps)
+
+		finally:
+			self._in_progress.discard(node)
+
+		entry = _CacheEntry(tree, frozenset(visited), self._context(visited))
+		self._cache.setdefault(key, []).append(entry)
+
+		return tree, entry.visited
+
+	def _context(self, visited: AbstractSet[Tuple[str, str]]) -> FrozenSet[Tuple[str, str]]:
+		"""
+		Returns the distributions in ``visited`` which are currently being resolved.
+
+		:param visited:
+		"""
+
+		return frozenset(node for node in self._in_progress if node in visited)
+
+
+def _tree_to_nodes(tree: Iterable[Union[str, List]]) -> List[Dict[str, Any]]:
+	nodes: List[Dict[str, Any]] = []
+
+	for item in tree:
+		if isinstance(item, str):
+			nodes.append({"requirement": item, "requirements": []})
+		else:
+			nodes[-1]["requirements"] = _tree_to_nodes(item)
+
+	return nodes
+
+
+def tree_to_json(root: str, tree: RequirementsTree) -> str:
+	"""
+	Format the tree of requirements as JSON.
+
+	Each requirement is represented by an object with the keys ``requirement`` and ``requirements``,
+	the latter being a list of the requirement's own requirements.
+
+	:param root: The project the requirements are for, such as ``'repo_helper==2021.3.12'``.
+	:param tree:
+	"""
+
+	return json.dumps({"requirement": root, "requirements": _tree_to_nodes(tree)}, indent=2)
+
+
+def tree_to_dot(root: str, tree: RequirementsTree) -> str:
+	"""
+	Format the tree of requirements as a `Graphviz <https://graphviz.org/>`_ ``dot`` graph.
+
+	Each distribution is a node, and each edge is labelled with the version specifier of the requirement.
+
+	:param root: The project the requirements are for, such as ``'repo_helper==2021.3.12'``.
+	:param tree:
+	"""
+
+	edges: Dict[str, None] = {}
+
+	def add_edges(parent: str, nodes: List[Dict[str, Any]]):
+		for node in nodes:
+			requirement = ComparableRequirement(node["requirement"])
+			label = f" [label={json.dumps(str(requirement.specifier))}]" if requirement.specifier else ''
+			edges[f"{json.dumps(parent)} -> {json.dumps(requirement.name)}{label};"] = None
+			add_edges(requirement.name, node["requirements"])
+
+	add_edges(ComparableRequirement(root).name, _tree_to_nodes(tree))
+
+	buf = StringList(["digraph requirements {"])
+	buf.indent_type = '\t'
+
+	with buf.with_indent_size(1):
+		buf.extend(edges)
+
+	buf.append('}')
+
+	return str(buf)
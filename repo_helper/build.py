@@ -24,22 +24,32 @@
 #
 
 # stdlib
+import calendar
 import configparser
+import contextlib
+import copy
+import gzip
+import hashlib
+import json
 import os
 import pathlib
 import posixpath
 import re
 import shutil
+import struct
 import sys
 import tarfile
 import tempfile
-from datetime import datetime
+import time
+import zlib
+from base64 import urlsafe_b64encode
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from email.message import EmailMessage
-from io import StringIO
-from subprocess import PIPE, Popen
-from textwrap import dedent, indent
-from typing import Iterator, Optional
-from zipfile import ZipFile
+from functools import partial
+from io import BytesIO, StringIO
+from typing import IO, Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+from zipfile import ZIP64_LIMIT, ZIP_BZIP2, ZIP_DEFLATED, ZIP_LZMA, ZIP_STORED, ZipFile, ZipInfo
 
 # 3rd party
 import click
@@ -48,6 +58,7 @@ from consolekit.utils import abort
 from domdf_python_tools.paths import PathPlus, traverse_to_file
 from domdf_python_tools.stringlist import StringList
 from domdf_python_tools.typing import PathLike
+from domdf_python_tools.utils import strtobool
 from packaging.specifiers import Specifier
 from packaging.version import Version
 from shippinglabel.checksum import get_record_entry
@@ -55,10 +66,144 @@ from shippinglabel.requirements import ComparableRequirement, combine_requiremen
 
 # this package
 from repo_helper import __version__
+from repo_helper._manifest import ManifestRules
 from repo_helper.conda import get_conda_requirements, make_conda_description
 from repo_helper.configuration import parse_yaml
+from repo_helper.profiling import span
 
-__all__ = ["Builder", "build_wheel", "build_sdist"]
+__all__ = [
+		"Builder",
+		"BuildResult",
+		"Compression",
+		"build_wheel",
+		"build_sdist",
+		"build_editable",
+		"get_requires_for_build_wheel",
+		"get_requires_for_build_editable",
+		"prepare_metadata_for_build_wheel",
+		"prepare_metadata_for_build_editable",
+		]
+
+#: The distributions :meth:`Builder.build_targets` can build, in the order they are started.
+_targets = ("wheel", "sdist", "conda")
+
+_conda_formats = ("tar.bz2", "conda")
+
+# The earliest time which can be represented in a zip file.
+# Used for reproducible builds when $SOURCE_DATE_EPOCH is not set.
+_zip_epoch = 315532800
+
+# The largest size or offset which fits in the zip format's headers without the zip64 extension.
+_zip64_limit = ZIP64_LIMIT
+
+_zip_methods = {"stored": ZIP_STORED, "deflated": ZIP_DEFLATED, "bzip2": ZIP_BZIP2, "lzma": ZIP_LZMA}
+
+# Import hook installed by editable wheels, which finds only the package in the repository.
+_editable_finder = """\
+import sys
+from importlib.machinery import PathFinder
+
+NAME = {name!r}
+PATH = {path!r}
+
+
+class EditableFinder:
+
+	@classmethod
+	def find_spec(cls, fullname, path=None, target=None):
+		if fullname == NAME:
+			return PathFinder.find_spec(fullname, [PATH])
+
+		return None
+
+
+def install():
+	if EditableFinder not in sys.meta_path:
+		sys.meta_path.append(EditableFinder)
+"""
+
+# The compression methods, and their valid levels, for each kind of archive.
+# Source distributions must be gzipped tar files (PEP 625), so only the level can be changed.
+_compression_methods: Dict[str, Dict[str, Optional[range]]] = {
+		"wheel": {"stored": None, "deflated": range(0, 10), "bzip2": range(1, 10), "lzma": None},
+		"sdist": {"gz": range(0, 10)},
+		}
+
+
+class BuildResult(NamedTuple):
+	"""
+	The outcome of building a single distribution with :meth:`Builder.build_targets`.
+	"""
+
+	#: The kind of distribution; one of ``'wheel'``, ``'sdist'`` or ``'conda'``.
+	target: str
+
+	#: The filename of the created archive, in the output directory.
+	filename: str
+
+	#: The time taken, in seconds.
+	duration: float
+
+
+class Compression(NamedTuple):
+	"""
+	The compression method and level used for an archive.
+	"""
+
+	#: The compression method. One of ``'stored'``, ``'deflated'``, ``'bzip2'`` or ``'lzma'`` for wheels,
+	#: and ``'gz'`` for source distributions.
+	method: str
+
+	#: The compression level, or :py:obj:`None` to use the method's default.
+	level: Optional[int] = None
+
+	@classmethod
+	def parse(cls, value: str) -> "Compression":
+		"""
+		Parse a compression method and level in the form ``METHOD[:LEVEL]``, such as ``'deflated:9'``.
+
+		:param value:
+		"""
+
+		method, _, level = value.partition(':')
+
+		try:
+			return cls(method.strip().lower(), int(level) if level.strip() else None)
+		except ValueError:
+			raise ValueError(f"Invalid compression level {level!r}.") from None
+
+	def validate(self, artefact: str) -> "Compression":
+		"""
+		Check the method and level are valid for the given kind of archive.
+
+		:param artefact: Either ``'wheel'`` or ``'sdist'``.
+
+		:returns: The :class:`~.Compression` object, unchanged.
+		:raises ValueError: if the method or level is not valid.
+		"""
+
+		methods = _compression_methods[artefact]
+
+		if self.method not in methods:
+			raise ValueError(
+					f"Unknown compression method {self.method!r} for {artefact}s. "
+					f"Choose from {', '.join(map(repr, methods))}."
+					)
+
+		levels = methods[self.method]
+
+		if self.level is not None:
+			if levels is None:
+				raise ValueError(f"The {self.method!r} compression method does not take a level.")
+			elif self.level not in levels:
+				raise ValueError(
+						f"The {self.method!r} compression level must be between {levels[0]} and {levels[-1]}."
+						)
+
+		return self
+
+
+_default_compression = {"wheel": Compression("deflated"), "sdist": Compression("gz", 9)}
 
 
 class Builder:
@@ -71,6 +216,26 @@ class Builder:
 	:param out_dir: The output directory.
 	:default out_dir: :file:`{<repo_dir>}/dist`
 	:param verbose: Enable verbose output.
+	:param conda_format: The format of conda packages; either ``'tar.bz2'``,
+		or ``'conda'`` for the newer, faster to extract, ``.conda`` format.
+		The latter requires the `zstandard <https://pypi.org/project/zstandard/>`_ package.
+	:param zstd_level: The zstd compression level for ``.conda`` packages, between 1 and 22.
+	:param zstd_threads: The number of threads used to compress ``.conda`` packages.
+		If ``0`` the number of processors on the machine is used, unless the build is reproducible.
+	:param compression: Mapping of ``'wheel'`` and ``'sdist'`` to the compression used for those archives.
+	:default compression: Deflate at the default level for wheels, and gzip at level 9 for source distributions.
+	:param compression_threads: The number of threads used to compress the files in wheels.
+		If ``0`` the number of processors on the machine is used.
+		With the ``bzip2`` and ``lzma`` methods the files are only read and hashed on those threads.
+	:param incremental: Build wheels incrementally, reusing the hashes and compressed data of the files
+		which are unchanged since the last build, and the metadata if its inputs are unchanged.
+		With the ``bzip2`` and ``lzma`` methods only the hashes are reused.
+	:param cache_dir: The directory in which the cache used for incremental builds is stored.
+	:default cache_dir: :file:`{<repo_dir>}/build/repo_helper_cache`
+	:param reproducible: Create byte-for-byte reproducible archives.
+		Files are added in sorted order, their timestamps are clamped to ``$SOURCE_DATE_EPOCH``
+		(or 1980-01-01 if it is not set), and their permissions and owners are normalised.
+	:default reproducible: :py:obj:`True` if ``$SOURCE_DATE_EPOCH`` is set, otherwise :py:obj:`False`.
 	"""
 
 	def __init__(
@@ -78,7 +243,15 @@ class Builder:
 			repo_dir: pathlib.Path,
 			build_dir: Optional[PathLike] = None,
 			out_dir: Optional[PathLike] = None,
-			verbose: bool = False
+			verbose: bool = False,
+			conda_format: str = "tar.bz2",
+			zstd_level: int = 10,
+			zstd_threads: int = 0,
+			compression: Optional[Mapping[str, Compression]] = None,
+			compression_threads: int = 0,
+			incremental: bool = False,
+			cache_dir: Optional[PathLike] = None,
+			reproducible: Optional[bool] = None,
 			):
 
 		# Walk up the tree until a "repo_helper.yml" or "git_helper.yml" (old name) file is found.
@@ -111,6 +284,57 @@ class Builder:
 
 		self.verbose = verbose
 
+		if conda_format not in _conda_formats:
+			raise ValueError(f"Unknown conda package format {conda_format!r}.")
+
+		#: The format of conda packages; either ``'tar.bz2'`` or ``'conda'``.
+		self.conda_format = conda_format
+
+		if zstd_level not in range(1, 23):
+			raise ValueError("'zstd_level' must be between 1 and 22.")
+
+		#: The zstd compression level for ``.conda`` packages, between 1 and 22.
+		self.zstd_level = zstd_level
+
+		if zstd_threads < 0:
+			raise ValueError("'zstd_threads' cannot be negative.")
+
+		#: The number of threads used to compress ``.conda`` packages.
+		#: If ``0`` the number of processors on the machine is used.
+		self.zstd_threads = zstd_threads
+
+		#: The compression used for wheels (``'wheel'``) and source distributions (``'sdist'``).
+		self.compression: Dict[str, Compression] = dict(_default_compression)
+
+		for artefact, value in (compression or {}).items():
+			if artefact not in _compression_methods:
+				raise ValueError(f"Unknown archive type {artefact!r}.")
+			self.compression[artefact] = Compression(*value).validate(artefact)
+
+		if compression_threads < 0:
+			raise ValueError("'compression_threads' cannot be negative.")
+
+		#: The number of threads used to compress the files in wheels.
+		#: If ``0`` the number of processors on the machine is used.
+		self.compression_threads = compression_threads
+
+		#: Whether wheels are built incrementally, reusing the unchanged files from the last build.
+		self.incremental = incremental
+
+		#: The directory in which the cache used for incremental builds is stored.
+		self.cache_dir = PathPlus(cache_dir or self.repo_dir / "build/repo_helper_cache")
+
+		if reproducible is None:
+			reproducible = "SOURCE_DATE_EPOCH" in os.environ
+
+		#: The time, in seconds since the epoch, which the timestamps of files in archives are clamped to
+		#: for reproducible builds, or :py:obj:`None` if builds are not reproducible.
+		self.source_date_epoch: Optional[int] = _get_source_date_epoch() if reproducible else None
+
+		# Inputs shared between the targets built by build_targets()
+		self._shared_files: Optional[Dict[str, Tuple[PathPlus, bool]]] = None
+		self._shared_metadata: Optional[str] = None
+
 	@property
 	def dist_info(self) -> PathPlus:
 		"""
@@ -142,17 +366,23 @@ class Builder:
 		else:
 			return posixpath.join(self.config["source_dir"], self.config["import_name"].split('.')[0])
 
+	def _manifest_rules(self, manifest_additional: bool = True) -> ManifestRules:
+		rules = ManifestRules()
+		rules.add(f"recursive-include {self.pkg_dir} *.py *.pyi *.pyx py.typed", clean=True)
+
+		if manifest_additional:
+			for entry in self.config["manifest_additional"]:
+				rules.add(entry)
+
+		return rules
+
 	def iter_source_files(self) -> Iterator[PathPlus]:
 		"""
 		Iterate over the files in the source directory.
 		"""
 
-		pkgdir = self.repo_dir / self.pkg_dir
-
-		for py_pattern in {"**/*.py", "**/*.pyi", "**/*.pyx", "**/py.typed"}:
-			for py_file in pkgdir.rglob(py_pattern):
-				if "__pycache__" not in py_file.parts:
-					yield py_file
+		for filename, _ in self._manifest_rules(manifest_additional=False).iter_files(self.repo_dir):
+			yield self.repo_dir / filename
 
 	def copy_source(self) -> None:
 		"""
@@ -208,74 +438,63 @@ class Builder:
 		if self.verbose:
 			click.echo(f"Writing {written_file.relative_to(self.build_dir)}")
 
-	def copy_manifest_additional(self) -> None:  # pylint: disable=useless-return
+	def copy_manifest_additional(self) -> None:
 		"""
 		Copy additional files to the build directory,
 		as specfied in :conf:`manifest_additional`.
+
+		Source files which are excluded by :conf:`manifest_additional` are removed from the build directory.
+		"""  # noqa: D400
+
+		files = self.collect_files()
+
+		for filename, (source, clean) in files.items():
+			if not clean:
+				target = self.build_dir / filename
+				target.parent.maybe_make(parents=True)
+				shutil.copy2(src=source, dst=target)
+				self.report_copied(source, target)
+
+		for py_file in self.iter_source_files():
+			target = self.build_dir / py_file.relative_to(self.repo_dir)
+			if target.relative_to(self.build_dir).as_posix() not in files and target.is_file():
+				target.unlink()
+				self.report_removed(target)
+
+	def collect_files(self) -> Dict[str, Tuple[PathPlus, bool]]:
+		"""
+		Returns the files which :meth:`~.copy_source` and :meth:`~.copy_manifest_additional`
+		would copy into the build directory, without copying them.
+
+		The files are found in a single walk of the repository,
+		which skips directories that cannot contain any of the files.
+
+		The keys are the paths of the files relative to the repository, in POSIX form.
+		The values are tuples of the source file and a flag indicating whether the file's trailing
+		whitespace is cleaned as it is copied (as for Python source files), or it is copied verbatim.
 		"""  # noqa: D400
 
-		def copy_file(filename):
-			target = self.build_dir / filename.relative_to(self.repo_dir)
+		return {
+				filename: (self.repo_dir / filename, rule.clean)
+				for filename, rule in self._manifest_rules().iter_files(self.repo_dir)
+				}
+
+	def _get_files(self) -> Dict[str, Tuple[PathPlus, bool]]:
+		if self._shared_files is None:
+			return self.collect_files()
+		return self._shared_files
+
+	def _copy_files(self, files: Dict[str, Tuple[PathPlus, bool]]) -> None:
+		for filename, (source, clean) in files.items():
+			target = self.build_dir / filename
 			target.parent.maybe_make(parents=True)
-			shutil.copy2(src=filename, dst=target)
-			self.report_copied(filename, target)
-
-		for entry in self.config["manifest_additional"]:
-			parts = entry.split(' ')
-
-			if parts[0] == "include":
-				for include_pat in parts[1:]:
-					for include_file in self.repo_dir.glob(include_pat):
-						if include_file.is_file():
-							copy_file(filename=include_file)
-
-			elif parts[0] == "exclude":
-				for exclude_pat in parts[1:]:
-					for exclude_file in self.build_dir.glob(exclude_pat):
-						if exclude_file.is_file():
-							exclude_file.unlink()
-							self.report_removed(exclude_file)
-
-			elif parts[0] == "recursive-include":
-				for include_file in (self.repo_dir / parts[1]).rglob(parts[2]):
-					if include_file.is_file():
-						copy_file(filename=include_file)
-
-			elif parts[0] == "recursive-exclude":
-				for exclude_file in (self.build_dir / parts[1]).rglob(parts[2]):
-					if exclude_file.is_file():
-						exclude_file.unlink()
-						self.report_removed(exclude_file)
-
-		#
-		# elif parts[0] == "global-include":
-		# 	for include_pat in parts[1:]:
-		# 		for include_file in self.repo_dir.rglob(include_pat):
-		# 			if include_file.is_file():
-		# 				copy_file(filename=include_file)
-		#
-		# elif parts[0] == "global-exclude":
-		# 	for exclude_pat in parts[1:]:
-		# 		for exclude_file in self.repo_dir.rglob(exclude_pat):
-		# 			if exclude_file.is_file():
-		# 				exclude_file.unlink()
-		# 				self.report_removed(exclude_file)
-
-		#
-		# elif parts[0] == "graft":
-		# 	for graft_dir in self.repo_dir.rglob(parts[1]):
-		# 		for graft_file in graft_dir.rglob("*.*"):
-		# 			if graft_file.is_file():
-		# 				copy_file(graft_file)
-		#
-		# elif parts[0] == "prune":
-		# 	for prune_dir in self.repo_dir.rglob(parts[1]):
-		# 		for prune_file in prune_dir.rglob("*.*"):
-		# 			if prune_file.is_file():
-		# 				prune_file.unlink()
-		# 				self.report_removed(exclude_file)
-
-		return
+
+			if clean:
+				target.write_clean(source.read_text())
+			else:
+				shutil.copy2(src=source, dst=target)
+
+			self.report_copied(source, target)
 
 	def write_entry_points(self) -> None:
 		"""
@@ -285,6 +504,11 @@ class Builder:
 		.. TODO:: non console-script entry points.
 		"""  # noqa: D400
 
+		entry_points_file = self.dist_info / "entry_points.txt"
+		entry_points_file.write_clean(self._entry_points_txt())
+		self.report_written(entry_points_file)
+
+	def _entry_points_txt(self) -> str:
 		cfg_parser = configparser.ConfigParser()
 
 		buf = StringList()
@@ -301,9 +525,7 @@ class Builder:
 		cfg_io = StringIO()
 		cfg_parser.write(cfg_io)
 
-		entry_points_file = self.dist_info / "entry_points.txt"
-		entry_points_file.write_clean(cfg_io.getvalue())
-		self.report_written(entry_points_file)
+		return cfg_io.getvalue()
 
 	def copy_license(self, dest_dir: PathPlus):
 		"""
@@ -336,6 +558,15 @@ class Builder:
 		:param metadata_file:
 		"""  # noqa: D400
 
+		metadata_file.write_clean(self._metadata())
+		self.report_written(metadata_file)
+
+	def _get_metadata(self) -> str:
+		if self._shared_metadata is None:
+			return self._metadata()
+		return self._shared_metadata
+
+	def _metadata(self) -> str:
 		github_url = "https://github.com/{username}/{repo_name}".format_map(self.config)
 
 		metadata = EmailMessage()
@@ -380,8 +611,7 @@ class Builder:
 		#  https://packaging.python.org/specifications/core-metadata/#provides-dist-multiple-use
 		#  https://packaging.python.org/specifications/core-metadata/#obsoletes-dist-multiple-use
 
-		metadata_file.write_lines([str(metadata), (self.repo_dir / "README.rst").read_text()])
-		self.report_written(metadata_file)
+		return '\n'.join([str(metadata), (self.repo_dir / "README.rst").read_text()])
 
 	def write_conda_index(self, build_number: int = 1):
 		"""
@@ -405,7 +635,7 @@ class Builder:
 				"noarch": "python",
 				"platform": None,
 				"subdir": "noarch",
-				"timestamp": int(datetime.now().timestamp() * 1000)
+				"timestamp": int((self.source_date_epoch or time.time()) * 1000),
 				}
 
 		index_json_file = self.info_dir / "index.json"
@@ -441,15 +671,18 @@ class Builder:
 		Write the metadata to the ``WHEEL`` file.
 		"""
 
+		wheel_file = self.dist_info / "WHEEL"
+		wheel_file.write_clean(self._wheel())
+		self.report_written(wheel_file)
+
+	def _wheel(self) -> str:
 		wheel = EmailMessage()
 		wheel["Wheel-Version"] = "1.0"
 		wheel["Generator"] = f"repo_helper.build ({__version__})"
 		wheel["Root-Is-Purelib"] = "true"
 		wheel["Tag"] = self.tag
 
-		wheel_file = self.dist_info / "WHEEL"
-		wheel_file.write_clean(str(wheel))
-		self.report_written(wheel_file)
+		return str(wheel)
 
 	def create_wheel_archive(self) -> str:
 		"""
@@ -461,15 +694,22 @@ class Builder:
 		wheel_filename = self.out_dir / f"{self.archive_name}-{self.tag}.whl"
 		self.out_dir.maybe_make(parents=True)
 
-		with ZipFile(wheel_filename, mode='w') as wheel_archive:
+		options = _zip_options(self.compression["wheel"])
+
+		def write(file: PathPlus) -> None:
+			arcname = file.relative_to(self.build_dir).as_posix()
+			zinfo = _zinfo_from_stat(arcname, file.stat(), self.source_date_epoch)
+			wheel_archive.writestr(zinfo, file.read_bytes(), **options)
+
+		with _open_zip(wheel_filename, self.compression["wheel"]) as wheel_archive:
 			with (self.dist_info / "RECORD").open('w') as fp:
-				for file in (self.build_dir / self.pkg_dir).rglob('*'):
+				for file in sorted((self.build_dir / self.pkg_dir).rglob('*')):
 					if file.is_file():
 						fp.write(get_record_entry(file, relative_to=self.build_dir))
 						fp.write('\n')
-						wheel_archive.write(file, arcname=file.relative_to(self.build_dir))
+						write(file)
 
-				for file in self.dist_info.rglob('*'):
+				for file in sorted(self.dist_info.rglob('*')):
 					if "RECORD" in file.name and self.dist_info.name in file.parts:
 						continue
 					if not file.is_file():
@@ -477,11 +717,11 @@ class Builder:
 
 					fp.write(get_record_entry(file, relative_to=self.build_dir))
 					fp.write('\n')
-					wheel_archive.write(file, arcname=file.relative_to(self.build_dir))
+					write(file)
 
-			for file in self.dist_info.rglob("RECORD*"):
+			for file in sorted(self.dist_info.rglob("RECORD*")):
 				if file.is_file():
-					wheel_archive.write(file, arcname=file.relative_to(self.build_dir))
+					write(file)
 					self.report_written(file)
 
 		emoji = "🎡 " if sys.platform != "win32" else ''
@@ -492,48 +732,172 @@ class Builder:
 
 		return wheel_filename.name
 
-	def create_conda_archive(self, wheel_contents_dir: PathLike, build_number: int = 1) -> str:
+	def convert_wheel_to_conda(self, wheel_file: PathLike, build_number: int = 1) -> str:
 		"""
-		Create the conda archive.
+		Create the conda archive from the given wheel, in the format given by :attr:`~.Builder.conda_format`.
 
-		:param wheel_contents_dir: The directory containing the installed contents of the wheel.
+		The contents of the wheel are streamed into the archive as they would be installed in ``site-packages``,
+		without unpacking the wheel to disk.
+
+		:param wheel_file:
 		:param build_number:
 
 		:return: The filename of the created archive.
 		"""
 
 		build_string = f"py_{build_number}"
-		site_packages = pathlib.PurePosixPath("site-packages")
-		conda_filename = self.out_dir / f"{self.config['pypi_name'].lower()}-{self.config['version']}-{build_string}.tar.bz2"
-		wheel_contents_dir = PathPlus(wheel_contents_dir)
+		stem = f"{self.config['pypi_name'].lower()}-{self.config['version']}-{build_string}"
+		conda_filename = self.out_dir / f"{stem}.{self.conda_format}"
 
 		self.out_dir.maybe_make(parents=True)
 
-		with tarfile.open(conda_filename, mode="w:bz2") as conda_archive:
-			with (self.info_dir / "files").open('w') as fp:
+		with ZipFile(wheel_file) as wheel:
+			if self.conda_format == "conda":
+				# https://docs.conda.io/projects/conda-build/en/latest/resources/package-spec.html#conda-v2-format
+				with ZipFile(conda_filename, mode='w') as conda_archive:
+					metadata = json.dumps({"conda_pkg_format_version": 2})
+					conda_archive.writestr(self._conda_zipinfo("metadata.json"), metadata)
 
-				for file in (wheel_contents_dir / self.pkg_dir).rglob('*'):
-					if file.is_file():
-						filename = (site_packages / file.relative_to(wheel_contents_dir)).as_posix()
-						fp.write(f"{filename}\n")
-						conda_archive.add(str(file), arcname=filename)
+					with self._open_zstd_tar(conda_archive, f"pkg-{stem}.tar.zst") as pkg_archive:
+						filenames = self._add_wheel_to_conda(wheel, pkg_archive)
 
-				for file in (wheel_contents_dir / f"{self.archive_name}.dist-info").rglob('*'):
-					if file.name == "INSTALLER":
-						file.write_text("conda")
+					with self._open_zstd_tar(conda_archive, f"info-{stem}.tar.zst") as info_archive:
+						self._add_conda_info(info_archive, filenames)
 
-					if file.is_file():
-						filename = (site_packages / file.relative_to(wheel_contents_dir)).as_posix()
-						fp.write(f"{filename}\n")
-						conda_archive.add(str(file), arcname=filename)
+			else:
+				with tarfile.open(conda_filename, mode="w:bz2") as conda_archive:
+					filenames = self._add_wheel_to_conda(wheel, conda_archive)
+					self._add_conda_info(conda_archive, filenames)
 
-			for file in self.info_dir.rglob('*'):
-				if not file.is_file():
-					continue
+		return os.path.basename(conda_filename)
+
+	@contextlib.contextmanager
+	def _open_zstd_tar(self, archive: ZipFile, arcname: str) -> Iterator[tarfile.TarFile]:
+		"""
+		Context manager to write a zstd compressed tar file to ``archive``.
+
+		:param archive:
+		:param arcname: The name of the tar file in the archive.
+		"""
 
-				conda_archive.add(str(file), arcname=file.relative_to(self.build_dir).as_posix())
+		try:
+			# 3rd party
+			import zstandard  # type: ignore
+		except ImportError:  # pragma: no cover
+			raise abort(
+					"The 'zstandard' package is required to create '.conda' packages.\n"
+					"Install it with 'pip install repo_helper[conda]'."
+					)
 
-		return os.path.basename(conda_filename)
+		threads = self.zstd_threads
+
+		if not threads:
+			# The compressed data depends on the number of threads, so use a fixed number for reproducible builds.
+			threads = 1 if self.source_date_epoch is not None else -1
+
+		compressor = zstandard.ZstdCompressor(level=self.zstd_level, threads=threads)
+
+		with archive.open(self._conda_zipinfo(arcname), mode='w', force_zip64=True) as fp:
+			with compressor.stream_writer(fp, closefd=False) as zstd_fp:
+				with tarfile.open(fileobj=zstd_fp, mode="w|") as tar:
+					yield tar
+
+	def _conda_zipinfo(self, arcname: str) -> ZipInfo:
+		zinfo = ZipInfo(arcname, date_time=_zip_date_time(None, self.source_date_epoch))
+		zinfo.external_attr = 0o644 << 16
+		return zinfo
+
+	def _normalise_tarinfo(self, tarinfo: tarfile.TarInfo) -> tarfile.TarInfo:
+		"""
+		Normalise the timestamp, permissions and owner of a file added to a tar archive, for reproducible builds.
+
+		Does nothing if :attr:`~.source_date_epoch` is :py:obj:`None`.
+
+		:param tarinfo:
+		"""
+
+		if self.source_date_epoch is not None:
+			tarinfo.mtime = min(int(tarinfo.mtime), self.source_date_epoch)
+			tarinfo.mode = 0o755 if tarinfo.isdir() or tarinfo.mode & 0o100 else 0o644
+			tarinfo.uid = tarinfo.gid = 0
+			tarinfo.uname = tarinfo.gname = ''
+
+		return tarinfo
+
+	def _add_conda_info(self, conda_archive: tarfile.TarFile, filenames: List[str]) -> None:
+		"""
+		Add the files in the ``info`` directory to the conda archive.
+
+		:param conda_archive:
+		:param filenames: The names of the files in the package, which are written to ``info/files``.
+		"""
+
+		(self.info_dir / "files").write_lines(filenames)
+
+		for file in sorted(self.info_dir.rglob('*')):
+			if not file.is_file():
+				continue
+
+			arcname = file.relative_to(self.build_dir).as_posix()
+			conda_archive.add(str(file), arcname=arcname, filter=self._normalise_tarinfo)
+
+	def _add_wheel_to_conda(self, wheel: ZipFile, conda_archive: tarfile.TarFile) -> List[str]:
+		"""
+		Add the contents of the wheel to the conda archive, as installed in ``site-packages``.
+
+		``INSTALLER`` is set to ``conda``, and an entry for it is added to ``RECORD``.
+
+		:param wheel:
+		:param conda_archive:
+
+		:return: The names of the files in the archive.
+		"""
+
+		dist_info = f"{self.archive_name}.dist-info"
+		record_name = f"{dist_info}/RECORD"
+		filenames = []
+
+		def add(arcname: str, fileobj: IO[bytes], size: int, date_time: Tuple[int, ...], mode: int) -> None:
+			tarinfo = tarfile.TarInfo(f"site-packages/{arcname}")
+			tarinfo.size = size
+			tarinfo.mode = mode
+
+			if self.source_date_epoch is None:
+				tarinfo.mtime = int(time.mktime(date_time + (0, 0, -1)))
+			else:
+				# The wheel's timestamps are in UTC for reproducible builds.
+				tarinfo.mtime = calendar.timegm(date_time + (0, 0, 0))
+
+			conda_archive.addfile(self._normalise_tarinfo(tarinfo), fileobj)
+			filenames.append(tarinfo.name)
+
+		for zinfo in wheel.infolist():
+			if zinfo.is_dir() or zinfo.filename in {record_name, f"{dist_info}/INSTALLER"}:
+				continue
+			elif not zinfo.filename.startswith((f"{self.pkg_dir}/", f"{dist_info}/")):
+				continue
+
+			with wheel.open(zinfo) as fp:
+				mode = (zinfo.external_attr >> 16) & 0o777 or 0o644
+				add(zinfo.filename, fp, zinfo.file_size, zinfo.date_time, mode)
+
+		installer = b"conda"
+		sha256_hash = urlsafe_b64encode(hashlib.sha256(installer).digest()).decode("latin1").rstrip('=')
+
+		record = StringList()
+		for line in wheel.read(record_name).decode("UTF-8").splitlines():
+			if line and not line.startswith((f"{record_name},", f"{dist_info}/INSTALLER,")):
+				record.append(line)
+
+		record.append(f"{dist_info}/INSTALLER,sha256={sha256_hash},{len(installer)}")
+		record.append(f"{record_name},,")
+		record_data = f"{record}\n".encode("UTF-8")
+
+		date_time = wheel.getinfo(record_name).date_time
+		add(f"{dist_info}/INSTALLER", BytesIO(installer), len(installer), date_time, 0o644)
+		add(record_name, BytesIO(record_data), len(record_data), date_time, 0o644)
+
+		return filenames
 
 	def create_sdist_archive(self) -> str:
 		"""
@@ -545,10 +909,22 @@ class Builder:
 		self.out_dir.maybe_make(parents=True)
 
 		sdist_filename = self.out_dir / f"{self.archive_name}.tar.gz"
-		with tarfile.open(sdist_filename, mode="w:gz", format=tarfile.PAX_FORMAT) as sdist_archive:
-			for file in self.build_dir.rglob('*'):
-				if file.is_file():
-					sdist_archive.add(str(file), arcname=file.relative_to(self.build_dir).as_posix())
+		compresslevel = self.compression["sdist"].level
+		if compresslevel is None:
+			compresslevel = 9
+
+		# The gzip header contains a timestamp, which is set to $SOURCE_DATE_EPOCH for reproducible builds.
+		with gzip.GzipFile(
+				os.fspath(sdist_filename),
+				mode="wb",
+				compresslevel=compresslevel,
+				mtime=self.source_date_epoch,
+				) as gzip_fp:
+			with tarfile.open(fileobj=gzip_fp, mode='w', format=tarfile.PAX_FORMAT) as sdist_archive:
+				for file in sorted(self.build_dir.rglob('*')):
+					if file.is_file():
+						arcname = file.relative_to(self.build_dir).as_posix()
+						sdist_archive.add(str(file), arcname=arcname, filter=self._normalise_tarinfo)
 
 		click.echo(
 				Fore.GREEN(f"Source distribution created at {sdist_filename.resolve()}"),
@@ -556,19 +932,16 @@ class Builder:
 				)
 		return os.path.basename(sdist_filename)
 
-	def build_wheel(self) -> str:
+	def prepare_metadata(self, metadata_directory: PathLike) -> str:
 		"""
-		Build the binary wheel distribution.
+		Write the wheel's ``*.dist-info`` directory, without the ``RECORD`` file, into ``metadata_directory``.
 
-		:return: The filename of the created archive.
-		"""
+		:param metadata_directory:
 
-		if self.build_dir.is_dir():
-			shutil.rmtree(self.build_dir)
-		self.build_dir.maybe_make(parents=True)
+		:return: The name of the ``*.dist-info`` directory.
+		"""
 
-		self.copy_source()
-		self.copy_manifest_additional()
+		self.clear_build_dir()
 		self.copy_license(self.dist_info)
 		self.write_entry_points()
 		self.write_metadata(self.dist_info / "METADATA")
@@ -576,7 +949,198 @@ class Builder:
 		(self.dist_info / "top_level.txt").write_clean(posixpath.split(self.pkg_dir)[0])
 		self.report_written(self.dist_info / "top_level.txt")
 
-		return self.create_wheel_archive()
+		target = PathPlus(metadata_directory) / self.dist_info.name
+		if target.is_dir():
+			shutil.rmtree(target)
+		shutil.copytree(self.dist_info, target)
+
+		return self.dist_info.name
+
+	def build_wheel(self, metadata_directory: Optional[PathLike] = None) -> str:
+		"""
+		Build the binary wheel distribution.
+
+		Files are written straight from the source tree into the archive,
+		and hashed for the ``RECORD`` file as they are written,
+		so each file is only read once and nothing is written to the build directory.
+
+		If :attr:`~.incremental` is :py:obj:`True` files which are unchanged since the last build
+		are not read or compressed again, and the metadata is only generated again if its inputs
+		(the configuration, ``requirements.txt`` and ``README.rst``) have changed.
+
+		:param metadata_directory: A ``*.dist-info`` directory previously created by :meth:`~.prepare_metadata`.
+			If given, its files are used for the wheel's metadata rather than being generated again.
+
+		:return: The filename of the created archive.
+		"""
+
+		dist_info = f"{self.archive_name}.dist-info"
+		wheel_filename = self.out_dir / f"{self.archive_name}-{self.tag}.whl"
+		self.out_dir.maybe_make(parents=True)
+
+		compression = self.compression["wheel"]
+		cache = _WheelCache(self.cache_dir, compression) if self.incremental else None
+
+		with _RecordingArchive(
+				wheel_filename,
+				compression,
+				threads=self.compression_threads,
+				cache=cache,
+				source_date_epoch=self.source_date_epoch,
+				) as archive:
+
+			for filename, (source, clean) in self._get_files().items():
+				if not filename.startswith(f"{self.pkg_dir}/"):
+					continue
+
+				archive.write_source(filename, source, clean)
+
+				if self.verbose:
+					self.report_copied(source, self.build_dir / filename)
+
+			if metadata_directory is not None:
+				self._write_prepared_metadata(archive, PathPlus(metadata_directory))
+			else:
+				self._write_dist_info(archive, cache)
+
+			archive.write_record(f"{dist_info}/RECORD")
+			self.report_written(self.build_dir / dist_info / "RECORD")
+
+		if cache is not None:
+			cache.save()
+
+		size = wheel_filename.stat().st_size
+		emoji = "🎡 " if sys.platform != "win32" else ''
+		click.echo(
+				Fore.GREEN(f"{emoji}Wheel created at {wheel_filename.resolve()}"),
+				color=resolve_color_default(),
+				)
+
+		click.echo(
+				f"Wheel size {size / 1024:0.1f} KiB ({compression.method}); "
+				f"{archive.compress_time:0.3f} s spent compressing"
+				)
+
+		if cache is not None:
+			click.echo(f"Reused {archive.cache_hits} of {len(archive.record) - 1} files from {self.cache_dir}")
+
+		return wheel_filename.name
+
+	def build_editable(self, metadata_directory: Optional[PathLike] = None) -> str:
+		"""
+		Build an editable wheel, as described in :pep:`660`.
+
+		Rather than the source files, the wheel contains a ``.pth`` file which makes the package
+		in the repository importable. Changes to the source files therefore take effect
+		without the wheel being rebuilt.
+
+		If :conf:`source_dir` is set, the ``.pth`` file adds that directory to :py:obj:`sys.path`.
+		Otherwise adding the repository itself would make its other top-level modules
+		and directories (such as ``tests``) importable too, so the ``.pth`` file instead installs
+		an import hook which only finds the package. Static analysis tools may not follow the hook.
+
+		:param metadata_directory: A ``*.dist-info`` directory previously created by :meth:`~.prepare_metadata`.
+			If given, its files are used for the wheel's metadata rather than being generated again.
+
+		:return: The filename of the created archive.
+		"""
+
+		dist_info = f"{self.archive_name}.dist-info"
+		wheel_filename = self.out_dir / f"{self.archive_name}-{self.tag}.whl"
+		self.out_dir.maybe_make(parents=True)
+
+		compression = self.compression["wheel"]
+
+		with _RecordingArchive(
+				wheel_filename,
+				compression,
+				source_date_epoch=self.source_date_epoch,
+				) as archive:
+
+			pth_filename = f"__editable__.{self.archive_name}.pth"
+			package_root = os.fspath((self.repo_dir / self.config["source_dir"]).resolve())
+
+			if self.config["source_dir"]:
+				archive.write_text(pth_filename, package_root)
+			else:
+				finder_name = "__editable___{}_finder".format(re.sub(r"\W", '_', self.archive_name))
+				finder = _editable_finder.format(name=posixpath.basename(self.pkg_dir), path=package_root)
+				archive.write_text(f"{finder_name}.py", finder)
+				self.report_written(self.build_dir / f"{finder_name}.py")
+				archive.write_text(pth_filename, f"import {finder_name}; {finder_name}.install()")
+
+			self.report_written(self.build_dir / pth_filename)
+
+			if metadata_directory is not None:
+				self._write_prepared_metadata(archive, PathPlus(metadata_directory))
+			else:
+				self._write_dist_info(archive)
+
+			archive.write_record(f"{dist_info}/RECORD")
+			self.report_written(self.build_dir / dist_info / "RECORD")
+
+		click.echo(
+				Fore.GREEN(f"Editable wheel created at {wheel_filename.resolve()}"),
+				color=resolve_color_default(),
+				)
+
+		return wheel_filename.name
+
+	def _write_dist_info(self, archive: "_RecordingArchive", cache: Optional["_WheelCache"] = None) -> None:
+		dist_info = f"{self.archive_name}.dist-info"
+
+		for license_file in sorted(self.repo_dir.glob("LICEN[CS]E*")):
+			if license_file.is_file():
+				filename = f"{dist_info}/{license_file.name}"
+				archive.write_source(filename, license_file, clean=True)
+				self.report_copied(license_file, self.build_dir / filename)
+
+		if cache is None:
+			files = self._dist_info_files()
+		else:
+			files = cache.get_metadata(self._metadata_fingerprint(), self._dist_info_files)
+
+		for filename, content in files:
+			archive.write_text(f"{dist_info}/{filename}", content)
+			self.report_written(self.build_dir / dist_info / filename)
+
+	def _dist_info_files(self) -> List[Tuple[str, str]]:
+		return [
+				("entry_points.txt", self._entry_points_txt()),
+				("METADATA", self._get_metadata()),
+				("WHEEL", self._wheel()),
+				("top_level.txt", posixpath.split(self.pkg_dir)[0]),
+				]
+
+	def _metadata_fingerprint(self) -> str:
+		"""
+		Returns a hash which changes whenever the inputs to the wheel's metadata change.
+
+		The inputs are the parsed configuration, which :func:`~.parse_yaml` already keeps up to date
+		with the files it depends on (such as the requirements files of extras),
+		and the content of ``requirements.txt`` and ``README.rst``.
+		"""
+
+		sha = hashlib.sha256(f"{__version__}\0{self.archive_name}\0{self.tag}\n".encode("UTF-8"))
+		sha.update(json.dumps(self.config, sort_keys=True, default=str).encode("UTF-8"))
+
+		for filename in ["requirements.txt", "README.rst"]:
+			try:
+				content = (self.repo_dir / filename).read_bytes()
+			except OSError:
+				content = b''
+			sha.update(f"\0{filename}\0{hashlib.sha256(content).hexdigest()}\n".encode("UTF-8"))
+
+		return sha.hexdigest()
+
+	def _write_prepared_metadata(self, archive: "_RecordingArchive", metadata_directory: PathPlus) -> None:
+		dist_info = f"{self.archive_name}.dist-info"
+
+		for file in sorted(metadata_directory.rglob('*')):
+			if file.is_file() and file.name != "RECORD":
+				filename = f"{dist_info}/{file.relative_to(metadata_directory).as_posix()}"
+				archive.write_file(filename, file)
+				self.report_copied(file, self.build_dir / filename)
 
 	def build_sdist(self) -> str:
 		"""
@@ -585,12 +1149,8 @@ class Builder:
 		:return: The filename of the created archive.
 		"""
 
-		if self.build_dir.is_dir():
-			shutil.rmtree(self.build_dir)
-		self.build_dir.maybe_make(parents=True)
-
-		self.copy_source()
-		self.copy_manifest_additional()
+		self.clear_build_dir()
+		self._copy_files(self._get_files())
 		self.copy_license(self.build_dir)
 
 		for filename in [
@@ -604,20 +1164,27 @@ class Builder:
 			dest.write_clean(source.read_text())
 			self.report_copied(source, dest)
 
-		self.write_metadata(self.build_dir / "PKG-INFO")
+		pkg_info_file = self.build_dir / "PKG-INFO"
+		pkg_info_file.write_clean(self._get_metadata())
+		self.report_written(pkg_info_file)
+
 		return self.create_sdist_archive()
 
-	def build_conda(self) -> str:
+	def build_conda(self, wheel_file: Optional[str] = None) -> str:
 		"""
 		Build the Conda distribution.
 
+		:param wheel_file: The filename of a wheel, in the output directory, to create the distribution from.
+			If :py:obj:`None` the wheel is built first.
+
 		:return: The filename of the created archive.
 		"""
 
 		build_number = 1
 
 		# Build the wheel first and clear the build directory
-		wheel_file = self.build_wheel()
+		if wheel_file is None:
+			wheel_file = self.build_wheel()
 
 		self.clear_build_dir()
 
@@ -629,12 +1196,7 @@ class Builder:
 		self.write_conda_about()
 		self.write_conda_index(build_number=build_number)
 
-		with tempfile.TemporaryDirectory() as tmpdir:
-			if self.verbose:
-				click.echo("Installing wheel into temporary directory")
-
-			pip_install_wheel(self.out_dir / wheel_file, tmpdir, self.verbose)
-			conda_filename = self.create_conda_archive(str(tmpdir), build_number=build_number)
+		conda_filename = self.convert_wheel_to_conda(self.out_dir / wheel_file, build_number=build_number)
 
 		click.echo(
 				Fore.GREEN(f"Conda package created at {(self.out_dir / conda_filename).resolve()}"),
@@ -642,40 +1204,864 @@ class Builder:
 				)
 		return conda_filename
 
-	def clear_build_dir(self) -> None:
-		"""
-		Clear the build directory of any residue from previous builds.
+	def build_targets(self, targets: Iterable[str] = ("wheel", "sdist"), jobs: int = 0) -> List[BuildResult]:
 		"""
+		Build several distributions concurrently.
 
-		if self.build_dir.is_dir():
-			shutil.rmtree(self.build_dir)
-		self.build_dir.maybe_make(parents=True)
+		The source files and metadata are collected once and shared between the targets.
+		Each target is then built in its own subdirectory of the build directory.
+		If a wheel is being built the conda distribution is created from it, rather than from a second wheel.
 
+		:param targets: The distributions to build. Any of ``'wheel'``, ``'sdist'`` and ``'conda'``.
+		:param jobs: The number of distributions to build at once.
+			If ``0`` all of the distributions are built at once.
 
-# copy_file(repo_dir / "__pkginfo__.py")
-# copy_file(repo_dir / "requirements.txt")
+		:return: The result of each build, in the same order as ``targets``.
+		"""
 
-# for license_file in repo_dir.glob("LICEN[CS]E"):
-# 	copy_file(license_file)
+		targets = list(dict.fromkeys(targets))
 
-# for requirements_file in config["additional_requirements_files"]:
-# 	copy_file(pkgdir / requirements_file)
+		for target in targets:
+			if target not in _targets:
+				raise ValueError(f"Unknown build target {target!r}.")
 
+		if jobs < 0:
+			raise ValueError("'jobs' cannot be negative.")
 
-def build_wheel(wheel_directory, config_settings=None, metadata_directory=None):
-	"""
-	:pep:`517` hook to build a wheel binary distribution.
+		self._shared_files = self.collect_files()
+		self._shared_metadata = self._metadata()
 
-	.. seealso:: https://www.python.org/dev/peps/pep-0517/#build-wheel
+		try:
+			with ThreadPoolExecutor(max_workers=jobs or len(targets) or 1) as executor:
+				# The wheel is always submitted before the conda distribution which waits for it.
+				futures: Dict[str, "Future[BuildResult]"] = {}
 
-	:param wheel_directory:
-	:param config_settings:
-	:param metadata_directory:
-	"""
+				for target in sorted(targets, key=_targets.index):
+					futures[target] = executor.submit(self._build_target, target, futures.get("wheel"))
 
-	with tempfile.TemporaryDirectory() as tmpdir:
-		builder = Builder(repo_dir=PathPlus.cwd(), build_dir=tmpdir, out_dir=wheel_directory, verbose=True)
-		return builder.build_wheel()
+				return [futures[target].result() for target in targets]
+
+		finally:
+			self._shared_files = None
+			self._shared_metadata = None
+
+	def _build_target(self, target: str, wheel: Optional["Future[BuildResult]"] = None) -> BuildResult:
+		builder = copy.copy(self)
+		builder.build_dir = self.build_dir / target
+		builder.clear_build_dir()
+
+		wheel_file = wheel.result().filename if wheel is not None else None
+		start = time.perf_counter()
+
+		with span(target, "build"):
+			if target == "wheel":
+				filename = builder.build_wheel()
+			elif target == "sdist":
+				filename = builder.build_sdist()
+			else:
+				filename = builder.build_conda(wheel_file=wheel_file)
+
+		return BuildResult(target, filename, time.perf_counter() - start)
+
+	def clear_build_dir(self) -> None:
+		"""
+		Clear the build directory of any residue from previous builds.
+		"""
+
+		if self.build_dir.is_dir():
+			shutil.rmtree(self.build_dir)
+		self.build_dir.maybe_make(parents=True)
+
+
+class _WheelCache:
+	"""
+	Cache of the files in a wheel, used by incremental builds.
+
+	Each file's content hash is recorded against its modification time and size,
+	so unchanged files need not be read again. The compressed data is stored in a single pack file,
+	keyed by the content hash and the compression, so unchanged files need not be compressed again.
+
+	:param cache_dir: The directory to store the cache in.
+	:param compression: The compression used for the wheel.
+	"""
+
+	def __init__(self, cache_dir: PathPlus, compression: Compression):
+		self.cache_dir = cache_dir
+		self.compression = compression
+
+		self._suffix = compression.method if compression.level is None else f"{compression.method}{compression.level}"
+		self._pack_name: Optional[str] = None
+		self._pack = b''
+		self._files: Dict[str, List[Any]] = {}
+		self._objects: Dict[str, List[int]] = {}
+		self._metadata: Dict[str, Any] = {}
+
+		self._used_files: Dict[str, List[Any]] = {}
+		self._used_objects: Dict[str, Tuple[bytes, int, int]] = {}
+
+		try:
+			index = json.loads((cache_dir / "index.json").read_text())
+			if index["repo_helper"] == __version__:
+				self._pack = (cache_dir / index["pack"]).read_bytes()
+				self._pack_name = index["pack"]
+				self._files = index["files"]
+				self._objects = index["objects"]
+				self._metadata = index["metadata"]
+		except (OSError, ValueError, KeyError, TypeError):
+			pass
+
+	def get_digest(self, arcname: str, stat: os.stat_result, clean: bool) -> Optional[bytes]:
+		"""
+		Returns the SHA256 hash of the file's content if its source has not changed since the last build.
+
+		:param arcname: The name of the file in the archive.
+		:param stat: The result of :func:`os.stat` for the file the content is read from.
+		:param clean: Whether the file's trailing whitespace is removed.
+		"""
+
+		cached = self._files.get(arcname)
+
+		if cached is not None and cached[:3] == [stat.st_mtime_ns, stat.st_size, clean]:
+			self._used_files[arcname] = cached
+			return bytes.fromhex(cached[3])
+
+		return None
+
+	def set_digest(self, arcname: str, stat: os.stat_result, clean: bool, digest: bytes) -> None:
+		"""
+		Record the SHA256 hash of the file's content.
+
+		:param arcname: The name of the file in the archive.
+		:param stat: The result of :func:`os.stat` for the file the content was read from.
+		:param clean: Whether the file's trailing whitespace was removed.
+		:param digest:
+		"""
+
+		self._used_files[arcname] = [stat.st_mtime_ns, stat.st_size, clean, digest.hex()]
+
+	def get_object(self, digest: bytes) -> Optional[Tuple[bytes, int, int]]:
+		"""
+		Returns the compressed data, size and CRC of the content with the given hash,
+		or :py:obj:`None` if it is not cached.
+
+		:param digest:
+		"""  # noqa: D400
+
+		key = f"{digest.hex()}-{self._suffix}"
+
+		if key in self._used_objects:
+			return self._used_objects[key]
+		if key not in self._objects:
+			return None
+
+		offset, length, file_size, crc = self._objects[key]
+		compressed = self._pack[offset:offset + length]
+
+		if len(compressed) != length:
+			return None
+
+		self._used_objects[key] = (compressed, file_size, crc)
+		return self._used_objects[key]
+
+	def put_object(self, digest: bytes, compressed: bytes, file_size: int, crc: int) -> None:
+		"""
+		Store the compressed data of the content with the given hash.
+
+		:param digest:
+		:param compressed:
+		:param file_size: The uncompressed size of the content.
+		:param crc: The CRC32 of the content.
+		"""
+
+		self._used_objects.setdefault(f"{digest.hex()}-{self._suffix}", (compressed, file_size, crc))
+
+	def get_metadata(self, fingerprint: str, generate: Callable[[], List[Tuple[str, str]]]) -> List[Tuple[str, str]]:
+		"""
+		Returns the files in the ``*.dist-info`` directory, only generating them if ``fingerprint`` has changed.
+
+		:param fingerprint: A hash of the inputs to the metadata.
+		:param generate: Function returning a list of filenames and contents.
+		"""
+
+		if self._metadata.get("fingerprint") != fingerprint:
+			self._metadata = {"fingerprint": fingerprint, "files": generate()}
+
+		return [(filename, content) for filename, content in self._metadata["files"]]
+
+	def save(self) -> None:
+		"""
+		Save the cache, discarding the entries and compressed data not used by the current build.
+		"""
+
+		self.cache_dir.maybe_make(parents=True)
+
+		objects = {}
+		offset = 0
+		pack_name = f"objects-{os.urandom(8).hex()}.pack"
+
+		with (self.cache_dir / pack_name).open("wb") as fp:
+			for key, (compressed, file_size, crc) in self._used_objects.items():
+				fp.write(compressed)
+				objects[key] = [offset, len(compressed), file_size, crc]
+				offset += len(compressed)
+
+		index = {
+				"repo_helper": __version__,
+				"pack": pack_name,
+				"files": self._used_files,
+				"objects": objects,
+				"metadata": self._metadata,
+				}
+
+		tmp_file = self.cache_dir / f"index.json.{os.getpid()}"
+		tmp_file.dump_json(index)
+		os.replace(tmp_file, self.cache_dir / "index.json")
+
+		if self._pack_name is not None:
+			with contextlib.suppress(OSError):
+				os.unlink(self.cache_dir / self._pack_name)
+
+		self._pack_name = pack_name
+
+
+class _ZipWriter:
+	"""
+	Writes a zip file from members which have already been compressed.
+
+	:class:`zipfile.ZipFile` can only write members which it compresses itself, one at a time,
+	so this is used to write the members of wheels which have been compressed on a pool of threads.
+	Only the ``stored`` and ``deflated`` methods are supported, which need no headers beyond the zip format's own.
+
+	:param filename:
+	"""
+
+	def __init__(self, filename: PathLike):
+		self._fp = open(filename, "wb")
+		self._central_directory: List[bytes] = []
+
+	def write(self, zinfo: ZipInfo, compressed: bytes) -> None:
+		"""
+		Write a member to the zip file.
+
+		:param zinfo: The member's name, timestamp, permissions, compression method, CRC and sizes.
+		:param compressed: The member's compressed data.
+		"""
+
+		offset = self._fp.tell()
+
+		try:
+			filename = zinfo.filename.encode("ascii")
+			flags = 0
+		except UnicodeEncodeError:
+			filename = zinfo.filename.encode("UTF-8")
+			flags = 0x800
+
+		year, month, day, hour, minute, second = zinfo.date_time
+		dos_date = (year - 1980) << 9 | month << 5 | day
+		dos_time = hour << 11 | minute << 5 | second // 2
+
+		# The zip64 extra field holds the values which don't fit in the headers, in this order.
+		zip64_values = [
+				value for value in (zinfo.file_size, zinfo.compress_size, offset) if value > _zip64_limit
+				]
+		version = 45 if zip64_values else 20
+
+		if zinfo.file_size > _zip64_limit or zinfo.compress_size > _zip64_limit:
+			local_extra = struct.pack("<HHQQ", 1, 16, zinfo.file_size, zinfo.compress_size)
+			local_sizes = (0xFFFFFFFF, 0xFFFFFFFF)
+		else:
+			local_extra = b''
+			local_sizes = (zinfo.compress_size, zinfo.file_size)
+
+		self._fp.write(
+				struct.pack(
+						"<IHHHHHIIIHH",
+						0x04034b50,
+						version,
+						flags,
+						zinfo.compress_type,
+						dos_time,
+						dos_date,
+						zinfo.CRC,
+						*local_sizes,
+						len(filename),
+						len(local_extra),
+						)
+				)
+		self._fp.write(filename)
+		self._fp.write(local_extra)
+		self._fp.write(compressed)
+
+		central_extra = b''
+		if zip64_values:
+			central_extra = struct.pack(f"<HH{len(zip64_values)}Q", 1, 8 * len(zip64_values), *zip64_values)
+
+		self._central_directory.append(
+				struct.pack(
+						"<IHHHHHHIIIHHHHHII",
+						0x02014b50,
+						zinfo.create_system << 8 | max(zinfo.create_version, version),
+						version,
+						flags,
+						zinfo.compress_type,
+						dos_time,
+						dos_date,
+						zinfo.CRC,
+						zinfo.compress_size if zinfo.compress_size <= _zip64_limit else 0xFFFFFFFF,
+						zinfo.file_size if zinfo.file_size <= _zip64_limit else 0xFFFFFFFF,
+						len(filename),
+						len(central_extra),
+						0,
+						0,
+						0,
+						zinfo.external_attr,
+						offset if offset <= _zip64_limit else 0xFFFFFFFF,
+						) + filename + central_extra
+				)
+
+	def close(self) -> None:
+		"""
+		Write the central directory and close the zip file.
+		"""
+
+		if self._fp.closed:
+			return
+
+		offset = self._fp.tell()
+
+		for entry in self._central_directory:
+			self._fp.write(entry)
+
+		size = self._fp.tell() - offset
+		count = len(self._central_directory)
+
+		if count >= 0xFFFF or offset > _zip64_limit or size > _zip64_limit:
+			zip64_offset = self._fp.tell()
+			self._fp.write(struct.pack("<IQHHIIQQQQ", 0x06064b50, 44, 45, 45, 0, 0, count, count, size, offset))
+			self._fp.write(struct.pack("<IIQI", 0x07064b50, 0, zip64_offset, 1))
+			count, size, offset = min(count, 0xFFFF), min(size, 0xFFFFFFFF), 0xFFFFFFFF
+
+		self._fp.write(struct.pack("<IHHHHIIH", 0x06054b50, 0, 0, count, count, size, offset, 0))
+		self._fp.close()
+
+
+class _RecordingArchive:
+	"""
+	Writes files to a wheel archive, recording a :pep:`376` ``RECORD`` entry for each one as it is written.
+
+	Files are read, hashed and compressed on a pool of threads, then written to the archive
+	in the order they were given. With the ``bzip2`` and ``lzma`` methods the files are compressed
+	by :class:`zipfile.ZipFile` as they are written, so only reading and hashing them is done in parallel.
+
+	The archive must be used as a context manager, so the threads are stopped and the file is closed
+	however the build ends.
+
+	:param filename: The wheel file to create.
+	:param compression:
+	:param threads: The number of threads to compress files with.
+		If ``0`` the number of processors on the machine is used.
+	:param cache: Used to reuse the hashes and compressed data of files which are unchanged since the last build.
+	:param source_date_epoch: If given, the time which the timestamps of files are clamped to,
+		for reproducible builds.
+	"""
+
+	def __init__(
+			self,
+			filename: PathLike,
+			compression: Compression,
+			threads: int = 1,
+			cache: Optional[_WheelCache] = None,
+			source_date_epoch: Optional[int] = None,
+			):
+		self.compression = compression
+		self.source_date_epoch = source_date_epoch
+		self.record = StringList()
+
+		#: The time spent compressing files, in seconds.
+		self.compress_time = 0.0
+
+		#: The number of files whose hash or compressed data was reused from the cache.
+		self.cache_hits = 0
+
+		self._cache = cache
+		self._raw = compression.method in {"stored", "deflated"}
+		self._zip_writer: Optional[_ZipWriter] = None
+		self._zip_file: Optional[ZipFile] = None
+
+		if self._raw:
+			self._zip_writer = _ZipWriter(filename)
+		else:
+			self._zip_file = _open_zip(filename, compression)
+
+		self._pending: Deque["Future[Tuple[ZipInfo, bytes, bytes, float]]"] = deque()
+		self._executor: Optional[ThreadPoolExecutor] = None
+
+		if threads != 1:
+			self._executor = ThreadPoolExecutor(max_workers=threads or os.cpu_count())
+
+	def __enter__(self) -> "_RecordingArchive":
+		return self
+
+	def __exit__(self, *args) -> None:
+		if self._executor is not None:
+			for future in self._pending:
+				future.cancel()
+
+			self._executor.shutdown()
+			self._executor = None
+
+		if self._zip_writer is not None:
+			self._zip_writer.close()
+		if self._zip_file is not None:
+			self._zip_file.close()
+
+	def _add_record(self, arcname: str, digest: bytes, size: int) -> None:
+		encoded_digest = urlsafe_b64encode(digest).decode("latin1").rstrip('=')
+		self.record.append(f"{arcname},sha256={encoded_digest},{size}")
+
+	def _prepare(
+			self,
+			zinfo: ZipInfo,
+			get_data: Callable[[], bytes],
+			digest: Optional[bytes],
+			store: bool = False,
+			) -> Tuple[ZipInfo, bytes, bytes, float]:
+		"""
+		Read, hash and, with the ``stored`` and ``deflated`` methods, compress a file.
+
+		:param store: Whether to store the compressed data in the cache.
+
+		:returns: The file's :class:`~zipfile.ZipInfo`, its data (compressed if it has been),
+			its hash, and the time spent compressing it.
+		"""
+
+		data = get_data()
+
+		if digest is None:
+			digest = hashlib.sha256(data).digest()
+
+		if not self._raw:
+			return zinfo, data, digest, 0.0
+
+		start = time.perf_counter()
+
+		if self.compression.method == "deflated":
+			level = -1 if self.compression.level is None else self.compression.level
+			compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+			compressed = compressor.compress(data) + compressor.flush()
+		else:
+			compressed = data
+
+		zinfo.compress_type = _zip_methods[self.compression.method]
+		zinfo.file_size = len(data)
+		zinfo.compress_size = len(compressed)
+		zinfo.CRC = zlib.crc32(data)
+
+		if store:
+			assert self._cache is not None
+			self._cache.put_object(digest, compressed, zinfo.file_size, zinfo.CRC)
+
+		return zinfo, compressed, digest, time.perf_counter() - start
+
+	def _write_prepared(self, zinfo: ZipInfo, data: bytes, digest: bytes, duration: float) -> None:
+		if self._zip_writer is not None:
+			self._zip_writer.write(zinfo, data)
+			self._add_record(zinfo.filename, digest, zinfo.file_size)
+		else:
+			assert self._zip_file is not None
+			start = time.perf_counter()
+			self._zip_file.writestr(zinfo, data, **_zip_options(self.compression))
+			duration = time.perf_counter() - start
+			self._add_record(zinfo.filename, digest, len(data))
+
+		self.compress_time += duration
+
+	def _flush(self, wait: bool = False) -> None:
+		"""
+		Write the files which have been prepared to the archive, in order.
+
+		:param wait: Whether to wait for all files to be prepared.
+			Otherwise only the files which have already been prepared are written.
+		"""
+
+		while self._pending and (wait or self._pending[0].done()):
+			self._write_prepared(*self._pending.popleft().result())
+
+	def _write(
+			self,
+			zinfo: ZipInfo,
+			get_data: Callable[[], bytes],
+			stat: Optional[os.stat_result] = None,
+			clean: bool = False,
+			) -> None:
+		digest = None
+		store = False
+
+		if self._cache is not None and stat is not None:
+			digest = self._cache.get_digest(zinfo.filename, stat, clean)
+
+			if digest is None:
+				# The hash is recorded once the file has been read.
+				get_data = partial(self._read_and_record, zinfo.filename, get_data, stat, clean)
+			elif self._raw:
+				cached = self._cache.get_object(digest)
+
+				if cached is not None:
+					self.cache_hits += 1
+					compressed, zinfo.file_size, zinfo.CRC = cached
+					zinfo.compress_type = _zip_methods[self.compression.method]
+					zinfo.compress_size = len(compressed)
+					self._submit(lambda: (zinfo, compressed, digest, 0.0))
+					return
+			else:
+				self.cache_hits += 1
+
+			store = self._raw
+
+		self._submit(partial(self._prepare, zinfo, get_data, digest, store))
+
+	def _submit(self, prepare: Callable[[], Tuple[ZipInfo, bytes, bytes, float]]) -> None:
+		"""
+		Prepare a file on the pool of threads, if there is one, and write it to the archive in order.
+
+		:param prepare: Function returning the file's :class:`~zipfile.ZipInfo`, data, hash
+			and the time spent compressing it.
+		"""
+
+		if self._executor is None:
+			self._write_prepared(*prepare())
+		else:
+			self._pending.append(self._executor.submit(prepare))
+			self._flush()
+
+	def _read_and_record(
+			self,
+			arcname: str,
+			get_data: Callable[[], bytes],
+			stat: os.stat_result,
+			clean: bool,
+			) -> bytes:
+		assert self._cache is not None
+
+		data = get_data()
+		self._cache.set_digest(arcname, stat, clean, hashlib.sha256(data).digest())
+		return data
+
+	def write_text(self, arcname: str, content: str, source: Optional[pathlib.Path] = None) -> None:
+		"""
+		Write ``content`` to the archive, without trailing whitespace and with a newline at the end.
+
+		:param arcname: The name of the file in the archive.
+		:param content:
+		:param source: The file the content was read from, whose modification time and permissions are used.
+		"""
+
+		data = _clean(content).encode("UTF-8")
+
+		if source is None:
+			zinfo = ZipInfo(arcname, date_time=_zip_date_time(None, self.source_date_epoch))
+			zinfo.external_attr = 0o644 << 16
+		else:
+			zinfo = _zinfo_from_stat(arcname, os.stat(source), self.source_date_epoch)
+
+		self._write(zinfo, lambda: data)
+
+	def write_file(self, arcname: str, source: pathlib.Path) -> None:
+		"""
+		Copy ``source`` into the archive verbatim.
+
+		:param arcname: The name of the file in the archive.
+		:param source:
+		"""
+
+		stat = os.stat(source)
+		zinfo = _zinfo_from_stat(arcname, stat, self.source_date_epoch)
+		self._write(zinfo, PathPlus(source).read_bytes, stat=stat)
+
+	def write_source(self, arcname: str, source: pathlib.Path, clean: bool) -> None:
+		"""
+		Write ``source`` to the archive, hashing it only if it has changed since the last build.
+
+		:param arcname: The name of the file in the archive.
+		:param source:
+		:param clean: Whether to remove trailing whitespace from the file, as :meth:`~.write_text` does.
+		"""
+
+		def get_data() -> bytes:
+			if clean:
+				return _clean(PathPlus(source).read_text()).encode("UTF-8")
+			else:
+				return PathPlus(source).read_bytes()
+
+		stat = os.stat(source)
+		zinfo = _zinfo_from_stat(arcname, stat, self.source_date_epoch)
+		self._write(zinfo, get_data, stat=stat, clean=clean)
+
+	def write_record(self, arcname: str) -> None:
+		"""
+		Write the ``RECORD`` file to the archive, once all other files have been written.
+
+		:param arcname: The name of the ``RECORD`` file in the archive.
+		"""
+
+		self._flush(wait=True)
+
+		self.record.append(f"{arcname},,")
+		zinfo = ZipInfo(arcname, date_time=_zip_date_time(None, self.source_date_epoch))
+		zinfo.external_attr = 0o644 << 16
+		record = (str(self.record) + '\n').encode("UTF-8")
+
+		# The RECORD file doesn't list itself, so it is written without adding an entry.
+		zinfo, data, _, duration = self._prepare(zinfo, lambda: record, b'')
+		self.compress_time += duration
+
+		if self._zip_writer is not None:
+			self._zip_writer.write(zinfo, data)
+		else:
+			assert self._zip_file is not None
+			self._zip_file.writestr(zinfo, data, **_zip_options(self.compression))
+
+
+def _get_source_date_epoch() -> int:
+	"""
+	Returns the time given by ``$SOURCE_DATE_EPOCH``, or 1980-01-01 if it is not set.
+
+	.. seealso:: https://reproducible-builds.org/specs/source-date-epoch/
+	"""
+
+	value = os.environ.get("SOURCE_DATE_EPOCH", '').strip()
+
+	if not value:
+		return _zip_epoch
+
+	try:
+		return int(value)
+	except ValueError:
+		raise ValueError(f"Invalid value for $SOURCE_DATE_EPOCH: {value!r}") from None
+
+
+def _zip_date_time(timestamp: Optional[float], source_date_epoch: Optional[int] = None) -> Tuple[int, ...]:
+	"""
+	Returns the ``date_time`` of a file in a zip archive.
+
+	:param timestamp: The modification time of the file. If :py:obj:`None` the current time is used.
+	:param source_date_epoch: If given, the time which ``timestamp`` is clamped to.
+		The ``date_time`` is then in UTC, rather than in the local timezone.
+	"""
+
+	if source_date_epoch is None:
+		date_time = time.localtime(timestamp)[:6]
+	elif timestamp is None:
+		date_time = time.gmtime(source_date_epoch)[:6]
+	else:
+		date_time = time.gmtime(min(timestamp, source_date_epoch))[:6]
+
+	return max(date_time, (1980, 1, 1, 0, 0, 0))
+
+
+def _zinfo_from_stat(arcname: str, stat: os.stat_result, source_date_epoch: Optional[int] = None) -> ZipInfo:
+	"""
+	Returns a :class:`zipfile.ZipInfo` for a file, as :meth:`zipfile.ZipInfo.from_file` would,
+	from the result of :func:`os.stat` for the file.
+
+	:param arcname: The name of the file in the archive.
+	:param stat:
+	:param source_date_epoch: If given, the time which the file's timestamp is clamped to,
+		and the file's permissions are normalised to ``0o644`` (or ``0o755`` if it is executable).
+	"""  # noqa: D400
+
+	mode = stat.st_mode & 0xFFFF
+
+	if source_date_epoch is not None:
+		mode = (mode & 0o170000) | (0o755 if mode & 0o100 else 0o644)
+
+	zinfo = ZipInfo(arcname, _zip_date_time(stat.st_mtime, source_date_epoch))
+	zinfo.external_attr = mode << 16
+	zinfo.file_size = stat.st_size
+
+	return zinfo
+
+
+def _zip_options(compression: Compression) -> Dict[str, Any]:
+	options: Dict[str, Any] = {"compress_type": _zip_methods[compression.method]}
+
+	# The compression level can only be set on Python 3.7 and above.
+	if compression.level is not None and sys.version_info >= (3, 7):  # pragma: no cover (<py37)
+		options["compresslevel"] = compression.level
+
+	return options
+
+
+def _open_zip(filename: PathLike, compression: Compression) -> ZipFile:
+	"""
+	Open a zip file for writing with the given compression.
+
+	:param filename:
+	:param compression:
+	"""
+
+	options = _zip_options(compression)
+	return ZipFile(filename, mode='w', compression=options.pop("compress_type"), **options)
+
+
+def _clean(content: str) -> str:
+	"""
+	Returns ``content`` as :meth:`PathPlus.write_clean() <domdf_python_tools.paths.PathPlus.write_clean>`
+	would write it, without trailing whitespace and with a newline at the end.
+
+	:param content:
+	"""
+
+	buffer = StringList(content)
+	buffer.blankline(ensure_single=True)
+	return str(buffer)
+
+
+# copy_file(repo_dir / "__pkginfo__.py")
+# copy_file(repo_dir / "requirements.txt")
+
+# for license_file in repo_dir.glob("LICEN[CS]E"):
+# 	copy_file(license_file)
+
+# for requirements_file in config["additional_requirements_files"]:
+# 	copy_file(pkgdir / requirements_file)
+
+
+def _builder_options(config_settings: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+	"""
+	Returns the keyword arguments for :class:`~.Builder` given in the :pep:`517` ``config_settings``.
+
+	The following settings are supported. Others are ignored.
+
+	* ``wheel-compression`` -- the compression method and level for wheels, e.g. ``deflated:9``.
+	* ``sdist-compression`` -- the compression level for source distributions, e.g. ``gz:6``.
+	* ``compression-threads`` -- the number of threads used to compress the files in wheels.
+	* ``zstd-level`` -- the zstd compression level for ``.conda`` packages, e.g. ``19``.
+	* ``zstd-threads`` -- the number of threads used to compress ``.conda`` packages.
+	* ``incremental`` -- whether to build wheels incrementally, e.g. ``true``.
+	* ``reproducible`` -- whether to create reproducible archives, e.g. ``true``.
+
+	:param config_settings:
+	"""
+
+	compression: Dict[str, Compression] = {}
+	options: Dict[str, Any] = {"compression": compression}
+
+	for key, value in (config_settings or {}).items():
+		key = key.lstrip('-')
+
+		if key in {"wheel-compression", "sdist-compression"}:
+			compression[key.split('-')[0]] = Compression.parse(value)
+		elif key in {"compression-threads", "zstd-level", "zstd-threads"}:
+			options[key.replace('-', '_')] = int(value)
+		elif key in {"incremental", "reproducible"}:
+			options[key] = bool(strtobool(value))
+
+	return options
+
+
+def get_requires_for_build_wheel(config_settings=None):
+	"""
+	:pep:`517` hook to return the requirements for building a wheel, beyond those in ``pyproject.toml``.
+
+	.. seealso:: https://www.python.org/dev/peps/pep-0517/#get-requires-for-build-wheel
+
+	:param config_settings:
+	"""
+
+	return []
+
+
+def prepare_metadata_for_build_wheel(metadata_directory, config_settings=None):
+	"""
+	:pep:`517` hook to write the wheel's ``*.dist-info`` directory, without building the wheel.
+
+	.. seealso:: https://www.python.org/dev/peps/pep-0517/#prepare-metadata-for-build-wheel
+
+	:param metadata_directory:
+	:param config_settings:
+
+	:return: The name of the ``*.dist-info`` directory.
+	"""
+
+	with tempfile.TemporaryDirectory() as tmpdir:
+		builder = Builder(repo_dir=PathPlus.cwd(), build_dir=tmpdir, out_dir=metadata_directory, verbose=True)
+		return builder.prepare_metadata(metadata_directory)
+
+
+def build_wheel(wheel_directory, config_settings=None, metadata_directory=None):
+	"""
+	:pep:`517` hook to build a wheel binary distribution.
+
+	.. seealso:: https://www.python.org/dev/peps/pep-0517/#build-wheel
+
+	:param wheel_directory:
+	:param config_settings: May contain ``wheel-compression`` (e.g. ``deflated:9``)
+		and ``compression-threads`` to configure the compression of the wheel,
+		and ``incremental`` to reuse the unchanged files and metadata from the last build.
+	:param metadata_directory: The ``*.dist-info`` directory created by :func:`~.prepare_metadata_for_build_wheel`,
+		whose metadata is used for the wheel.
+	"""
+
+	with tempfile.TemporaryDirectory() as tmpdir:
+		builder = Builder(
+				repo_dir=PathPlus.cwd(),
+				build_dir=tmpdir,
+				out_dir=wheel_directory,
+				verbose=True,
+				**_builder_options(config_settings),
+				)
+		return builder.build_wheel(metadata_directory=metadata_directory)
+
+
+def get_requires_for_build_editable(config_settings=None):
+	"""
+	:pep:`660` hook to return the requirements for building an editable wheel, beyond those in ``pyproject.toml``.
+
+	.. seealso:: https://www.python.org/dev/peps/pep-0660/#get-requires-for-build-editable
+
+	:param config_settings:
+	"""
+
+	return []
+
+
+def prepare_metadata_for_build_editable(metadata_directory, config_settings=None):
+	"""
+	:pep:`660` hook to write the editable wheel's ``*.dist-info`` directory, without building the wheel.
+
+	.. seealso:: https://www.python.org/dev/peps/pep-0660/#prepare-metadata-for-build-editable
+
+	:param metadata_directory:
+	:param config_settings:
+
+	:return: The name of the ``*.dist-info`` directory.
+	"""
+
+	return prepare_metadata_for_build_wheel(metadata_directory, config_settings)
+
+
+def build_editable(wheel_directory, config_settings=None, metadata_directory=None):
+	"""
+	:pep:`660` hook to build an editable wheel.
+
+	.. seealso:: https://www.python.org/dev/peps/pep-0660/#build-editable
+
+	:param wheel_directory:
+	:param config_settings:
+	:param metadata_directory: The ``*.dist-info`` directory created by
+		:func:`~.prepare_metadata_for_build_editable`, whose metadata is used for the wheel.
+	"""
+
+	with tempfile.TemporaryDirectory() as tmpdir:
+		builder = Builder(
+				repo_dir=PathPlus.cwd(),
+				build_dir=tmpdir,
+				out_dir=wheel_directory,
+				verbose=True,
+				**_builder_options(config_settings),
+				)
+		return builder.build_editable(metadata_directory=metadata_directory)
 
 
 def build_sdist(sdist_directory, config_settings=None):
@@ -685,49 +2071,20 @@ def build_sdist(sdist_directory, config_settings=None):
 	.. seealso:: https://www.python.org/dev/peps/pep-0517/#build-sdist
 
 	:param sdist_directory:
-	:param config_settings:
+	:param config_settings: May contain ``sdist-compression`` (e.g. ``gz:6``)
+		to configure the compression of the source distribution.
 	"""
 
 	with tempfile.TemporaryDirectory() as tmpdir:
-		builder = Builder(repo_dir=PathPlus.cwd(), build_dir=tmpdir, out_dir=sdist_directory, verbose=True)
+		builder = Builder(
+				repo_dir=PathPlus.cwd(),
+				build_dir=tmpdir,
+				out_dir=sdist_directory,
+				verbose=True,
+				**_builder_options(config_settings),
+				)
 		return builder.build_sdist()
 
 
 def get_requires_for_build_sdist(config_settings=None):
 	return []
-
-
-def pip_install_wheel(wheel_file: PathLike, target_dir: PathLike, verbose: bool = False):
-	command = [
-			"pip",
-			"install",
-			os.fspath(wheel_file),
-			"--target",
-			os.fspath(target_dir),
-			"--no-deps",
-			"--no-compile",
-			"--no-warn-script-location",
-			"--no-warn-conflicts",
-			"--disable-pip-version-check",
-			]
-
-	process = Popen(command, stdout=PIPE)
-	(output, err) = process.communicate()
-	exit_code = process.wait()
-
-	if verbose:
-		click.echo((output or b'').decode("UTF-8"))
-		click.echo((err or b'').decode("UTF-8"), err=True)
-
-	if exit_code != 0:
-		err = err or b''
-
-		message = dedent(
-				f"""\
-					Command '{' '.join(command)}' returned non-zero exit code {exit_code}:
-
-					{indent(err.decode("UTF-8"), '    ')}
-					"""
-				)
-
-		raise abort(message.rstrip() + '\n')
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+#
+#  cache.py
+"""
+Cache of the files written by each manager, used to skip managers whose inputs have not changed.
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+# stdlib
+import hashlib
+import json
+import os
+import posixpath
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+# this package
+from repo_helper import __version__
+from repo_helper.files import Manager
+from repo_helper.templates import template_dir
+
+__all__ = ["ManagerCache", "cache_dir_name", "hash_config", "hash_templates", "get_input_files"]
+
+#: The name of the directory, relative to the repository root, in which the cache is stored.
+cache_dir_name = ".repo_helper_cache"
+
+_FileState = Optional[Dict[str, Any]]
+
+_templates_hash: Optional[str] = None
+
+
+def hash_config(config: Mapping[str, Any]) -> str:
+	"""
+	Returns a hash of the configuration values in ``config``.
+
+	Callables, such as the helper functions in the jinja2 globals, are ignored.
+
+	:param config:
+	"""
+
+	values = {key: value for key, value in config.items() if not callable(value)}
+	serialised = json.dumps(values, sort_keys=True, default=str)
+	return hashlib.sha256(serialised.encode("UTF-8")).hexdigest()
+
+
+def hash_templates() -> str:
+	"""
+	Returns a hash of the template sources shipped with ``repo_helper``, and its version.
+
+	The hash is only calculated once per process.
+	"""
+
+	global _templates_hash
+
+	if _templates_hash is None:
+		sha = hashlib.sha256(__version__.encode("UTF-8"))
+
+		for template in sorted(template_dir.rglob('*')):
+			if template.is_file():
+				sha.update(template.relative_to(template_dir).as_posix().encode("UTF-8"))
+				sha.update(template.read_bytes())
+
+		_templates_hash = sha.hexdigest()
+
+	return _templates_hash
+
+
+def get_input_files(config: Mapping[str, Any]) -> List[str]:
+	"""
+	Returns the files, other than their own outputs, which are read by the managers.
+
+	:param config:
+	"""
+
+	return sorted({
+			"README.rst",
+			"requirements.txt",
+			"tox.ini",
+			"stubs.txt",
+			posixpath.join(config["tests_dir"], "requirements.txt"),
+			posixpath.join(config["docs_dir"], "requirements.txt"),
+			})
+
+
+def _get_file_state(filename: PathPlus, previous: _FileState = None) -> _FileState:
+	"""
+	Returns the size, modification time and hash of ``filename``, or :py:obj:`None` if it does not exist.
+
+	If the size and modification time match ``previous`` the hash is not recalculated.
+
+	:param filename:
+	:param previous: The state of the file when the cache was last written.
+	"""
+
+	try:
+		stat = os.stat(filename)
+	except FileNotFoundError:
+		return None
+
+	if filename.is_dir():
+		return {"size": 0, "mtime_ns": 0, "sha256": "directory"}
+
+	if previous and previous["size"] == stat.st_size and previous["mtime_ns"] == stat.st_mtime_ns:
+		return previous
+
+	return {
+			"size": stat.st_size,
+			"mtime_ns": stat.st_mtime_ns,
+			"sha256": hashlib.sha256(filename.read_bytes()).hexdigest(),
+			}
+
+
+def _manager_id(function: Manager) -> str:
+	return f"{function.__module__}.{function.__qualname__}"
+
+
+class ManagerCache:
+	"""
+	Records, for each manager, the hashes of the configuration, the templates, the input files
+	and the files it wrote, in :file:`{<repo_path>}/.repo_helper_cache/manifest.json`.
+
+	A manager can be skipped if none of those have changed since it last ran.
+
+	:param repo_path: Path to the repository root.
+	:param config: The configuration values, as found in the jinja2 environment's globals.
+	"""  # noqa: D400
+
+	def __init__(self, repo_path: PathLike, config: Mapping[str, Any]):
+		self.repo_path = PathPlus(repo_path)
+
+		#: The file the cache is stored in.
+		self.manifest_file = self.repo_path / cache_dir_name / "manifest.json"
+
+		self.config_hash = hash_config(config)
+		self.templates_hash = hash_templates()
+		self.input_files = get_input_files(config)
+
+		self._managers: Dict[str, Dict[str, Any]] = {}
+
+		if self.manifest_file.is_file():
+			try:
+				manifest = self.manifest_file.load_json()
+			except ValueError:
+				manifest = {}
+
+			if manifest.get("version") == __version__:
+				self._managers = manifest.get("managers", {})
+
+	def _files_unchanged(self, files: Mapping[str, _FileState]) -> bool:
+		for filename, previous in files.items():
+			if _get_file_state(self.repo_path / filename, previous) != previous:
+				return False
+
+		return True
+
+	def is_fresh(self, function: Manager) -> bool:
+		"""
+		Returns whether the output of ``function`` is up to date.
+
+		:param function:
+		"""
+
+		entry = self._managers.get(_manager_id(function))
+
+		if not entry:
+			return False
+		elif entry["config"] != self.config_hash or entry["templates"] != self.templates_hash:
+			return False
+		elif sorted(entry["inputs"]) != self.input_files:
+			return False
+
+		return self._files_unchanged(entry["inputs"]) and self._files_unchanged(entry["outputs"])
+
+	def get_outputs(self, function: Manager) -> List[str]:
+		"""
+		Returns the files which ``function`` returned when it was last run.
+
+		:param function:
+		"""
+
+		return list(self._managers[_manager_id(function)]["outputs"])
+
+	def record(self, function: Manager, outputs: Iterable[str]) -> None:
+		"""
+		Record that ``function`` has been run, and the files it returned.
+
+		The state of the input files is read when the cache is saved.
+
+		:param function:
+		:param outputs:
+		"""
+
+		self._managers[_manager_id(function)] = {
+				"config": self.config_hash,
+				"templates": self.templates_hash,
+				"inputs": {},
+				"outputs": {str(filename): None for filename in outputs},
+				}
+
+	def save(self) -> None:
+		"""
+		Write the cache to disk.
+		"""
+
+		inputs = {filename: _get_file_state(self.repo_path / filename) for filename in self.input_files}
+
+		for entry in self._managers.values():
+			entry["inputs"] = inputs
+
+			for filename, previous in entry["outputs"].items():
+				entry["outputs"][filename] = _get_file_state(self.repo_path / filename, previous)
+
+		self.manifest_file.parent.maybe_make()
+		self.manifest_file.dump_json({"version": __version__, "managers": self._managers}, indent=2)
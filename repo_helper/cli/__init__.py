@@ -37,43 +37,153 @@ Core CLI tools.
 #
 
 # stdlib
+import contextlib
+import importlib
 import sys
 from functools import partial
-from typing import Optional
+from typing import List, Optional
 
 # 3rd party
 import click
 from click import Context
 from consolekit import CONTEXT_SETTINGS, SuggestionGroup, click_group
-from consolekit.options import force_option
+from consolekit.options import auto_default_option, flag_option, force_option
 from domdf_python_tools.paths import PathPlus
-from southwark.click import commit_message_option, commit_option
 
 # this package
 from repo_helper import __version__
-from repo_helper.cli.utils import run_repo_helper
 
 __all__ = ["cli", "cli_command", "cli_group"]
 
+#: Mapping of the names of the built-in commands to the modules in :mod:`repo_helper.cli.commands` defining them.
+#: A command's module is only imported when that command is invoked.
+_command_modules = {
+		"add": "add",
+		"broomstick": "broomstick",
+		"build": "build",
+		"fleet": "fleet",
+		"init": "init",
+		"make-recipe": "conda_recipe",
+		"make-schema": "make_schema",
+		"release": "release",
+		"show": "show",
+		"suggest": "suggest",
+		"wizard": "wizard",
+		}
+
+
+class _LazyGroup(SuggestionGroup):
+	"""
+	Group which imports the module defining a command the first time the command is requested.
+
+	Commands provided by other packages, via the ``repo_helper.command`` entry point,
+	are only loaded when listing the commands or when the requested command is not built-in.
+	"""
+
+	_loaded_entry_points = False
+
+	def _load_entry_points(self) -> None:
+		if not self._loaded_entry_points:
+			# this package
+			from repo_helper._entry_points import load_entry_points
+
+			load_entry_points("repo_helper.command")
+			self._loaded_entry_points = True
+
+	def get_command(self, ctx: Context, cmd_name: str) -> Optional[click.Command]:  # noqa: D102
+		if cmd_name in _command_modules:
+			importlib.import_module(f"repo_helper.cli.commands.{_command_modules[cmd_name]}")
+
+		elif cmd_name not in self.commands:
+			self._load_entry_points()
+
+			if cmd_name not in self.commands:
+				# Import everything so the closest match can be suggested.
+				for module in _command_modules.values():
+					importlib.import_module(f"repo_helper.cli.commands.{module}")
+
+		return super().get_command(ctx, cmd_name)
+
+	def list_commands(self, ctx: Context) -> List[str]:  # noqa: D102
+		self._load_entry_points()
+		return sorted({*self.commands, *_command_modules})
+
 
 @click.version_option(__version__)
-@click_group(invoke_without_command=True)
+@auto_default_option(
+		"-j",
+		"--jobs",
+		type=click.IntRange(min=0),
+		help="The number of files to update concurrently. 0 uses the number of processors.",
+		show_default=True,
+		)
+@click_group(invoke_without_command=True, cls=_LazyGroup)
+@click.option(
+		"--profile-trace",
+		type=click.Path(dir_okay=False, writable=True),
+		default=None,
+		help="Write the time taken by each step to the given file, in the Chrome trace event format.",
+		)
+@flag_option("--profile", help="Show the time taken, and the files read and written, by each step.")
+@flag_option("--cache", help="Skip files whose configuration and inputs are unchanged since the last run.")
 @force_option(help_text="Run 'repo_helper' even when the git working directory is not clean.")
-@commit_option(default=None)
-@commit_message_option("Updated files with 'repo_helper'.")
+# The same as southwark.click.commit_option and commit_message_option,
+# which can't be imported here without also importing dulwich.
+@click.option(
+		"-y/-n",
+		"--commit/--no-commit",
+		default=None,
+		show_default="Ask first",
+		help="Commit or do not commit any changed files.",
+		)
+@click.option(
+		"-m",
+		"--message",
+		type=click.STRING,
+		default="Updated files with 'repo_helper'.",
+		help="The commit message to use.",
+		show_default=True,
+		)
 @click.pass_context
-def cli(ctx: Context, force: bool, commit: Optional[bool], message: str):
+def cli(
+		ctx: Context,
+		force: bool,
+		commit: Optional[bool],
+		message: str,
+		cache: bool,
+		profile: bool,
+		profile_trace: Optional[str],
+		jobs: int = 1,
+		):
 	"""
 	Update files in the given repositories, based on settings in 'repo_helper.yml'.
 	"""
 
+	if profile or profile_trace:
+		_enable_profiling(ctx, show_table=profile, trace_file=profile_trace)
+
 	path = PathPlus.cwd()
 	ctx.obj["PATH"] = path
 	ctx.obj["commit"] = commit
 	ctx.obj["force"] = force
+	ctx.obj["jobs"] = jobs
+	ctx.obj["cache"] = cache
 
 	if ctx.invoked_subcommand is None:
-		sys.exit(run_repo_helper(path=path, force=force, initialise=False, commit=commit, message=message))
+		# this package
+		from repo_helper.cli.utils import run_repo_helper
+
+		sys.exit(
+				run_repo_helper(
+						path=path,
+						force=force,
+						initialise=False,
+						commit=commit,
+						message=message,
+						jobs=jobs,
+						cache=cache,
+						)
+				)
 
 	else:
 		if message != "Updated files with 'repo_helper'.":
@@ -83,5 +193,34 @@ def cli(ctx: Context, force: bool, commit: Optional[bool], message: str):
 					)
 
 
+def _enable_profiling(ctx: Context, show_table: bool, trace_file: Optional[str]) -> None:
+	"""
+	Record the time taken by each step until the command finishes, then report it.
+
+	:param ctx:
+	:param show_table: Whether to print a table of the steps to stderr.
+	:param trace_file: The file to write the Chrome trace events to, if any.
+	"""
+
+	# this package
+	from repo_helper.profiling import Profiler
+
+	profiler = Profiler()
+	stack = contextlib.ExitStack()
+	stack.enter_context(profiler.activate())
+
+	def report() -> None:
+		stack.close()
+
+		if show_table:
+			click.echo(file=sys.stderr)
+			click.echo(profiler.format_table(), err=True)
+
+		if trace_file:
+			profiler.write_trace(trace_file)
+
+	ctx.call_on_close(report)
+
+
 cli_command = partial(cli.command, context_settings=CONTEXT_SETTINGS)
 cli_group = partial(cli.group, context_settings=CONTEXT_SETTINGS, cls=SuggestionGroup)
@@ -28,7 +28,7 @@ from typing import Optional
 
 # 3rd party
 import click
-from consolekit.options import flag_option
+from consolekit.options import auto_default_option, flag_option
 from domdf_python_tools.typing import PathLike
 
 # this package
@@ -44,6 +44,61 @@ __all__ = ["build"]
 @flag_option("-b", "--binary", help="Build a binary wheel.")
 @flag_option("-s", "--source", help="Build a source distribution.")
 @flag_option("-c", "--conda", help="Build a conda distribution.")
+@auto_default_option(
+		"--conda-format",
+		type=click.Choice(["tar.bz2", "conda"]),
+		help="The format of the conda distribution. The 'conda' format requires 'zstandard'.",
+		show_default=True,
+		)
+@auto_default_option(
+		"--zstd-level",
+		type=click.IntRange(min=1, max=22),
+		help="The zstd compression level for the 'conda' format.",
+		show_default=True,
+		)
+@auto_default_option(
+		"--zstd-threads",
+		type=click.IntRange(min=0),
+		help="The number of threads used to compress the 'conda' format. 0 uses the number of processors.",
+		show_default=True,
+		)
+@click.option(
+		"--wheel-compression",
+		type=click.STRING,
+		default=None,
+		metavar="METHOD[:LEVEL]",
+		help="The compression for wheels. METHOD is one of 'stored', 'deflated', 'bzip2' or 'lzma'.",
+		)
+@click.option(
+		"--sdist-compression",
+		type=click.STRING,
+		default=None,
+		metavar="gz[:LEVEL]",
+		help="The compression for source distributions.",
+		)
+@auto_default_option(
+		"--compression-threads",
+		type=click.IntRange(min=0),
+		help="The number of threads used to compress wheels. 0 uses the number of processors.",
+		show_default=True,
+		)
+@flag_option(
+		"-i",
+		"--incremental",
+		help="Reuse the files and metadata which are unchanged since the last build.",
+		)
+@flag_option(
+		"-r",
+		"--reproducible",
+		help="Create reproducible archives, with timestamps clamped to $SOURCE_DATE_EPOCH.",
+		)
+@auto_default_option(
+		"-j",
+		"--jobs",
+		type=click.IntRange(min=0),
+		help="The number of distributions to build concurrently. 0 builds them all at once.",
+		show_default=True,
+		)
 @cli_command()
 def build(
 		repository: PathLike = '.',
@@ -53,16 +108,27 @@ def build(
 		source: bool = False,
 		verbose: bool = False,
 		conda: bool = False,
+		conda_format: str = "tar.bz2",
+		zstd_level: int = 10,
+		zstd_threads: int = 0,
+		wheel_compression: Optional[str] = None,
+		sdist_compression: Optional[str] = None,
+		compression_threads: int = 0,
+		incremental: bool = False,
+		reproducible: bool = False,
+		jobs: int = 0,
 		):
 	"""
 	Build a wheel for the given repository.
 	"""
 
 	# 3rd party
+	from consolekit.utils import abort
 	from domdf_python_tools.paths import PathPlus
+	from tabulate import tabulate
 
 	# this package
-	from repo_helper.build import Builder
+	from repo_helper.build import Builder, Compression
 
 	if not binary and not source and not conda:
 		binary = True
@@ -73,11 +139,33 @@ def build(
 	else:
 		repository = PathPlus(repository)
 
-	builder = Builder(repo_dir=repository, build_dir=build_dir, out_dir=out_dir, verbose=verbose)
+	compression = {}
 
-	if conda:
-		builder.build_conda()
-	elif binary:
-		builder.build_wheel()
-	if source:
-		builder.build_sdist()
+	try:
+		if wheel_compression is not None:
+			compression["wheel"] = Compression.parse(wheel_compression).validate("wheel")
+		if sdist_compression is not None:
+			compression["sdist"] = Compression.parse(sdist_compression).validate("sdist")
+	except ValueError as e:
+		raise abort(str(e))
+
+	builder = Builder(
+			repo_dir=repository,
+			build_dir=build_dir,
+			out_dir=out_dir,
+			verbose=verbose,
+			conda_format=conda_format,
+			zstd_level=zstd_level,
+			zstd_threads=zstd_threads,
+			compression=compression,
+			compression_threads=compression_threads,
+			incremental=incremental,
+			reproducible=reproducible or None,
+			)
+
+	targets = [target for target, enabled in [("wheel", binary), ("sdist", source), ("conda", conda)] if enabled]
+	results = builder.build_targets(targets, jobs=jobs)
+
+	if len(results) > 1:
+		rows = [[result.target, result.filename, f"{result.duration:0.2f}"] for result in results]
+		click.echo(tabulate(rows, headers=["Target", "Filename", "Time (s)"]))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+#
+#  fleet.py
+"""
+Run ``repo_helper`` for many repositories at once.
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+# stdlib
+import sys
+from typing import Iterable
+
+# 3rd party
+import click
+from consolekit.options import auto_default_option, flag_option, force_option
+from southwark.click import commit_message_option
+
+# this package
+from repo_helper.cli import cli_command
+
+__all__ = ["fleet"]
+
+
+@click.argument("paths", type=click.STRING, nargs=-1, required=True)
+@flag_option("--cache", help="Skip files whose configuration and inputs are unchanged since the last run.")
+@flag_option("-y", "--commit", help="Commit any changed files.")
+@commit_message_option("Updated files with 'repo_helper'.")
+@force_option(help_text="Run 'repo_helper' even when the git working directory is not clean.")
+@auto_default_option(
+		"-j",
+		"--jobs",
+		type=click.IntRange(min=0),
+		help="The number of worker processes. 0 uses the number of processors.",
+		show_default=True,
+		)
+@cli_command()
+def fleet(
+		paths: Iterable[str],
+		message: str,
+		force: bool = False,
+		commit: bool = False,
+		cache: bool = False,
+		jobs: int = 0,
+		):
+	"""
+	Run 'repo_helper' for many repositories.
+
+	Each PATH may be a repository, a directory of repositories,
+	or a text file listing one repository per line.
+	"""
+
+	# stdlib
+	from collections import Counter
+
+	# 3rd party
+	from consolekit.terminal_colours import Fore, resolve_color_default
+	from consolekit.utils import abort
+	from tabulate import tabulate
+
+	# this package
+	from repo_helper.fleet import discover_repositories, run_fleet
+
+	repositories = discover_repositories(paths)
+
+	if not repositories:
+		raise abort("No repositories found.")
+
+	colours = {"changed": Fore.GREEN, "unchanged": str, "skipped": Fore.YELLOW, "failed": Fore.RED}
+	counts: Counter = Counter()
+	rows = []
+
+	for result in run_fleet(repositories, jobs=jobs, force=force, commit=commit, message=message, cache=cache):
+		counts[result.status] += 1
+		rows.append([
+				result.path,
+				colours[result.status](result.status),
+				f"{result.duration:0.2f}",
+				result.details,
+				])
+
+	click.echo(
+			tabulate(rows, headers=["Repository", "Status", "Time (s)", "Details"]),
+			color=resolve_color_default(),
+			)
+	click.echo()
+	click.echo(', '.join(f"{counts[status]} {status}" for status in colours))
+
+	sys.exit(1 if counts["failed"] else 0)
@@ -43,7 +43,7 @@ from southwark.click import commit_message_option, commit_option
 # this package
 from repo_helper.cli import cli_command
 from repo_helper.cli.utils import run_repo_helper
-from repo_helper.templates import init_repo_template_dir
+from repo_helper.templates import init_repo_template_dir, make_environment
 
 __all__ = ["init", "init_repo", "base_license_url", "license_file_lookup"]
 
@@ -69,6 +69,8 @@ def init(ctx, force: bool, commit: bool, message: str):
 			initialise=True,
 			commit=commit,
 			message=message,
+			jobs=ctx.obj.get("jobs", 1),
+			cache=ctx.obj.get("cache", False),
 			)
 
 	sys.exit(ret)
@@ -121,10 +123,7 @@ def init_repo(repo_path: pathlib.Path, templates: jinja2.Environment) -> List[st
 	repo_path = PathPlus(repo_path)
 	templates.globals["len"] = len
 
-	init_repo_templates = jinja2.Environment(  # nosec: B701
-		loader=jinja2.FileSystemLoader(str(init_repo_template_dir)),
-		undefined=jinja2.StrictUndefined,
-		)
+	init_repo_templates = make_environment(init_repo_template_dir)
 	init_repo_templates.globals.update(templates.globals)
 
 	# package
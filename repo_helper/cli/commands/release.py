@@ -26,7 +26,7 @@ Make a release.
 # stdlib
 from functools import partial
 from types import MethodType
-from typing import Callable, List, Optional, Tuple, cast
+from typing import Callable, List, Optional, Sequence, Tuple, cast
 
 # 3rd party
 import click
@@ -65,7 +65,34 @@ def release_options(f: Callable) -> Callable:
 	commit_deco = commit_option(default=True)
 	message_deco = commit_message_option(default="Bump version {current_version} -> {new_version}")
 	force_deco = force_option(help_text="Make a release even when the git working directory is not clean.")
-	return force_deco(commit_deco(message_deco(f)))
+	repo_deco = click.option(
+			"--repo",
+			"repositories",
+			type=click.Path(file_okay=False, exists=True),
+			multiple=True,
+			help=(
+					"The repository to make the release in. May be given multiple times to make releases "
+					"in several repositories at once. Defaults to the current directory."
+					),
+			)
+	return repo_deco(force_deco(commit_deco(message_deco(f))))
+
+
+def _bump(version: str, repositories: Sequence[str], commit: Optional[bool], message: str, force: bool) -> None:
+	"""
+	Bump the version of each of the given repositories, or the current directory if none are given.
+
+	:param version: Either ``'major'``, ``'minor'``, ``'patch'``, ``'today'``, or the new version number.
+	:param repositories:
+	:param commit: Whether to commit automatically (:py:obj:`True`) or ask first (:py:obj:`None`).
+	:param message: The commit message.
+	:param force: Whether to force bumping the version when a repository is unclean.
+	"""
+
+	# this package
+	from repo_helper.release import bump_repositories
+
+	bump_repositories(repositories or [PathPlus.cwd()], version, commit, message, force)
 
 
 def resolve_command(self, ctx, args: List[str]) -> Tuple[str, Command, List[str]]:
@@ -109,16 +136,14 @@ def resolve_command(self, ctx, args: List[str]) -> Tuple[str, Command, List[str]
 				type=click.STRING,
 				)
 		@release_command()
-		def version(version: str, commit: Optional[bool], message: str, force: bool):
-
-			# 3rd party
-			from domdf_python_tools.versions import Version
-
-			# this package
-			from repo_helper.release import Bumper
-
-			bumper = Bumper(PathPlus.cwd(), force)
-			bumper.bump(Version.from_str(version), commit, message)
+		def version(
+				version: str,
+				repositories: Sequence[str],
+				commit: Optional[bool],
+				message: str,
+				force: bool,
+				):
+			_bump(version, repositories, commit, message, force)
 
 		return "version", cast(Command, version), args
 
@@ -132,55 +157,39 @@ release_command = partial(release.command, context_settings=CONTEXT_SETTINGS)
 
 @release_options
 @release_command()
-def major(commit: Optional[bool], message: str, force: bool):
+def major(repositories: Sequence[str], commit: Optional[bool], message: str, force: bool):
 	"""
 	Bump to the next major version.
 	"""
 
-	# this package
-	from repo_helper.release import Bumper
-
-	bumper = Bumper(PathPlus.cwd(), force)
-	bumper.major(commit, message)
+	_bump("major", repositories, commit, message, force)
 
 
 @release_options
 @release_command()
-def minor(commit: Optional[bool], message: str, force: bool):
+def minor(repositories: Sequence[str], commit: Optional[bool], message: str, force: bool):
 	"""
 	Bump to the next minor version.
 	"""
 
-	# this package
-	from repo_helper.release import Bumper
-
-	bumper = Bumper(PathPlus.cwd(), force)
-	bumper.minor(commit, message)
+	_bump("minor", repositories, commit, message, force)
 
 
 @release_options
 @release_command()
-def patch(commit: Optional[bool], message: str, force: bool):
+def patch(repositories: Sequence[str], commit: Optional[bool], message: str, force: bool):
 	"""
 	Bump to the next patch version.
 	"""
 
-	# this package
-	from repo_helper.release import Bumper
-
-	bumper = Bumper(PathPlus.cwd(), force)
-	bumper.patch(commit, message)
+	_bump("patch", repositories, commit, message, force)
 
 
 @release_options
 @release_command()
-def today(commit: Optional[bool], message: str, force: bool):
+def today(repositories: Sequence[str], commit: Optional[bool], message: str, force: bool):
 	"""
 	Bump to the calver version for today's date, such as 2020.12.25.
 	"""
 
-	# this package
-	from repo_helper.release import Bumper
-
-	bumper = Bumper(PathPlus.cwd(), force)
-	bumper.today(commit, message)
+	_bump("today", repositories, commit, message, force)
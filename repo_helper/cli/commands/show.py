@@ -26,7 +26,7 @@ Show information about the repository.
 # stdlib
 from datetime import datetime
 from functools import partial
-from typing import Iterable, List, Optional, Union
+from typing import Iterable, Iterator, List, Optional, Union
 
 # 3rd party
 import click
@@ -49,6 +49,30 @@ def show() -> None:
 show_command = partial(show.command, context_settings=CONTEXT_SETTINGS)
 
 
+def _echo_log(commit_log: Iterator[str], colour: Optional[bool] = None, no_pager: bool = False) -> None:
+	"""
+	Write the commit log entries to the terminal, or to the pager, as they are produced.
+
+	If the pager is closed no further entries are formatted.
+
+	:param commit_log:
+	:param colour:
+	:param no_pager:
+	"""
+
+	# 3rd party
+	from consolekit.terminal_colours import resolve_color_default
+
+	colour = resolve_color_default(colour)
+
+	if no_pager:
+		for entry in commit_log:
+			click.echo(entry, nl=False, color=colour)
+		click.echo(color=colour)
+	else:
+		click.echo_via_pager(commit_log, color=colour)
+
+
 @flag_option("-q", "--quiet", help="Print only the version number.")
 @show_command()
 def version(quiet: bool = False) -> None:
@@ -115,23 +139,21 @@ def log(
 	"""
 
 	# 3rd party
-	from consolekit.terminal_colours import resolve_color_default
 	from consolekit.utils import abort
 	from domdf_python_tools.paths import PathPlus
-	from southwark.log import Log
 	from southwark.repo import Repo
 
+	# this package
+	from repo_helper._log import Log
+
 	repo = Repo(PathPlus.cwd())
 
 	try:
-		commit_log = Log(repo).log(max_entries=entries, reverse=reverse, from_date=from_date, from_tag=from_tag)
+		commit_log = Log(repo).iter_log(max_entries=entries, reverse=reverse, from_date=from_date, from_tag=from_tag)
 	except ValueError as e:
 		raise abort(f"ERROR: {e}")
 
-	if no_pager:
-		click.echo(commit_log, color=resolve_color_default(colour))
-	else:
-		click.echo_via_pager(commit_log, color=resolve_color_default(colour))
+	_echo_log(commit_log, colour, no_pager)
 
 	return 0
 
@@ -158,13 +180,12 @@ def changelog(
 	"""
 
 	# 3rd party
-	from consolekit.terminal_colours import resolve_color_default
 	from consolekit.utils import abort
 	from domdf_python_tools.paths import PathPlus
-	from southwark.log import Log
 	from southwark.repo import Repo
 
 	# this package
+	from repo_helper._log import Log
 	from repo_helper.core import RepoHelper
 
 	rh = RepoHelper(PathPlus.cwd())
@@ -172,7 +193,7 @@ def changelog(
 	repo = Repo(rh.target_repo)
 
 	try:
-		commit_log = Log(repo).log(
+		commit_log = Log(repo).iter_log(
 				max_entries=entries,
 				reverse=reverse,
 				from_tag=f"v{rh.templates.globals['version']}",
@@ -180,13 +201,18 @@ def changelog(
 	except ValueError as e:
 		raise abort(f"ERROR: {e}")
 
-	if no_pager:
-		click.echo(commit_log, color=resolve_color_default(colour))
-	else:
-		click.echo_via_pager(commit_log, color=resolve_color_default(colour))
+	_echo_log(commit_log, colour, no_pager)
 
 
 @no_pager_option()
+@auto_default_option(
+		"-f",
+		"--format",
+		"output_format",
+		type=click.Choice(["tree", "json", "dot"], case_sensitive=False),
+		help="The output format.",
+		show_default=True,
+		)
 @auto_default_option(
 		"-d",
 		"--depth",
@@ -202,6 +228,7 @@ def requirements(
 		depth: int = -1,
 		concise: bool = False,
 		no_venv: bool = False,
+		output_format: str = "tree",
 		):
 	"""
 	Lists the requirements of this library, and their dependencies.
@@ -212,19 +239,14 @@ def requirements(
 	import shutil
 
 	# 3rd party
-	from domdf_python_tools.compat import importlib_metadata
 	from domdf_python_tools.iterative import make_tree
 	from domdf_python_tools.paths import PathPlus, in_directory
 	from domdf_python_tools.stringlist import StringList
 	from packaging.requirements import Requirement
-	from shippinglabel.requirements import (
-			ComparableRequirement,
-			combine_requirements,
-			list_requirements,
-			read_requirements
-			)
+	from shippinglabel.requirements import ComparableRequirement, combine_requirements, read_requirements
 
 	# this package
+	from repo_helper._requirements import DistributionIndex, tree_to_dot, tree_to_json
 	from repo_helper.core import RepoHelper
 
 	rh = RepoHelper(PathPlus.cwd())
@@ -232,10 +254,12 @@ def requirements(
 
 	with in_directory(rh.target_repo):
 
-		buf = StringList([f"{rh.templates.globals['pypi_name']}=={rh.templates.globals['version']}"])
+		root = f"{rh.templates.globals['pypi_name']}=={rh.templates.globals['version']}"
+		buf = StringList([root])
 		raw_requirements = sorted(read_requirements("requirements.txt")[0])
 		tree: List[Union[str, List[str], List[Union[str, List]]]] = []
 		venv_dir = (rh.target_repo / "venv")
+		search_path: Optional[List[str]] = None
 
 		if venv_dir.is_dir() and not no_venv:
 			# Use virtualenv as it exists
@@ -244,7 +268,7 @@ def requirements(
 			for directory in (venv_dir / "lib").glob("python3.*"):
 				search_path.append(str(directory / "site-packages"))
 
-			importlib_metadata.DistributionFinder.Context.path = search_path  # type: ignore
+		index = DistributionIndex(search_path)
 
 		if concise:
 			concise_requirements = []
@@ -259,7 +283,7 @@ def requirements(
 			for requirement in raw_requirements:
 				concise_requirements.append(requirement)
 				# TODO: remove "extra == " marker
-				for req in flatten(list_requirements(str(requirement), depth=depth - 1)):
+				for req in flatten(index.list_requirements(str(requirement), depth=depth - 1)):
 					concise_requirements.append(ComparableRequirement(re.sub('; extra == ".*"', '', req)))
 
 			concise_requirements = sorted(set(combine_requirements(concise_requirements)))
@@ -268,10 +292,17 @@ def requirements(
 		else:
 			for requirement in raw_requirements:
 				tree.append(str(requirement))
-				deps = list(list_requirements(str(requirement), depth=depth - 1))
+				deps = index.list_requirements(str(requirement), depth=depth - 1)
 				if deps:
 					tree.append(deps)
 
+		if output_format.lower() == "json":
+			click.echo(tree_to_json(root, tree))
+			return
+		elif output_format.lower() == "dot":
+			click.echo(tree_to_dot(root, tree))
+			return
+
 		buf.extend(make_tree(tree))
 
 		if shutil.get_terminal_size().lines >= len(buf):
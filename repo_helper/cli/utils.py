@@ -24,11 +24,14 @@ CLI utility functions.
 #
 
 # stdlib
+import hashlib
+import json
 import logging
 import os
 import platform
+import sys
 import textwrap
-from typing import Iterable, Optional
+from typing import Dict, Iterable, Optional
 
 # 3rd party
 import click
@@ -37,20 +40,84 @@ from consolekit.terminal_colours import Fore
 from consolekit.utils import abort
 from domdf_python_tools.paths import PathPlus, in_directory
 from domdf_python_tools.typing import PathLike
-from dulwich.errors import CommitError
-from pre_commit.commands import install_uninstall  # type: ignore
-from southwark import assert_clean
-from southwark.repo import Repo
 
 __all__ = [
 		"commit_changed_files",
+		"install_pre_commit_hook",
 		"run_repo_helper",
 		]
 
 # Disable logging from pre-commit install command
-logging.getLogger(install_uninstall.__name__).addHandler(logging.NullHandler())
-logging.getLogger(install_uninstall.__name__).propagate = False
-logging.getLogger(install_uninstall.__name__).addFilter(lambda record: False)
+logging.getLogger("pre_commit.commands.install_uninstall").addHandler(logging.NullHandler())
+logging.getLogger("pre_commit.commands.install_uninstall").propagate = False
+logging.getLogger("pre_commit.commands.install_uninstall").addFilter(lambda record: False)
+
+
+def _pre_commit_hook_state(repo_path: PathPlus, git_dir: PathPlus) -> Optional[Dict[str, str]]:
+	"""
+	Returns the hashes of the installed pre-commit hook script and ``.pre-commit-config.yaml``,
+	or :py:obj:`None` if the hook is not installed.
+
+	:param repo_path: The path to the repository root.
+	:param git_dir: The repository's ``.git`` directory.
+	"""  # noqa: D400
+
+	try:
+		hook = (git_dir / "hooks" / "pre-commit").read_bytes()
+	except OSError:
+		return None
+
+	try:
+		config = (repo_path / ".pre-commit-config.yaml").read_bytes()
+	except OSError:
+		config = b''
+
+	return {
+			"hook": hashlib.sha256(hook).hexdigest(),
+			"config": hashlib.sha256(config).hexdigest(),
+			"python": sys.executable,
+			}
+
+
+def install_pre_commit_hook(repo_path: PathLike, git_dir: Optional[PathLike] = None) -> bool:
+	"""
+	Install the pre-commit git hook, as ``pre-commit install`` does.
+
+	The hashes of the installed hook script and ``.pre-commit-config.yaml`` are recorded in the ``.git`` directory.
+	If neither has changed since the hook was last installed, nothing is done and ``pre_commit`` is not imported.
+
+	:param repo_path: The path to the repository root.
+	:param git_dir: The repository's ``.git`` directory.
+	:default git_dir: :file:`{<repo_path>}/.git`
+
+	:returns: :py:obj:`True` if the hook was installed. :py:obj:`False` if it was already up to date.
+	"""
+
+	repo_path = PathPlus(repo_path)
+	git_dir = PathPlus(git_dir or repo_path / ".git")
+	state_file = git_dir / "repo_helper_pre_commit.json"
+
+	state = _pre_commit_hook_state(repo_path, git_dir)
+
+	if state is not None:
+		try:
+			if json.loads(state_file.read_text()) == state:
+				return False
+		except (OSError, ValueError):
+			pass
+
+	# 3rd party
+	import pre_commit.main  # type: ignore
+
+	with in_directory(repo_path):
+		ret = pre_commit.main.main(["install"])
+
+	state = _pre_commit_hook_state(repo_path, git_dir)
+
+	if not ret and state is not None:
+		state_file.dump_json(state)
+
+	return True
 
 
 def commit_changed_files(
@@ -74,20 +141,23 @@ def commit_changed_files(
 	"""
 
 	# 3rd party
-	import pre_commit.main  # type: ignore
+	from dulwich.errors import CommitError
+	from southwark.repo import Repo
 
 	# this package
+	from repo_helper.profiling import span
 	from repo_helper.utils import commit_changes, sort_paths, stage_changes
 
 	repo_path = PathPlus(repo_path).absolute()
 	r = Repo(str(repo_path))
 
-	staged_files = stage_changes(r.path, managed_files)
+	with span("stage_changes", "git"):
+		staged_files = stage_changes(r.path, managed_files)
 
 	# Ensure pre-commit hooks are installed
 	if enable_pre_commit and platform.system() == "Linux":
-		with in_directory(repo_path):
-			pre_commit.main.main(["install"])
+		with span("pre-commit install", "git"):
+			install_pre_commit_hook(repo_path, r.controldir())
 
 	if staged_files:
 		click.echo("\nThe following files will be committed:")
@@ -127,6 +197,8 @@ def run_repo_helper(
 		commit: Optional[bool],
 		message: str,
 		enable_pre_commit: bool = True,
+		jobs: int = 1,
+		cache: bool = False,
 		) -> int:
 	"""
 	Run repo_helper.
@@ -137,15 +209,23 @@ def run_repo_helper(
 	:param commit: Whether to commit unchanged files.
 	:param message: The commit message.
 	:param enable_pre_commit: Whether to install and configure pre-commit. Default :py:obj`True`.
+	:param jobs: The number of managers to run concurrently.
+	:param cache: Whether to skip managers whose inputs are unchanged since the last run.
 	"""
 
+	# 3rd party
+	from dulwich.errors import CommitError
+	from southwark.repo import Repo
+
 	# this package
 	from repo_helper.cli.commands.init import init_repo
+	from repo_helper.configuration import migrate_config
 	from repo_helper.core import RepoHelper
-	from repo_helper.utils import easter_egg
+	from repo_helper.utils import assert_clean, easter_egg
 
 	try:
 		rh = RepoHelper(path)
+		migrate_config(rh.target_repo)
 		rh.load_settings()
 	except FileNotFoundError as e:
 		error_block = textwrap.indent(str(e), '\t')
@@ -162,7 +242,7 @@ def run_repo_helper(
 		for filename in init_repo(rh.target_repo, rh.templates):
 			r.stage(os.path.normpath(filename))
 
-	managed_files = rh.run()
+	managed_files = rh.run(jobs=jobs, cache=cache)
 
 	try:
 		commit_changed_files(
@@ -28,7 +28,6 @@ from operator import methodcaller
 from typing import Any, Dict, Iterable, List
 
 # 3rd party
-import jinja2
 from domdf_python_tools.paths import PathPlus
 from domdf_python_tools.typing import PathLike
 from first import first
@@ -37,7 +36,7 @@ from shippinglabel.pypi import get_pypi_releases
 
 # this package
 from repo_helper.configuration import parse_yaml
-from repo_helper.templates import template_dir
+from repo_helper.templates import make_environment, template_dir
 
 __all__ = ["make_recipe"]
 
@@ -74,10 +73,7 @@ def make_recipe(repo_dir: PathLike, recipe_file: PathLike) -> None:
 
 	requirements_block = '\n'.join([f"    - {req}" for req in get_conda_requirements(repo_dir, config)])
 
-	templates = jinja2.Environment(  # nosec: B701
-		loader=jinja2.FileSystemLoader(str(template_dir)),
-		undefined=jinja2.StrictUndefined,
-		)
+	templates = make_environment(template_dir)
 
 	recipe_template = templates.get_template("conda_recipe.yaml")
 	recipe_file.write_clean(
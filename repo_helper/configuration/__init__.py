@@ -24,25 +24,31 @@ Configuration options.
 #
 
 # stdlib
+import hashlib
 import json
+import os
+import posixpath
 import re
 from io import StringIO
-from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Sequence, Set, Union
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Sequence, Set, Tuple, Union
 
 # 3rd party
 import click
+import jsonschema  # type: ignore
 from configconfig.metaclass import ConfigVarMeta
 from configconfig.parser import Parser
 from configconfig.utils import make_schema
 from domdf_python_tools.compat import importlib_resources
 from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.stringlist import StringList
 from domdf_python_tools.typing import PathLike
 from domdf_python_tools.versions import Version
 from natsort import natsorted
-from ruamel.yaml import YAML
+from ruamel.yaml import YAML, safe_load
 
 # this package
 import repo_helper
+from repo_helper._entry_points import get_cache_dir
 from repo_helper.configuration import (
 		conda_anaconda,
 		documentation,
@@ -195,6 +201,7 @@ __all__ = [
 		"on_pypi",
 		"parse_extras",
 		"parse_yaml",
+		"migrate_config",
 		"pkginfo_extra",
 		"platforms",
 		"preserve_custom_theme",
@@ -243,10 +250,118 @@ __all__ = [
 		]
 
 
+#: Matches lines in ``repo_helper.yml`` setting options which are no longer supported.
+_legacy_options = re.compile("^(use_travis|travis_pypi_secure|travis_site)")
+
+# Mapping of cache slots (one per configuration file) to the cache key, dependencies and serialised configuration.
+_config_cache: Dict[str, Tuple[str, Dict[str, Optional[str]], str]] = {}
+
+
+def _find_config_file(repo_path: PathPlus) -> PathPlus:
+	for filename in ("repo_helper.yml", "git_helper.yml"):
+		if (repo_path / filename).is_file():
+			return repo_path / filename
+
+	raise FileNotFoundError(f"'repo_helper.yml' not found in {repo_path}")
+
+
+def _strip_legacy_options(content: str) -> List[str]:
+	return [line for line in content.split('\n') if not _legacy_options.match(line)]
+
+
+def migrate_config(repo_path: PathLike) -> bool:
+	"""
+	Update the configuration file from older versions of ``repo_helper``.
+
+	* ``git_helper.yml`` is renamed to ``repo_helper.yml``.
+	* Options which are no longer supported (such as ``use_travis``) are removed.
+
+	:func:`~.parse_yaml` does not modify the configuration file;
+	this function should be called before the configuration is loaded by commands which update the repository.
+
+	:param repo_path: Path to the repository root.
+
+	:returns: Whether the configuration file was changed.
+	"""
+
+	repo_path = PathPlus(repo_path)
+	changed = False
+
+	if (repo_path / "git_helper.yml").is_file():
+		(repo_path / "git_helper.yml").rename(repo_path / "repo_helper.yml")
+		changed = True
+
+	config_file = _find_config_file(repo_path)
+	content = config_file.read_text()
+
+	migrated = StringList('\n'.join(_strip_legacy_options(content)))
+	migrated.blankline(ensure_single=True)
+
+	# Only write when something has changed, as updating the modification time invalidates caches.
+	if str(migrated) != content:
+		config_file.write_text(str(migrated))
+		changed = True
+
+	return changed
+
+
+def _file_hash(filename: PathPlus) -> Optional[str]:
+	try:
+		return hashlib.sha256(filename.read_bytes()).hexdigest()
+	except OSError:
+		return None
+
+
+def _validators_fingerprint() -> str:
+	"""
+	Returns a string identifying the validator of each configuration variable,
+	so patched validators do not receive cached results.
+	"""  # noqa: D400
+
+	validators = []
+
+	for var in all_values:
+		validator = getattr(var, "validator", None)
+		validators.append(f"{var.__name__}={getattr(validator, '__module__', '')}.{getattr(validator, '__qualname__', '')}")
+
+	return ','.join(validators)
+
+
+def _config_cache_key(content: bytes, allow_unknown_keys: bool) -> str:
+	sha = hashlib.sha256(content)
+	sha.update(f"\0{repo_helper.__version__}\0{allow_unknown_keys}\0{_validators_fingerprint()}".encode("UTF-8"))
+	return sha.hexdigest()
+
+
+def _config_cache_slot(config_file: PathPlus, allow_unknown_keys: bool) -> str:
+	"""
+	Returns the name under which the parsed configuration of ``config_file`` is cached.
+
+	Each configuration file has a single slot, which is overwritten whenever the file changes,
+	so the cache does not grow with every edit.
+
+	:param config_file:
+	:param allow_unknown_keys:
+	"""
+
+	return hashlib.sha256(f"{os.path.abspath(config_file)}\0{allow_unknown_keys}".encode("UTF-8")).hexdigest()
+
+
+def _config_cache_file(slot: str) -> str:
+	return os.path.join(get_cache_dir(), "config", f"{slot}.json")
+
+
 def parse_yaml(repo_path: PathLike, allow_unknown_keys: bool = False) -> Dict:
 	"""
 	Parse configuration values from ``repo_helper.yml``.
 
+	The configuration file is not modified; see :func:`~.migrate_config`.
+
+	The parsed configuration is cached in memory and on disk, keyed on the contents of the configuration file,
+	so repeated loads of an unchanged file do not parse it again.
+	Only the most recent configuration of each file is cached.
+	Set the ``REPO_HELPER_NO_CONFIG_CACHE`` environment variable to disable the on-disk cache.
+
 	:param repo_path: Path to the repository root.
 	:param allow_unknown_keys: Whether unknown keys should be allowed in the configuration file.
 
@@ -256,25 +371,55 @@ def parse_yaml(repo_path: PathLike, allow_unknown_keys: bool = False) -> Dict:
 	"""
 
 	repo_path = PathPlus(repo_path)
+	config_file = _find_config_file(repo_path)
+	content = config_file.read_bytes()
+	key = _config_cache_key(content, allow_unknown_keys)
+	slot = _config_cache_slot(config_file, allow_unknown_keys)
+	use_disk_cache = not os.environ.get("REPO_HELPER_NO_CONFIG_CACHE")
 
-	if (repo_path / "git_helper.yml").is_file():
-		(repo_path / "git_helper.yml").rename(repo_path / "repo_helper.yml")
-
-	config_file = repo_path / "repo_helper.yml"
+	if (slot not in _config_cache or _config_cache[slot][0] != key) and use_disk_cache:
+		try:
+			with open(_config_cache_file(slot), encoding="UTF-8") as fp:
+				entry = json.load(fp)
+			_config_cache[slot] = (entry["key"], entry["dependencies"], json.dumps(entry["config"]))
+		except (OSError, ValueError, KeyError, TypeError):
+			pass
 
-	if not config_file.is_file():
-		raise FileNotFoundError(f"'repo_helper.yml' not found in {repo_path}")
+	if slot in _config_cache:
+		cached_key, dependencies, serialised_config = _config_cache[slot]
 
-	config_file.write_lines([
-			line for line in config_file.read_lines()
-			if not re.match("^(use_travis|travis_pypi_secure|travis_site)", line)
-			])
+		if cached_key == key and all(
+				_file_hash(repo_path / filename) == state for filename, state in dependencies.items()
+				):
+			return json.loads(serialised_config)
 
 	parser = RepoHelperParser(allow_unknown_keys=allow_unknown_keys)
-	config_vars = parser.run(config_file)
-	config_file.write_clean(config_file.read_text())
+	config_vars = parser.parse(content.decode("UTF-8"), config_file)
+
+	try:
+		serialised_config = json.dumps(config_vars)
+	except (TypeError, ValueError):
+		# Not representable as JSON; don't cache
+		return config_vars
+
+	dependencies = {filename: _file_hash(repo_path / filename) for filename in sorted(parser.dependencies)}
+	_config_cache[slot] = (key, dependencies, serialised_config)
+
+	if use_disk_cache:
+		try:
+			cache_file = _config_cache_file(slot)
+			os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+			tmp_file = f"{cache_file}.{os.getpid()}"
+			with open(tmp_file, 'w', encoding="UTF-8") as fp:
+				fp.write(
+						f'{{"key": {json.dumps(key)}, "dependencies": {json.dumps(dependencies)}, '
+						f'"config": {serialised_config}}}'
+						)
+			os.replace(tmp_file, cache_file)
+		except OSError:
+			pass
 
-	return config_vars
+	return json.loads(serialised_config)
 
 
 all_values: List[ConfigVarMeta] = []
@@ -306,6 +451,55 @@ class RepoHelperParser(Parser):
 
 	config_vars: List[ConfigVarMeta] = all_values
 
+	def __init__(self, allow_unknown_keys: bool = False):
+		super().__init__(allow_unknown_keys=allow_unknown_keys)
+
+		#: The files, relative to the repository root, which were read or checked for when parsing the configuration.
+		self.dependencies: Set[str] = set()
+
+	def run(self, filename: PathLike) -> MutableMapping[str, Any]:
+		"""
+		Parse configuration from the given file.
+
+		:param filename: The filename of the YAML configuration file.
+		"""
+
+		filename = PathPlus(filename)
+
+		if not filename.is_file():
+			raise FileNotFoundError(str(filename))
+
+		return self.parse(filename.read_text(), filename)
+
+	def parse(self, content: str, filename: PathLike) -> MutableMapping[str, Any]:
+		"""
+		Parse configuration from the given YAML string.
+
+		Options which are no longer supported (such as ``use_travis``) are ignored.
+
+		:param content: The contents of the YAML configuration file.
+		:param filename: The filename of the YAML configuration file.
+		"""
+
+		filename = PathPlus(filename)
+		raw_config_vars: Mapping[str, Any] = safe_load('\n'.join(_strip_legacy_options(content))) or {}
+
+		schema = make_schema(*self.config_vars)
+		schema["additionalProperties"] = self.allow_unknown_keys
+
+		try:
+			jsonschema.validate(raw_config_vars, schema, format_checker=jsonschema.FormatChecker())
+		except jsonschema.exceptions.ValidationError as e:
+			e.filename = str(filename)
+			raise e
+
+		parsed_config_vars: MutableMapping[str, Any] = {}
+
+		for var in self.config_vars:
+			parsed_config_vars[var.__name__] = getattr(self, f"visit_{var.__name__}", var.get)(raw_config_vars)
+
+		return self.custom_parsing(raw_config_vars, parsed_config_vars, filename)
+
 	def custom_parsing(
 			self,
 			raw_config_vars: Mapping[str, Any],
@@ -322,6 +516,14 @@ class RepoHelperParser(Parser):
 
 		repo_path = filename.parent
 
+		# Files which affect the parsed configuration, for invalidating the cache used by parse_yaml.
+		self.dependencies.update(raw_config_vars.get("additional_requirements_files", ()))
+		self.dependencies.update(
+				requires for requires in raw_config_vars.get("extras_require", {}).values()
+				if isinstance(requires, str)
+				)
+		self.dependencies.add(posixpath.join(parsed_config_vars["import_name"].replace('.', '/'), "py.typed"))
+
 		# Packaging
 		extras_require, additional_requirements_files = parse_extras(raw_config_vars, repo_path)
 		parsed_config_vars["extras_require"] = extras_require
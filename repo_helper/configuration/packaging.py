@@ -55,7 +55,11 @@ class manifest_additional(ConfigVar):  # noqa
 	.. code-block:: yaml
 
 		manifest_additional:
-		  - "recursive-include: repo_helper/templates *"
+		  - "recursive-include repo_helper/templates *"
+
+	When building with ``repo_helper.build`` the ``include``, ``exclude``, ``recursive-include``,
+	``recursive-exclude``, ``global-include``, ``global-exclude``, ``graft`` and ``prune`` directives are supported.
+	As with ``MANIFEST.in``, the last entry which matches a file determines whether it is included.
 	"""
 
 	dtype = List[str]
@@ -24,8 +24,10 @@ Core functionality of ``repo_helper``.
 #
 
 # stdlib
+import os
 import os.path
-from typing import List, Tuple, Type
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type
 
 # 3rd party
 import jinja2
@@ -36,28 +38,157 @@ from domdf_python_tools.utils import enquote_value
 
 # this package
 import repo_helper.files
+from repo_helper._entry_points import load_entry_points
+from repo_helper.cache import ManagerCache
 from repo_helper.configuration import parse_yaml
-from repo_helper.files import Management, is_registered, management
-from repo_helper.files.docs import copy_docs_styling
+from repo_helper.files import Management, Manager, get_run_after, is_registered, management
 from repo_helper.files.linting import code_only_warning, lint_warn_list
-from repo_helper.files.testing import make_formate_toml, make_isort
-from repo_helper.templates import init_repo_template_dir, template_dir
-from repo_helper.utils import brace, discover_entry_points
+from repo_helper.profiling import span
+from repo_helper.templates import init_repo_template_dir, make_environment, template_dir
+from repo_helper.utils import brace
 
 __all__ = [
 		"RepoHelper",
 		"import_registered_functions",
+		"order_managers",
+		"run_managers",
 		]
 
 
+_registered_functions: Optional[List[Type]] = None
+
+
 def import_registered_functions() -> List[Type]:
 	"""
 	Returns a list of all registered functions.
+
+	The modules in :mod:`repo_helper.files` and the ``repo_helper.command`` entry points
+	are only imported the first time this function is called in a process.
+	"""
+
+	global _registered_functions
+
+	if _registered_functions is None:
+		local_functions = discover(repo_helper.files, is_registered)
+		third_party_commands = load_entry_points("repo_helper.command", is_registered)
+		_registered_functions = [*local_functions, *third_party_commands]
+
+	return list(_registered_functions)
+
+
+def _dependency_graph(managers: Iterable[Manager]) -> Dict[Manager, Set[Manager]]:
+	"""
+	Returns a mapping of managers to the managers they must run after.
+
+	Dependencies on managers which are not in ``managers`` are ignored.
+
+	:param managers:
+	"""
+
+	managers = list(managers)
+	by_name: Dict[str, List[Manager]] = {}
+
+	for function_ in managers:
+		by_name.setdefault(function_.__name__, []).append(function_)
+
+	graph: Dict[Manager, Set[Manager]] = {}
+
+	for function_ in managers:
+		dependencies: Set[Manager] = set()
+
+		for name in get_run_after(function_):
+			dependencies.update(by_name.get(name, ()))
+
+		dependencies.discard(function_)
+		graph[function_] = dependencies
+
+	return graph
+
+
+def order_managers(managers: Sequence[Manager]) -> List[Manager]:
+	"""
+	Sort the given managers so that each runs after the managers it depends on.
+
+	Managers are otherwise kept in the order they were given.
+
+	:param managers:
+
+	:raises: :exc:`ValueError` if there is a circular dependency between the managers.
 	"""
 
-	local_functions = discover(repo_helper.files, is_registered)
-	third_party_commands = discover_entry_points("repo_helper.command", is_registered)
-	return [*local_functions, *third_party_commands]
+	graph = _dependency_graph(managers)
+	remaining = list(managers)
+	done: Set[Manager] = set()
+	ordered: List[Manager] = []
+
+	while remaining:
+		for function_ in remaining:
+			if graph[function_] <= done:
+				break
+		else:
+			names = ", ".join(repr(function_.__name__) for function_ in remaining)
+			raise ValueError(f"Circular dependency between managers {names}")
+
+		remaining.remove(function_)
+		done.add(function_)
+		ordered.append(function_)
+
+	return ordered
+
+
+def _call_manager(function: Manager, repo_path: PathPlus, templates: jinja2.Environment) -> List[str]:
+	with span(function.__name__, "manager"):
+		return function(repo_path, templates)
+
+
+def run_managers(
+		managers: Sequence[Manager],
+		repo_path: PathPlus,
+		templates: jinja2.Environment,
+		jobs: int = 1,
+		) -> Dict[Manager, List[str]]:
+	"""
+	Call each of the given managers, respecting the dependencies declared with
+	:meth:`Management.register() <repo_helper.files.Management.register>`.
+
+	:param managers:
+	:param repo_path: Path to the repository root.
+	:param templates:
+	:param jobs: The number of managers to run concurrently.
+		If ``0`` the number of processors on the machine is used.
+
+	:return: A mapping of managers to the files they returned.
+	"""  # noqa: D400
+
+	if jobs < 0:
+		raise ValueError("'jobs' cannot be negative.")
+
+	ordered = order_managers(managers)
+
+	if jobs == 1:
+		return {function_: _call_manager(function_, repo_path, templates) for function_ in ordered}
+
+	graph = _dependency_graph(ordered)
+	order = list(ordered)
+	done: Set[Manager] = set()
+	pending: Dict[Future, Manager] = {}
+	outputs: Dict[Manager, List[str]] = {}
+
+	with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+		while ordered or pending:
+			for function_ in [f for f in ordered if graph[f] <= done]:
+				ordered.remove(function_)
+				pending[executor.submit(_call_manager, function_, repo_path, templates)] = function_
+
+			finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+			for future in finished:
+				function_ = pending.pop(future)
+				done.add(function_)
+				outputs[function_] = future.result()
+
+	# Return the outputs in the same order as when running serially.
+	return {function_: outputs[function_] for function_ in order}
 
 
 class RepoHelper:
@@ -74,29 +205,39 @@ class RepoHelper:
 	#: Provides the templates and stores the configuration.
 	templates: jinja2.Environment
 
-	#: List of functions to manage files.
-	files: Management
-
 	def __init__(
 			self,
 			target_repo: PathLike,
 			managed_message="This file is managed by 'repo_helper'. Don't edit it directly."
 			):
-		import_registered_functions()
 
 		# Walk up the tree until a "repo_helper.yml" or "git_helper.yml" (old name) file is found.
 		self.target_repo = traverse_to_file(PathPlus(target_repo), "repo_helper.yml", "git_helper.yml")
 
-		self.templates = jinja2.Environment(  # nosec: B701
-			loader=jinja2.FileSystemLoader(str(template_dir)),
-			undefined=jinja2.StrictUndefined,
-			)
+		self.templates = make_environment(template_dir)
 		self.templates.globals["managed_message"] = managed_message
 		self.templates.globals["brace"] = brace
 
-		# isort and formate.toml must always run last
-		self.files = management + [(make_isort, "isort", [])]
-		self.files = management + [(make_formate_toml, "formate", [])]
+		self._files: Optional[Management] = None
+
+	@property
+	def files(self) -> Management:
+		"""
+		List of functions to manage files.
+
+		The registered functions are imported the first time this is accessed,
+		so instances which are only used to read the configuration do not pay for it.
+		"""
+
+		if self._files is None:
+			import_registered_functions()
+			self._files = Management(management)
+
+		return self._files
+
+	@files.setter
+	def files(self, value: Management) -> None:
+		self._files = value
 
 	@property
 	def managed_message(self) -> str:
@@ -126,7 +267,9 @@ class RepoHelper:
 			* Added the ``allow_unknown_keys`` argument.
 		"""
 
-		config_vars = parse_yaml(self.target_repo, allow_unknown_keys=allow_unknown_keys)
+		with span("parse_yaml", "config"):
+			config_vars = parse_yaml(self.target_repo, allow_unknown_keys=allow_unknown_keys)
+
 		self.templates.globals.update(config_vars)
 		self.templates.globals["lint_warn_list"] = lint_warn_list
 		self.templates.globals["code_only_warning"] = code_only_warning
@@ -150,10 +293,15 @@ class RepoHelper:
 
 		return self.templates.globals["repo_name"]
 
-	def run(self) -> List[str]:
+	def run(self, jobs: int = 1, cache: bool = False) -> List[str]:
 		"""
 		Run Git Helper for the repository and update all managed files.
 
+		:param jobs: The number of managers to run concurrently.
+			If ``0`` the number of processors on the machine is used.
+		:param cache: Whether to skip managers whose configuration, templates, input files and output files
+			are unchanged since they last ran, as recorded in :file:`.repo_helper_cache/manifest.json`.
+
 		:return: A list of files managed by Git Helper, regardless of whether they were added,
 			removed or modified.
 		"""
@@ -168,30 +316,47 @@ class RepoHelper:
 			# this package
 			from repo_helper.cli.commands.init import enable_docs
 
-			init_repo_templates = jinja2.Environment(  # nosec: B701
-				loader=jinja2.FileSystemLoader(str(init_repo_template_dir)),
-				undefined=jinja2.StrictUndefined,
-				)
+			init_repo_templates = make_environment(init_repo_template_dir)
 			init_repo_templates.globals.update(self.templates.globals)
 
-			all_managed_files.extend(enable_docs(self.target_repo, self.templates, init_repo_templates))
+			with span("enable_docs", "manager"):
+				all_managed_files.extend(enable_docs(self.target_repo, self.templates, init_repo_templates))
 
 		if not self.templates.globals["preserve_custom_theme"] and self.templates.globals["enable_docs"]:
-			all_managed_files.extend(copy_docs_styling(self.target_repo, self.templates))
+
+			# this package
+			from repo_helper.files.docs import copy_docs_styling
+
+			with span("copy_docs_styling", "manager"):
+				all_managed_files.extend(copy_docs_styling(self.target_repo, self.templates))
 
 		# TODO: this isn't respecting "enable_docs"
+		managers = []
+
 		for function_, exclude_name, other_requirements in self.files:
 			if exclude_name not in self.exclude_files and all([
 					self.templates.globals[req] for req in other_requirements
 					]):
+				managers.append(function_)
+
+		if cache:
+			manager_cache = ManagerCache(self.target_repo, self.templates.globals)
+
+			for function_ in [f for f in managers if manager_cache.is_fresh(f)]:
+				managers.remove(function_)
+				all_managed_files.extend(manager_cache.get_outputs(function_))
+
+		outputs = run_managers(managers, self.target_repo, self.templates, jobs=jobs)
+
+		for output_filenames in outputs.values():
+			for filename in output_filenames:
+				all_managed_files.append(str(filename))
 
-				# print(f"{function_.__name__}{'.'*(75-len(function_.__name__))}", end='')
-				# sys.stdout.flush()
-				output_filenames = function_(self.target_repo, self.templates)
-				# print(f"{Back.GREEN('Done')}")
+		if cache:
+			for function_, output_filenames in outputs.items():
+				manager_cache.record(function_, output_filenames)
 
-				for filename in output_filenames:
-					all_managed_files.append(str(filename))
+			manager_cache.save()
 
 		all_managed_files.append("repo_helper.yml")
 		all_managed_files.append("git_helper.yml")
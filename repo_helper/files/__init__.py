@@ -34,7 +34,7 @@ from domdf_python_tools.bases import UserList
 
 jinja2.Environment.__module__ = "jinja2"
 
-__all__ = ["Management", "management", "is_registered", "Manager"]
+__all__ = ["Management", "management", "is_registered", "Manager", "get_run_after"]
 
 #: Type hint for a function that manages files.
 Manager = Callable[[pathlib.Path, jinja2.Environment], List[str]]
@@ -59,7 +59,8 @@ class Management(UserList[Tuple[Manager, str, Sequence[str]]]):
 			exclude_name: str,
 			exclude_unless_true: Sequence[str] = (),
 			*,
-			name: Optional[str] = None
+			name: Optional[str] = None,
+			run_after: Sequence[str] = (),
 			) -> Callable:
 		"""
 		Decorator to register a function.
@@ -77,6 +78,8 @@ class Management(UserList[Tuple[Manager, str, Sequence[str]]]):
 		:param exclude_unless_true: A list of strings representing config values that must be true to call the function.
 		:param name: Optional name to use for the function in the output. Defaults to the name of the function.
 		:no-default name:
+		:param run_after: The names of other registered functions which must have finished before this function is called.
+			Functions which are disabled for the current repository are ignored.
 
 		:return: The registered function.
 
@@ -97,6 +100,7 @@ class Management(UserList[Tuple[Manager, str, Sequence[str]]]):
 				function.__name__ = name
 
 			setattr(function, "_repo_helper_registered", True)
+			setattr(function, "_repo_helper_run_after", tuple(run_after))
 
 			return function
 
@@ -119,3 +123,13 @@ def is_registered(obj: Any) -> bool:
 		return bool(getattr(obj, "_repo_helper_registered", False))
 
 	return False
+
+
+def get_run_after(function: Manager) -> Tuple[str, ...]:
+	"""
+	Returns the names of the registered functions which must have finished before ``function`` is called.
+
+	:param function:
+	"""
+
+	return tuple(getattr(function, "_repo_helper_run_after", ()))
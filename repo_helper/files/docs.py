@@ -288,6 +288,10 @@ def make_conf(repo_path: pathlib.Path, templates: jinja2.Environment) -> List[st
 	username = templates.globals["username"]
 	repo_name = templates.globals["repo_name"]
 
+	# Copies, as other managers may be rendering from templates.globals concurrently.
+	html_context = dict(templates.globals["html_context"])
+	html_theme_options = dict(templates.globals["html_theme_options"])
+
 	if templates.globals["sphinx_html_theme"] in {"sphinx-rtd-theme", "domdf-sphinx-theme"}:
 		style = {
 				"display_github": True,  # Integrate GitHub
@@ -298,8 +302,8 @@ def make_conf(repo_path: pathlib.Path, templates: jinja2.Environment) -> List[st
 				}
 
 		for key, val in style.items():
-			if key not in templates.globals["html_context"]:
-				templates.globals["html_context"][key] = val
+			if key not in html_context:
+				html_context[key] = val
 
 		options = {
 				# 'logo': 'logo.png',
@@ -307,8 +311,8 @@ def make_conf(repo_path: pathlib.Path, templates: jinja2.Environment) -> List[st
 				}
 
 		for key, val in options.items():
-			if key not in templates.globals["html_theme_options"]:
-				templates.globals["html_theme_options"][key] = val
+			if key not in html_theme_options:
+				html_theme_options[key] = val
 
 	elif templates.globals["sphinx_html_theme"] in {"alabaster", "repo-helper-sphinx-theme"}:
 		# See https://github.com/bitprophet/alabaster/blob/master/alabaster/theme.conf
@@ -328,8 +332,8 @@ def make_conf(repo_path: pathlib.Path, templates: jinja2.Environment) -> List[st
 				}
 
 		for key, val in style.items():
-			if key not in templates.globals["html_theme_options"]:
-				templates.globals["html_theme_options"][key] = val
+			if key not in html_theme_options:
+				html_theme_options[key] = val
 
 	elif templates.globals["sphinx_html_theme"] in {"furo"}:
 		# See https://github.com/bitprophet/alabaster/blob/master/alabaster/theme.conf
@@ -342,12 +346,12 @@ def make_conf(repo_path: pathlib.Path, templates: jinja2.Environment) -> List[st
 				}
 
 		for key in ["light_css_variables", "dark_css_variables"]:
-			if key not in templates.globals["html_theme_options"]:
-				templates.globals["html_theme_options"][key] = style
+			if key not in html_theme_options:
+				html_theme_options[key] = style
 			else:
-				templates.globals["html_theme_options"][key] = {
+				html_theme_options[key] = {
 						**style,
-						**templates.globals["html_theme_options"][key],
+						**html_theme_options[key],
 						}
 
 	sphinx_extensions = [
@@ -377,6 +381,8 @@ def make_conf(repo_path: pathlib.Path, templates: jinja2.Environment) -> List[st
 	file.write_clean(
 			conf.render(
 					sphinx_extensions=sphinx_extensions,
+					html_context=html_context,
+					html_theme_options=html_theme_options,
 					pformat=pformat_tabs,
 					enquote_value=enquote_value,
 					)
@@ -223,6 +223,9 @@ ignores.extend((
 		".pyre/",
 		))
 
+# repo_helper
+ignores.extend((".repo_helper_cache/", ))
+
 
 @management.register("gitignore")
 def make_gitignore(repo_path: pathlib.Path, templates: jinja2.Environment) -> List[str]:
@@ -686,6 +686,7 @@ def make_isort(repo_path: pathlib.Path, templates: jinja2.Environment) -> List[s
 # 	return [isort_file.name]
 
 
+@management.register("formate", run_after=["ensure_tests_requirements"])
 def make_formate_toml(repo_path: pathlib.Path, templates: jinja2.Environment) -> List[str]:
 	"""
 	Add configuration for ``formate``.
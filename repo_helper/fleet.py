@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+#
+#  fleet.py
+"""
+Run ``repo_helper`` for many repositories at once.
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+# stdlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus, in_directory
+from domdf_python_tools.typing import PathLike
+from southwark import status
+from southwark.repo import Repo
+
+__all__ = ["FleetResult", "discover_repositories", "run_repository", "run_fleet"]
+
+_config_filenames = ("repo_helper.yml", "git_helper.yml")
+
+
+class FleetResult(NamedTuple):
+	"""
+	The outcome of running ``repo_helper`` for a single repository.
+	"""
+
+	#: The repository.
+	path: str
+
+	#: One of ``'changed'``, ``'unchanged'``, ``'skipped'`` or ``'failed'``.
+	status: str
+
+	#: The time taken, in seconds.
+	duration: float
+
+	#: Further information, such as the number of changed files or the error message.
+	details: str = ''
+
+
+def _is_repository(directory: PathPlus) -> bool:
+	return any((directory / filename).is_file() for filename in _config_filenames)
+
+
+def discover_repositories(paths: Iterable[PathLike]) -> List[PathPlus]:
+	"""
+	Find the repositories to run ``repo_helper`` for.
+
+	Each path may be:
+
+	* a repository containing a ``repo_helper.yml`` file;
+	* a directory whose immediate subdirectories are such repositories;
+	* a text file listing one repository per line. Blank lines and lines starting with ``#`` are ignored.
+
+	:param paths:
+	"""
+
+	repositories: List[PathPlus] = []
+
+	for path in map(PathPlus, paths):
+		if path.is_file():
+			lines = (line.strip() for line in path.read_lines())
+			candidates = [(path.parent / line) for line in lines if line and not line.startswith('#')]
+		elif _is_repository(path):
+			candidates = [path]
+		else:
+			candidates = sorted(d for d in path.iterdir() if d.is_dir() and _is_repository(d))
+
+		for candidate in candidates:
+			candidate = candidate.resolve()
+			if candidate not in repositories:
+				repositories.append(candidate)
+
+	return repositories
+
+
+def _is_clean(repo_path: PathPlus) -> bool:
+	stat = status(repo_path)
+
+	for filename in chain(stat.staged["add"], stat.staged["delete"], stat.staged["modify"], stat.unstaged):
+		if filename.as_posix() not in _config_filenames:
+			return False
+
+	return True
+
+
+def run_repository(
+		repo_path: PathLike,
+		force: bool = False,
+		commit: bool = False,
+		message: str = "Updated files with 'repo_helper'.",
+		cache: bool = False,
+		) -> FleetResult:
+	"""
+	Run ``repo_helper`` for a single repository, and stage any changed files.
+
+	Errors are caught and reported in the returned :class:`~.FleetResult`.
+
+	:param repo_path: The repository.
+	:param force: Whether to run even when the git working directory is not clean.
+	:param commit: Whether to commit the changed files.
+	:param message: The commit message.
+	:param cache: Whether to skip managers whose inputs are unchanged since the last run.
+	"""
+
+	# this package
+	from repo_helper.configuration import migrate_config
+	from repo_helper.core import RepoHelper
+	from repo_helper.utils import commit_changes, stage_changes
+
+	start = time.perf_counter()
+
+	def result(outcome: str, details: str = '') -> FleetResult:
+		return FleetResult(str(repo_path), outcome, time.perf_counter() - start, details)
+
+	try:
+		rh = RepoHelper(repo_path)
+		migrate_config(rh.target_repo)
+		rh.load_settings()
+
+		if not force and not _is_clean(rh.target_repo):
+			return result("skipped", "Git working directory is not clean")
+
+		with in_directory(rh.target_repo):
+			managed_files = rh.run(cache=cache)
+
+		repo = Repo(rh.target_repo)
+		staged_files = stage_changes(repo.path, managed_files)
+
+		if not staged_files:
+			return result("unchanged")
+
+		details = f"{len(staged_files)} file{'s' if len(staged_files) > 1 else ''} staged"
+
+		if commit:
+			details = f"Committed as {commit_changes(repo, message)}"
+
+		return result("changed", details)
+
+	except Exception as e:  # pylint: disable=broad-except
+		error = str(e).splitlines() or ['']
+		return result("failed", f"{type(e).__name__}: {error[0]}")
+
+
+def _initialise_worker() -> None:
+	"""
+	Import the managers once per worker process, rather than once per repository.
+	"""
+
+	# this package
+	from repo_helper.core import import_registered_functions
+
+	import_registered_functions()
+
+
+def run_fleet(
+		repositories: Iterable[PathLike],
+		jobs: Optional[int] = None,
+		force: bool = False,
+		commit: bool = False,
+		message: str = "Updated files with 'repo_helper'.",
+		cache: bool = False,
+		) -> Iterator[FleetResult]:
+	"""
+	Run ``repo_helper`` for each of the given repositories on a pool of worker processes.
+
+	The worker processes are reused for many repositories,
+	so the cost of importing ``repo_helper`` and its managers is only paid once per worker.
+
+	:param repositories:
+	:param jobs: The number of worker processes.
+		If :py:obj:`None` or ``0`` the number of processors on the machine is used.
+	:param force: Whether to run even when the git working directory is not clean.
+	:param commit: Whether to commit the changed files.
+	:param message: The commit message.
+	:param cache: Whether to skip managers whose inputs are unchanged since the last run.
+
+	:returns: An iterator over the results, in the same order as ``repositories``.
+	"""
+
+	worker = partial(run_repository, force=force, commit=commit, message=message, cache=cache)
+
+	if jobs == 1:
+		yield from map(worker, repositories)
+		return
+
+	with ProcessPoolExecutor(max_workers=jobs or None, initializer=_initialise_worker) as executor:
+		yield from executor.map(worker, repositories)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+#
+#  profiling.py
+"""
+Record the time taken, and the files read and written, by each step of ``repo_helper``.
+"""
+#
+#  Copyright © 2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+# stdlib
+import contextlib
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+__all__ = ["Span", "Profiler", "get_profiler", "span"]
+
+_active_profiler: Optional["Profiler"] = None
+_audit_hook_installed = False
+_local = threading.local()
+
+_write_flags = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_APPEND | os.O_TRUNC
+
+# time.thread_time() is not available on Python 3.6
+_thread_time = getattr(time, "thread_time", time.process_time)
+
+
+class Span(NamedTuple):
+	"""
+	A single timed step, such as a manager being run.
+	"""
+
+	#: The name of the step, e.g. ``'make_tox'``.
+	name: str
+
+	#: The kind of step, e.g. ``'manager'``.
+	category: str
+
+	#: The start time, in seconds, relative to when the :class:`~.Profiler` was created.
+	start: float
+
+	#: The wall time taken, in seconds.
+	wall_time: float
+
+	#: The CPU time taken by the thread the step ran in, in seconds.
+	cpu_time: float
+
+	#: The identifier of the thread the step ran in.
+	thread_id: int
+
+	#: The number of distinct files read, or :py:obj:`None` if file access could not be traced.
+	files_read: Optional[int]
+
+	#: The number of distinct files written, or :py:obj:`None` if file access could not be traced.
+	files_written: Optional[int]
+
+	#: The size of the files written, in bytes, or :py:obj:`None` if file access could not be traced.
+	bytes_written: Optional[int]
+
+
+class _SpanRecorder:
+
+	def __init__(self) -> None:
+		self.read: Set[str] = set()
+		self.written: Set[str] = set()
+
+	def file_opened(self, filename: str, write: bool) -> None:
+		if write:
+			self.written.add(filename)
+		else:
+			self.read.add(filename)
+
+
+def _audit_hook(event: str, args: Any) -> None:
+	if event != "open":
+		return
+
+	stack = getattr(_local, "stack", None)
+	if not stack:
+		return
+
+	path, mode, flags = args
+
+	if not isinstance(path, (str, bytes, os.PathLike)):
+		# An open file descriptor
+		return
+
+	if mode is not None:
+		write = any(char in mode for char in "wax+")
+	else:
+		write = bool(flags & _write_flags)
+
+	stack[-1].file_opened(os.path.abspath(os.fsdecode(path)), write)
+
+
+def _install_audit_hook() -> bool:
+	"""
+	Install the hook used to trace file access, if the interpreter supports audit hooks (Python 3.8+).
+
+	The hook is only installed once per process, and does nothing unless a span is being recorded.
+	"""
+
+	global _audit_hook_installed
+
+	if not _audit_hook_installed and hasattr(sys, "addaudithook"):
+		sys.addaudithook(_audit_hook)  # type: ignore
+		_audit_hook_installed = True
+
+	return _audit_hook_installed
+
+
+class Profiler:
+	"""
+	Records a :class:`~.Span` for each step of ``repo_helper``.
+
+	Use :meth:`~.Profiler.activate` to make the profiler record the spans created with :func:`~.span`.
+	"""
+
+	def __init__(self) -> None:
+		#: The spans recorded so far, in the order they finished.
+		self.spans: List[Span] = []
+
+		self._lock = threading.Lock()
+		self._origin = time.perf_counter()
+		self._trace_files = _install_audit_hook()
+
+	@contextlib.contextmanager
+	def activate(self) -> Iterator["Profiler"]:
+		"""
+		Context manager to make this the profiler used by :func:`~.span`.
+		"""
+
+		global _active_profiler
+
+		previous = _active_profiler
+		_active_profiler = self
+
+		try:
+			yield self
+		finally:
+			_active_profiler = previous
+
+	@contextlib.contextmanager
+	def span(self, name: str, category: str) -> Iterator[None]:
+		"""
+		Context manager to record the time taken, and the files read and written, by the enclosed code.
+
+		:param name: The name of the step, e.g. ``'make_tox'``.
+		:param category: The kind of step, e.g. ``'manager'``.
+		"""
+
+		recorder = _SpanRecorder()
+
+		if not hasattr(_local, "stack"):
+			_local.stack = []
+
+		_local.stack.append(recorder)
+		start = time.perf_counter()
+		cpu_start = _thread_time()
+
+		try:
+			yield
+		finally:
+			cpu_time = _thread_time() - cpu_start
+			wall_time = time.perf_counter() - start
+			_local.stack.remove(recorder)
+
+			if self._trace_files:
+				files_read: Optional[int] = len(recorder.read - recorder.written)
+				files_written: Optional[int] = len(recorder.written)
+				bytes_written: Optional[int] = sum(map(_get_size, recorder.written))
+			else:
+				files_read = files_written = bytes_written = None
+
+			with self._lock:
+				self.spans.append(
+						Span(
+								name=name,
+								category=category,
+								start=start - self._origin,
+								wall_time=wall_time,
+								cpu_time=cpu_time,
+								thread_id=threading.get_ident(),
+								files_read=files_read,
+								files_written=files_written,
+								bytes_written=bytes_written,
+								)
+						)
+
+	def format_table(self) -> str:
+		"""
+		Returns a table of the recorded spans, slowest first.
+		"""
+
+		# 3rd party
+		from tabulate import tabulate
+
+		def optional(value: Optional[int]) -> str:
+			return '-' if value is None else str(value)
+
+		rows = []
+
+		for s in sorted(self.spans, key=lambda s: s.wall_time, reverse=True):
+			rows.append([
+					s.name,
+					s.category,
+					f"{s.wall_time * 1000:.1f}",
+					f"{s.cpu_time * 1000:.1f}",
+					optional(s.files_read),
+					optional(s.files_written),
+					optional(s.bytes_written),
+					])
+
+		return tabulate(
+				rows,
+				headers=["Name", "Category", "Wall (ms)", "CPU (ms)", "Read", "Written", "Bytes written"],
+				disable_numparse=True,
+				)
+
+	def to_trace_events(self) -> Dict[str, Any]:
+		"""
+		Returns the recorded spans in the Chrome trace event format,
+		which can be viewed in ``chrome://tracing`` or https://ui.perfetto.dev.
+		"""  # noqa: D400
+
+		events = []
+		pid = os.getpid()
+
+		for s in self.spans:
+			events.append({
+					"name": s.name,
+					"cat": s.category,
+					"ph": 'X',
+					"ts": round(s.start * 1_000_000),
+					"dur": round(s.wall_time * 1_000_000),
+					"pid": pid,
+					"tid": s.thread_id,
+					"args": {
+							"cpu_time_ms": round(s.cpu_time * 1000, 3),
+							"files_read": s.files_read,
+							"files_written": s.files_written,
+							"bytes_written": s.bytes_written,
+							},
+					})
+
+		return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+	def write_trace(self, filename: PathLike) -> None:
+		"""
+		Write the recorded spans to ``filename`` in the Chrome trace event format.
+
+		:param filename:
+		"""
+
+		PathPlus(filename).dump_json(self.to_trace_events(), indent=2)
+
+
+def _get_size(filename: str) -> int:
+	try:
+		return os.path.getsize(filename)
+	except OSError:
+		return 0
+
+
+def get_profiler() -> Optional[Profiler]:
+	"""
+	Returns the active :class:`~.Profiler`, or :py:obj:`None` if profiling is not enabled.
+	"""
+
+	return _active_profiler
+
+
+@contextlib.contextmanager
+def span(name: str, category: str) -> Iterator[None]:
+	"""
+	Context manager to record a span with the active :class:`~.Profiler`.
+
+	Does nothing if profiling is not enabled.
+
+	:param name: The name of the step, e.g. ``'make_tox'``.
+	:param category: The kind of step, e.g. ``'manager'``.
+	"""
+
+	profiler = _active_profiler
+
+	if profiler is None:
+		yield
+	else:
+		with profiler.span(name, category):
+			yield
@@ -27,28 +27,33 @@ Functions for making tagged releases.
 
 # stdlib
 import os
+import posixpath
+import shutil
+import tempfile
 from datetime import date
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 
 # 3rd party
 import click
 from consolekit.terminal_colours import Fore
 from consolekit.utils import abort
 from domdf_python_tools.paths import PathPlus, traverse_to_file
+from domdf_python_tools.stringlist import StringList
 from domdf_python_tools.typing import PathLike
 from domdf_python_tools.versions import Version
 from dulwich.porcelain import tag_create
-from southwark import assert_clean
 from southwark.repo import Repo
 from typing_extensions import TypedDict
 
 # this package
 from repo_helper.cli.utils import commit_changed_files
+from repo_helper.configuration import migrate_config
 from repo_helper.configupdater2 import ConfigUpdater
 from repo_helper.core import RepoHelper
 from repo_helper.files.ci_cd import get_bumpversion_filenames
+from repo_helper.utils import assert_clean
 
-__all__ = ["Bumper", "BumpversionFileConfig"]
+__all__ = ["Bumper", "BumpversionFileConfig", "BumpPlan", "FileEdit", "apply_edits", "bump_repositories"]
 
 
 class BumpversionFileConfig(TypedDict):
@@ -60,6 +65,131 @@ class BumpversionFileConfig(TypedDict):
 	replace: str
 
 
+class FileEdit(NamedTuple):
+	"""
+	A change to the content of a single file.
+	"""
+
+	#: The absolute path to the file.
+	filename: PathPlus
+
+	#: The current content of the file.
+	original: str
+
+	#: The new content of the file.
+	content: str
+
+
+class BumpPlan(NamedTuple):
+	"""
+	The changes needed to bump the version of a repository, as returned by :meth:`Bumper.plan`.
+	"""
+
+	#: The root of the repository.
+	repo_path: PathPlus
+
+	#: The version before the bump.
+	current_version: Version
+
+	#: The version after the bump.
+	new_version: Version
+
+	#: The changes to make, including the one to ``.bumpversion.cfg``. Files which are unchanged are omitted.
+	edits: List[FileEdit]
+
+	@property
+	def tag(self) -> str:
+		"""
+		The name of the tag for the new version.
+		"""
+
+		return f"v{str(self.new_version)[1:]}"
+
+
+def apply_edits(edits: Sequence[FileEdit]) -> None:
+	"""
+	Apply the given edits as a single transaction.
+
+	The new content of every file is first written to a temporary file alongside it,
+	and only once all of them have been written are they moved over the original files.
+	If any step fails the files which have already been replaced are restored before the exception is re-raised.
+
+	:param edits:
+	"""
+
+	temporary_files: List[Tuple[FileEdit, str]] = []
+	replaced: List[FileEdit] = []
+
+	try:
+		for edit in edits:
+			fd, temporary_file = tempfile.mkstemp(
+					prefix=f".{edit.filename.name}.",
+					suffix=".tmp",
+					dir=edit.filename.parent,
+					)
+			temporary_files.append((edit, temporary_file))
+
+			with open(fd, 'w', encoding="UTF-8") as fp:
+				fp.write(edit.content)
+
+			shutil.copymode(edit.filename, temporary_file)
+
+		for edit, temporary_file in temporary_files:
+			os.replace(temporary_file, edit.filename)
+			replaced.append(edit)
+
+	except BaseException:
+		for edit in reversed(replaced):
+			edit.filename.write_text(edit.original)
+
+		for edit, temporary_file in temporary_files:
+			if os.path.exists(temporary_file):
+				os.unlink(temporary_file)
+
+		raise
+
+
+def _bump_content(content: str, config: BumpversionFileConfig) -> str:
+	"""
+	Returns ``content`` with the version bumped as described by ``config``.
+
+	:param content:
+	:param config:
+	"""
+
+	return content.replace(config["search"], config["replace"])
+
+
+def bump_repositories(
+		repo_paths: Iterable[PathLike],
+		version: str,
+		commit: Optional[bool],
+		message: str,
+		force: bool = False,
+		) -> None:
+	"""
+	Bump the versions of several repositories at once.
+
+	Every repository is planned before any file is changed, and the edits are applied as a single transaction,
+	so if any repository cannot be bumped none of them are changed.
+	Each repository is then committed and tagged in turn.
+
+	:param repo_paths:
+	:param version: Either ``'major'``, ``'minor'``, ``'patch'``, ``'today'``, or the new version number.
+	:param commit: Whether to commit automatically (:py:obj:`True`) or ask first (:py:obj:`None`).
+	:param message: The commit message.
+	:param force: Whether to force bumping the version when a repository is unclean.
+	"""
+
+	bumpers = [Bumper(PathPlus(repo_path), force) for repo_path in repo_paths]
+	plans = [bumper.plan(bumper.next_version(version)) for bumper in bumpers]
+
+	apply_edits([edit for plan in plans for edit in plan.edits])
+
+	for bumper, plan in zip(bumpers, plans):
+		bumper.commit(plan, commit, message)
+
+
 class Bumper:
 	"""
 	Class to bump the repository version.
@@ -72,6 +202,7 @@ class Bumper:
 		#:
 		self.repo = RepoHelper(traverse_to_file(PathPlus(repo_path), "repo_helper.yml"))
 
+		migrate_config(self.repo.target_repo)
 		self.repo.load_settings()
 
 		if not assert_clean(self.repo.target_repo):
@@ -90,6 +221,33 @@ class Bumper:
 
 		#: The path to the bumpversion configuration file.
 		self.bumpversion_file = self.repo.target_repo / ".bumpversion.cfg"
+		self._bumpversion_config: Optional[ConfigUpdater] = None
+
+		#:
+		self.dulwich_repo = Repo(self.repo.target_repo)
+
+	def next_version(self, version: str) -> Version:
+		"""
+		Returns the version to bump to.
+
+		:param version: Either ``'major'``, ``'minor'``, ``'patch'``, ``'today'``, or the new version number.
+		"""
+
+		if version == "major":
+			return Version(self.current_version.major + 1, 0, 0)
+		elif version == "minor":
+			return Version(self.current_version.major, self.current_version.minor + 1, 0)
+		elif version == "patch":
+			return Version(
+					self.current_version.major,
+					self.current_version.minor,
+					self.current_version.patch + 1,
+					)
+		elif version == "today":
+			today = date.today()
+			return Version(today.year, today.month, today.day)
+		else:
+			return Version.from_str(version)
 
 	def major(self, commit: Optional[bool], message: str):
 		"""
@@ -99,8 +257,7 @@ class Bumper:
 		:param message: The commit message.
 		"""
 
-		new_version = Version(self.current_version.major + 1, 0, 0)
-		self.bump(new_version, commit, message)
+		self.bump(self.next_version("major"), commit, message)
 
 	def minor(self, commit: Optional[bool], message: str):
 		"""
@@ -110,8 +267,7 @@ class Bumper:
 		:param message: The commit message.
 		"""
 
-		new_version = Version(self.current_version.major, self.current_version.minor + 1, 0)
-		self.bump(new_version, commit, message)
+		self.bump(self.next_version("minor"), commit, message)
 
 	def patch(self, commit: Optional[bool], message: str):
 		"""
@@ -121,12 +277,7 @@ class Bumper:
 		:param message: The commit message.
 		"""
 
-		new_version = Version(
-				self.current_version.major,
-				self.current_version.minor,
-				self.current_version.patch + 1,
-				)
-		self.bump(new_version, commit, message)
+		self.bump(self.next_version("patch"), commit, message)
 
 	def today(self, commit: Optional[bool], message: str):
 		"""
@@ -138,45 +289,86 @@ class Bumper:
 		:param message: The commit message.
 		"""
 
-		today = date.today()
-		new_version = Version(today.year, today.month, today.day)
-		self.bump(new_version, commit, message)
+		self.bump(self.next_version("today"), commit, message)
 
 	def bump(self, new_version: Version, commit: Optional[bool], message: str):
 		"""
 		Bump to the given version.
 
+		If any of the files cannot be updated none of them are changed.
+
 		:param new_version:
 		:param commit: Whether to commit automatically (:py:obj:`True`) or ask first (:py:obj:`None`).
 		:param message: The commit message.
 		"""
 
-		new_version_str = str(new_version)[1:]
+		plan = self.plan(new_version)
+		apply_edits(plan.edits)
+		self.commit(plan, commit, message)
+
+	def plan(self, new_version: Version) -> BumpPlan:
+		"""
+		Work out the changes needed to bump to the given version, without changing any files.
 
-		dulwich_repo = Repo(self.repo.target_repo)
+		:param new_version:
+
+		:raises FileNotFoundError: If one of the files listed in the bumpversion config does not exist.
+		"""
+
+		new_version_str = str(new_version)[1:]
 
-		if f"v{new_version_str}".encode("UTF-8") in dulwich_repo.refs.as_dict(b"refs/tags"):
+		if f"refs/tags/v{new_version_str}".encode("UTF-8") in self.dulwich_repo.refs:
 			raise abort(f"The tag 'v{new_version_str}' already exists!")
 
 		bumpversion_config = self.get_bumpversion_config(str(self.current_version)[1:], new_version_str)
 
-		changed_files = [self.bumpversion_file.relative_to(self.repo.target_repo).as_posix()]
-
 		for filename in bumpversion_config.keys():
-			if not os.path.isfile(filename):
+			if not (self.repo.target_repo / filename).is_file():
 				raise FileNotFoundError(filename)
 
+		edits = []
+		bumpversion_file_config: Optional[BumpversionFileConfig] = None
+
 		for filename, config in bumpversion_config.items():
-			self.bump_version_for_file(filename, config)
-			changed_files.append(filename)
+			filename = self.repo.target_repo / filename
+
+			if filename == self.bumpversion_file:
+				# Applied to the updated .bumpversion.cfg below, so there is only one edit to the file.
+				bumpversion_file_config = config
+				continue
+
+			original = filename.read_text()
+			content = _bump_content(original, config)
+
+			if content != original:
+				edits.append(FileEdit(filename, original, content))
 
 		# Update number in .bumpversion.cfg
-		bv = ConfigUpdater()
-		bv.read(self.bumpversion_file)
+		bv = self._read_bumpversion_config()
 		bv["bumpversion"]["current_version"] = new_version_str
-		self.bumpversion_file.write_clean(str(bv))
+		content = StringList(str(bv))
+		content.blankline(ensure_single=True)
+		bumpversion_content = str(content)
+
+		if bumpversion_file_config is not None:
+			bumpversion_content = _bump_content(bumpversion_content, bumpversion_file_config)
+
+		edits.append(FileEdit(self.bumpversion_file, self.bumpversion_file.read_text(), bumpversion_content))
+
+		return BumpPlan(self.repo.target_repo, self.current_version, new_version, edits)
+
+	def commit(self, plan: BumpPlan, commit: Optional[bool], message: str):
+		"""
+		Commit and tag the changes made by applying a :class:`~.BumpPlan`.
 
-		commit_message = message.format(current_version=self.current_version, new_version=new_version)
+		:param plan:
+		:param commit: Whether to commit automatically (:py:obj:`True`) or ask first (:py:obj:`None`).
+		:param message: The commit message.
+		"""
+
+		changed_files = [edit.filename.relative_to(self.repo.target_repo).as_posix() for edit in plan.edits]
+
+		commit_message = message.format(current_version=plan.current_version, new_version=plan.new_version)
 		click.echo(commit_message)
 
 		if commit_changed_files(
@@ -187,7 +379,7 @@ class Bumper:
 				enable_pre_commit=False,
 				):
 
-			tag_create(dulwich_repo, f"v{new_version_str}")
+			tag_create(self.dulwich_repo, plan.tag)
 
 	def get_current_version(self) -> Version:
 		"""
@@ -196,6 +388,17 @@ class Bumper:
 
 		return Version.from_str(self.repo.templates.globals["version"])
 
+	def _read_bumpversion_config(self) -> ConfigUpdater:
+		"""
+		Parse ``.bumpversion.cfg``, returning the cached result if it has already been parsed.
+		"""
+
+		if self._bumpversion_config is None:
+			self._bumpversion_config = ConfigUpdater()
+			self._bumpversion_config.read(self.bumpversion_file)
+
+		return self._bumpversion_config
+
 	def get_bumpversion_config(
 			self,
 			current_version: str,
@@ -208,8 +411,7 @@ class Bumper:
 		:param new_version:
 		"""
 
-		bv = ConfigUpdater()
-		bv.read(self.bumpversion_file)
+		bv = self._read_bumpversion_config()
 
 		def default():
 			return {"search": current_version, "replace": new_version}
@@ -227,8 +429,9 @@ class Bumper:
 			if not section.startswith("bumpversion:file:"):
 				continue
 
+			# Normalise the filename so a file listed more than once is only edited once.
 			section_dict: Dict[str, str] = bv[section].to_dict()
-			config[section[17:]] = dict(
+			config[posixpath.normpath(section[17:])] = dict(
 					search=section_dict.get("search", "{current_version}").format(current_version=current_version),
 					replace=section_dict.get("replace", "{new_version}").format(new_version=new_version),
 					)
@@ -239,9 +442,12 @@ class Bumper:
 		"""
 		Bumps the version for the given file.
 
+		Only that file is changed; use :meth:`~.plan` to bump every file in the repository at once.
+
 		:param filename:
 		:param config:
 		"""
 
 		filename = self.repo.target_repo / filename
-		filename.write_text(filename.read_text().replace(config["search"], config["replace"]))
+		original = filename.read_text()
+		apply_edits([FileEdit(filename, original, _bump_content(original, config))])
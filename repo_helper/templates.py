@@ -3,7 +3,8 @@
 #  templates.py
 """
 Contains the :class:`pathlib.Path` objects representing the templates directory (:data:`template_dir`),
-and the directory representing the files used to initialise a new repository (:data:`init_repo_template_dir`).
+and the directory representing the files used to initialise a new repository (:data:`init_repo_template_dir`),
+and the function for creating :class:`jinja2.Environment` objects to render them.
 """  # noqa: D400
 #
 #  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
@@ -24,13 +25,153 @@ and the directory representing the files used to initialise a new repository (:d
 #  MA 02110-1301, USA.
 #
 
+# stdlib
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
 # 3rd party
+import jinja2
 from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+from jinja2.bccache import Bucket, BytecodeCache, FileSystemBytecodeCache
+
+# this package
+from repo_helper._entry_points import get_cache_dir
 
-__all__ = ["template_dir", "init_repo_template_dir"]
+__all__ = [
+		"template_dir",
+		"init_repo_template_dir",
+		"SharedBytecodeCache",
+		"get_bytecode_cache",
+		"make_environment",
+		"precompile_templates",
+		]
 
 #: The templates directory.
 template_dir = (PathPlus(__file__).parent / "templates").absolute()
 
 #: The directory representing the files used to initialise a new repository
 init_repo_template_dir = (PathPlus(__file__).parent / "init_repo_files").absolute()
+
+
+class SharedBytecodeCache(BytecodeCache):
+	"""
+	A :class:`jinja2.BytecodeCache` which keeps compiled templates in memory,
+	backed by a :class:`jinja2.FileSystemBytecodeCache`.
+
+	Compiled templates are keyed on the template's filename and invalidated by the hash of its source.
+
+	:param directory: The directory to store the compiled templates in.
+		If :py:obj:`None` they are only kept in memory.
+	"""  # noqa: D400
+
+	def __init__(self, directory: Optional[PathLike] = None):
+		self._memory: Dict[str, Tuple[str, object]] = {}
+		self._lock = threading.Lock()
+		self._disk: Optional[FileSystemBytecodeCache] = None
+
+		if directory is not None:
+			try:
+				os.makedirs(directory, exist_ok=True)
+				self._disk = FileSystemBytecodeCache(os.fspath(directory))
+			except OSError:
+				pass
+
+	def load_bytecode(self, bucket: Bucket) -> None:  # noqa: D102
+		with self._lock:
+			checksum, code = self._memory.get(bucket.key, (None, None))
+
+		if checksum == bucket.checksum:
+			bucket.code = code
+			return
+
+		if self._disk is not None:
+			try:
+				self._disk.load_bytecode(bucket)
+			except (OSError, EOFError, ValueError):
+				bucket.reset()
+
+			if bucket.code is not None:
+				with self._lock:
+					self._memory[bucket.key] = (bucket.checksum, bucket.code)
+
+	def dump_bytecode(self, bucket: Bucket) -> None:  # noqa: D102
+		with self._lock:
+			self._memory[bucket.key] = (bucket.checksum, bucket.code)
+
+		if self._disk is not None:
+			try:
+				self._disk.dump_bytecode(bucket)
+			except OSError:
+				pass
+
+	def clear(self) -> None:
+		"""
+		Clear the cache, both in memory and on disk.
+		"""
+
+		with self._lock:
+			self._memory.clear()
+
+		if self._disk is not None:
+			self._disk.clear()
+
+
+_bytecode_cache: Optional[SharedBytecodeCache] = None
+
+
+def get_bytecode_cache() -> SharedBytecodeCache:
+	"""
+	Returns the :class:`~.SharedBytecodeCache` used by all environments created with :func:`~.make_environment`.
+
+	Compiled templates are stored on disk in :file:`$XDG_CACHE_HOME/repo_helper/jinja2`,
+	unless the ``REPO_HELPER_NO_BYTECODE_CACHE`` environment variable is set.
+	"""
+
+	global _bytecode_cache
+
+	if _bytecode_cache is None:
+		if os.environ.get("REPO_HELPER_NO_BYTECODE_CACHE"):
+			_bytecode_cache = SharedBytecodeCache()
+		else:
+			_bytecode_cache = SharedBytecodeCache(os.path.join(get_cache_dir(), "jinja2"))
+
+	return _bytecode_cache
+
+
+def make_environment(searchpath: PathLike = template_dir) -> jinja2.Environment:
+	"""
+	Returns a new :class:`jinja2.Environment` for rendering the templates in ``searchpath``.
+
+	Each environment has its own globals, but the compiled templates are shared
+	between all environments in the process and cached on disk (see :func:`~.get_bytecode_cache`),
+	so each template is only compiled once.
+
+	:param searchpath: The directory containing the templates.
+	"""
+
+	return jinja2.Environment(  # nosec: B701
+		loader=jinja2.FileSystemLoader(os.fspath(searchpath)),
+		undefined=jinja2.StrictUndefined,
+		bytecode_cache=get_bytecode_cache(),
+		)
+
+
+def precompile_templates() -> None:
+	"""
+	Compile all of the templates bundled with ``repo_helper`` into the on-disk bytecode cache.
+
+	This can be used, for example, when building a container image, so that the first run of ``repo_helper``
+	does not need to compile the templates.
+	"""
+
+	for searchpath in (template_dir, init_repo_template_dir):
+		environment = make_environment(searchpath)
+
+		for name in environment.list_templates():
+			try:
+				environment.get_template(name)
+			except (jinja2.TemplateSyntaxError, UnicodeDecodeError):
+				# Not a template, e.g. an image
+				continue
@@ -30,14 +30,10 @@ import pathlib
 import re
 import textwrap
 from datetime import date, timedelta
-from typing import Callable, Dict, Iterable, List, Optional, Union
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 # 3rd party
-import dulwich.repo
-import isort  # type: ignore
-import isort.settings  # type: ignore
 import toml
-import yapf_isort
 from domdf_python_tools.dates import calc_easter
 from domdf_python_tools.import_tools import discover_entry_points
 from domdf_python_tools.paths import PathPlus, sort_paths
@@ -45,11 +41,16 @@ from domdf_python_tools.pretty_print import FancyPrinter
 from domdf_python_tools.stringlist import StringList
 from domdf_python_tools.typing import PathLike
 from shippinglabel import normalize
-from southwark import open_repo_closing, status
 
 # this package
 from repo_helper.configupdater2 import ConfigUpdater, Section
 
+if TYPE_CHECKING:
+	# 3rd party
+	import dulwich.index
+	import dulwich.repo
+	from southwark import GitStatus
+
 __all__ = [
 		"IniConfigurator",
 		"discover_entry_points",
@@ -65,6 +66,9 @@ __all__ = [
 		"sort_paths",
 		"commit_changes",
 		"stage_changes",
+		"path_status",
+		"working_tree_status",
+		"assert_clean",
 		"set_gh_actions_versions",
 		"CustomTomlEncoder",
 		]
@@ -231,6 +235,11 @@ def reformat_file(filename: PathLike, yapf_style: str, isort_config_file: str) -
 	:param isort_config_file: The filename of the isort configuration file.
 	"""
 
+	# 3rd party
+	import isort  # type: ignore
+	import isort.settings  # type: ignore
+	import yapf_isort
+
 	old_isort_settings = isort.settings.CONFIG_SECTIONS.copy()
 
 	try:
@@ -358,13 +367,317 @@ def no_dev_versions(versions: Iterable[str]) -> List[str]:
 	return [v for v in versions if not v.endswith("-dev")]
 
 
+def _tree_path(repo_path: PathLike, filename: PathLike) -> bytes:
+	"""
+	Returns the path of ``filename`` in the repository, as used in the index and trees.
+
+	:param repo_path:
+	:param filename: Either relative to ``repo_path``, or absolute.
+	"""
+
+	filename = PathPlus(filename)
+
+	if filename.is_absolute():
+		filename = filename.relative_to(repo_path)
+
+	return os.path.normpath(filename).replace(os.sep, '/').encode("UTF-8")
+
+
+def _cache_time(value: Union[int, float, Tuple[int, int]]) -> Tuple[int, int]:
+	"""
+	Returns a timestamp from an index entry as a tuple of seconds and nanoseconds.
+
+	:param value:
+	"""
+
+	if isinstance(value, tuple):
+		return value
+	elif isinstance(value, int):
+		return value, 0
+	else:
+		return int(value), int((value % 1) * 1e9)
+
+
+def _index_mtime(repo: "dulwich.repo.Repo") -> int:
+	"""
+	Returns the modification time of the repository's index file, in seconds, or ``0`` if it does not exist.
+
+	:param repo:
+	"""
+
+	try:
+		return int(os.stat(repo.index_path()).st_mtime)
+	except FileNotFoundError:
+		return 0
+
+
+def _stat_matches_index(entry: "dulwich.index.IndexEntry", st: os.stat_result, index_mtime: int) -> bool:
+	"""
+	Returns whether the stat data of a file matches its entry in the index,
+	in which case the file is unchanged and need not be hashed.
+
+	As with ``git``, a file modified in the same second the index was written is never trusted,
+	as it may since have been changed again without its stat data changing.
+
+	:param entry:
+	:param st:
+	:param index_mtime: The modification time of the index file, in seconds.
+	"""
+
+	if int(st.st_mtime) >= index_mtime:
+		return False
+
+	if entry.size != st.st_size & 0xFFFFFFFF:
+		return False
+
+	# Git for Windows does not record inodes.
+	if entry.ino and entry.ino != st.st_ino & 0xFFFFFFFF:
+		return False
+
+	mtime, mtime_nsec = _cache_time(entry.mtime)
+	st_mtime, st_mtime_nsec = divmod(st.st_mtime_ns, 1_000_000_000)
+
+	if mtime != st_mtime:
+		return False
+
+	# Nanoseconds may not be recorded, and dulwich stores them via a float so they may be slightly out.
+	return not mtime_nsec or abs(mtime_nsec - st_mtime_nsec) < 1000
+
+
+def path_status(
+		repo: Union[PathLike, "dulwich.repo.Repo"],
+		files: Iterable[PathLike],
+		) -> "GitStatus":
+	"""
+	Returns the staged, unstaged and untracked changes to the given files.
+
+	Unlike :func:`southwark.status`, only the given files are examined.
+	The rest of the working tree, including any large untracked directories, is not walked.
+
+	:param repo: The repository.
+	:param files: The files to examine, either relative to the repository or absolute.
+
+	:returns: A :class:`southwark.GitStatus` tuple, containing only the given files.
+	"""
+
+	# stdlib
+	import stat
+
+	# 3rd party
+	from dulwich.ignore import IgnoreFilterManager
+	from dulwich.errors import NotTreeError
+	from dulwich.index import blob_from_path_and_stat
+	from dulwich.object_store import tree_lookup_path
+	from southwark import GitStatus, open_repo_closing
+
+	staged: Dict[str, List[PathPlus]] = {"add": [], "delete": [], "modify": []}
+	unstaged: List[PathPlus] = []
+	untracked: List[PathPlus] = []
+
+	with open_repo_closing(repo) as r:
+		index = r.open_index()
+		index_mtime = _index_mtime(r)
+		root_path = os.fsencode(r.path)
+		normalizer = r.get_blob_normalizer()
+		ignore_manager = None
+
+		try:
+			head_tree = r[b"HEAD"].tree
+		except KeyError:
+			head_tree = None
+
+		for tree_path in dict.fromkeys(_tree_path(r.path, filename) for filename in files):
+			filename = PathPlus(tree_path.decode("UTF-8"))
+			entry = index[tree_path] if tree_path in index else None
+
+			# Compare the index with HEAD
+			head_entry = None
+			if head_tree is not None:
+				try:
+					head_entry = tree_lookup_path(r.object_store.__getitem__, head_tree, tree_path)
+				except (KeyError, NotTreeError):
+					pass
+				else:
+					if stat.S_ISDIR(head_entry[0]):
+						head_entry = None
+
+			if entry is not None and head_entry is None:
+				staged["add"].append(filename)
+			elif entry is None and head_entry is not None:
+				staged["delete"].append(filename)
+			elif entry is not None and head_entry is not None and head_entry != (entry.mode, entry.sha):
+				staged["modify"].append(filename)
+
+			# Compare the working tree with the index
+			full_path = os.path.join(root_path, tree_path)
+
+			try:
+				st = os.lstat(full_path)
+			except FileNotFoundError:
+				if entry is not None:
+					unstaged.append(filename)
+				continue
+
+			if not stat.S_ISREG(st.st_mode) and not stat.S_ISLNK(st.st_mode):
+				continue
+
+			if entry is None:
+				if ignore_manager is None:
+					ignore_manager = IgnoreFilterManager.from_repo(r)
+				if not ignore_manager.is_ignored(filename.as_posix()):
+					untracked.append(filename)
+				continue
+
+			if _stat_matches_index(entry, st, index_mtime):
+				continue
+
+			blob = normalizer.checkin_normalize(blob_from_path_and_stat(full_path, st), tree_path)
+			if blob.id != entry.sha:
+				unstaged.append(filename)
+
+	return GitStatus(staged, unstaged, untracked)
+
+
+def working_tree_status(
+		repo: Union[PathLike, "dulwich.repo.Repo"],
+		untracked: bool = True,
+		) -> "GitStatus":
+	"""
+	Returns the staged, unstaged and untracked changes in the repository.
+
+	This gives the same result as :func:`southwark.status`, but is much faster for large repositories.
+	Files whose size, inode and modification time match the index are assumed to be unchanged, and are not hashed.
+	Ignored directories, such as ``.tox`` or ``venv``, are not walked when looking for untracked files.
+
+	:param repo: The repository.
+	:param untracked: Whether to look for untracked files.
+		If :py:obj:`False` the list of untracked files will be empty.
+
+	:returns: A :class:`southwark.GitStatus` tuple.
+	"""
+
+	# stdlib
+	import stat
+
+	# 3rd party
+	from dulwich.errors import NotGitRepository
+	from dulwich.ignore import IgnoreFilterManager
+	from dulwich.index import blob_from_path_and_stat
+	from dulwich.objects import S_ISGITLINK
+	from dulwich.repo import Repo
+	from southwark import GitStatus, get_tree_changes, open_repo_closing
+
+	unstaged: List[PathPlus] = []
+	untracked_files: List[PathPlus] = []
+
+	with open_repo_closing(repo) as r:
+		staged = get_tree_changes(r)
+
+		index = r.open_index()
+		index_mtime = _index_mtime(r)
+		root_path = os.fsencode(r.path)
+		normalizer = r.get_blob_normalizer()
+
+		for tree_path, entry in index.iteritems():
+			full_path = os.path.join(root_path, tree_path)
+
+			try:
+				st = os.lstat(full_path)
+			except FileNotFoundError:
+				unstaged.append(PathPlus(tree_path.decode("UTF-8")))
+				continue
+
+			if stat.S_ISDIR(st.st_mode):
+				if S_ISGITLINK(entry.mode):
+					# A submodule; compare its HEAD with the commit recorded in the index.
+					try:
+						changed = Repo(os.fsdecode(full_path)).head() != entry.sha
+					except NotGitRepository:
+						continue
+				else:
+					changed = True
+
+				if changed:
+					unstaged.append(PathPlus(tree_path.decode("UTF-8")))
+				continue
+
+			if not stat.S_ISREG(st.st_mode) and not stat.S_ISLNK(st.st_mode):
+				continue
+
+			if _stat_matches_index(entry, st, index_mtime):
+				continue
+
+			blob = normalizer.checkin_normalize(blob_from_path_and_stat(full_path, st), tree_path)
+			if blob.id != entry.sha:
+				unstaged.append(PathPlus(tree_path.decode("UTF-8")))
+
+		if untracked:
+			ignore_manager = IgnoreFilterManager.from_repo(r)
+
+			def walk(directory: str, relative_directory: str) -> None:
+				for dir_entry in sorted(os.scandir(directory), key=lambda e: e.name):
+					relative_name = relative_directory + dir_entry.name
+
+					if dir_entry.is_dir(follow_symlinks=False):
+						if dir_entry.name != ".git" and not ignore_manager.is_ignored(relative_name + '/'):
+							walk(dir_entry.path, relative_name + '/')
+					elif relative_name.encode("UTF-8") not in index and not ignore_manager.is_ignored(relative_name):
+						untracked_files.append(PathPlus(relative_name))
+
+			walk(r.path, '')
+
+	return GitStatus(staged, unstaged, untracked_files)
+
+
+def assert_clean(repo: PathLike, allow_config: Iterable[PathLike] = ()) -> bool:
+	"""
+	Returns :py:obj:`True` if the working directory is clean.
+
+	If not, returns :py:obj:`False` and prints a helpful error message to stderr.
+
+	This behaves the same as :func:`southwark.assert_clean`, but uses :func:`~.working_tree_status`
+	and does not look for untracked files, which do not affect the result.
+
+	:param repo:
+	:param allow_config: Files which may have been changed without the working directory being considered unclean.
+	"""
+
+	# 3rd party
+	import click
+	from consolekit.terminal_colours import Fore
+	from southwark import format_git_status
+
+	allowed_files = {PathPlus(filename) for filename in allow_config}
+	stat = working_tree_status(repo, untracked=False)
+
+	modified_files = [
+			*stat.staged["add"],
+			*stat.staged["delete"],
+			*stat.staged["modify"],
+			*stat.unstaged,
+			]
+
+	if all(filename in allowed_files for filename in modified_files):
+		return True
+
+	# If we get to here the directory isn't clean
+	click.echo(Fore.RED("Git working directory is not clean:"), err=True)
+
+	for line in format_git_status(stat):
+		click.echo(Fore.RED(f"  {line}"), err=True)
+
+	return False
+
+
 def stage_changes(
-		repo: Union[PathLike, dulwich.repo.Repo],
+		repo: Union[PathLike, "dulwich.repo.Repo"],
 		files: Iterable[PathLike],
 		) -> List[PathPlus]:
 	"""
 	Stage any files that have been updated, added or removed.
 
+	Only the given files are examined, with :func:`~.path_status`, and they are staged with a single write to the index.
+
 	:param repo: The repository.
 	:param files: List of files to stage.
 
@@ -374,34 +687,30 @@ def stage_changes(
 	.. versionadded:: 2020.11.23
 	"""
 
+	# 3rd party
+	from southwark import open_repo_closing
+
 	with open_repo_closing(repo) as repo:
-		stat = status(repo)
-		unstaged_changes = stat.unstaged
-		untracked_files = stat.untracked
+		stat = path_status(repo, files)
+		to_stage = {*stat.unstaged, *stat.untracked}
+		already_staged = {*stat.staged["add"], *stat.staged["modify"], *stat.staged["delete"]}
 
 		staged_files = []
 
-		for filename in files:
-			filename = PathPlus(filename)
-
-			if filename.is_absolute():
-				filename = filename.relative_to(repo.path)
+		for tree_path in dict.fromkeys(_tree_path(repo.path, filename) for filename in files):
+			filename = PathPlus(tree_path.decode("UTF-8"))
 
-			if filename in unstaged_changes or filename in untracked_files:
-				repo.stage(os.path.normpath(filename))
+			if filename in to_stage or filename in already_staged:
 				staged_files.append(filename)
 
-			elif (
-					filename in stat.staged["add"] or filename in stat.staged["modify"]
-					or filename in stat.staged["delete"]
-					):
-				staged_files.append(filename)
+		if to_stage:
+			repo.stage([os.path.normpath(filename) for filename in staged_files if filename in to_stage])
 
 	return staged_files
 
 
 def commit_changes(
-		repo: Union[PathLike, dulwich.repo.Repo],
+		repo: Union[PathLike, "dulwich.repo.Repo"],
 		message: str = "Updated files with 'repo_helper'.",
 		) -> str:
 	"""
@@ -415,6 +724,9 @@ def commit_changes(
 	.. versionadded:: 2020.11.23
 	"""
 
+	# 3rd party
+	from southwark import open_repo_closing
+
 	with open_repo_closing(repo) as repo:
 		current_time = datetime.datetime.now(datetime.timezone.utc).astimezone()
 		current_timezone = current_time.tzinfo.utcoffset(None).total_seconds()  # type: ignore
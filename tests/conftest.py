@@ -25,13 +25,29 @@ import datetime
 
 # 3rd party
 import pytest
+from _pytest.monkeypatch import MonkeyPatch
 
 # this package
+from repo_helper import templates
 from repo_helper.configuration import metadata
 
 pytest_plugins = ("coincidence", "repo_helper.testing")
 
 
+@pytest.fixture(scope="session", autouse=True)
+def isolated_cache_dir(tmp_path_factory):
+	# Keep compiled templates and other caches out of the user's home directory.
+	# The monkeypatch fixture is function scoped, and MonkeyPatch.context() requires pytest 6.2.
+	monkeypatch = MonkeyPatch()
+
+	try:
+		monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
+		monkeypatch.setattr(templates, "_bytecode_cache", None)
+		yield
+	finally:
+		monkeypatch.undo()
+
+
 @pytest.fixture()
 def fixed_version_number(monkeypatch):
 	monkeypatch.setattr(metadata.version, "validator", lambda *args: "2020.12.18")
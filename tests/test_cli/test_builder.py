@@ -1,17 +1,29 @@
 # stdlib
+import hashlib
+import io
+import os
+import json
 import pathlib
 import re
+import subprocess
+import tarfile
+import time
+import zipfile
+from base64 import urlsafe_b64encode
 from email import message_from_file
+from typing import Any, Dict
 
 # 3rd party
 import pytest
+import shippinglabel.conda
 from coincidence import check_file_output
 from domdf_python_tools.paths import PathPlus
 from pytest_regressions.data_regression import DataRegressionFixture
 from pytest_regressions.file_regression import FileRegressionFixture
 
 # this package
-from repo_helper.build import Builder
+import repo_helper.build
+from repo_helper.build import Builder, Compression
 
 
 @pytest.fixture()
@@ -153,3 +165,573 @@ This is the readme.
 	assert (builder.build_dir / "METADATA").exists()
 	assert (builder.build_dir / "METADATA").is_file()
 	check_file_output(builder.build_dir / "METADATA", file_regression)
+
+
+def test_build_wheel(temp_repo, tmp_pathplus: PathPlus):
+	repo_dir = PathPlus(temp_repo.path)
+	(repo_dir / "repo_helper_demo" / "sub").mkdir(parents=True)
+	(repo_dir / "repo_helper_demo" / "__init__.py").write_text("print('hello world')   \n\n\n")
+	(repo_dir / "repo_helper_demo" / "sub" / "__init__.py").write_text('')
+	(repo_dir / "repo_helper_demo" / "data.bin").write_bytes(b"\x00\x01  \n\n")
+	(repo_dir / "README.rst").write_text("This is the readme.\n")
+	(repo_dir / "LICENSE").write_text("This is the license.")
+	(repo_dir / "requirements.txt").write_text("click>=7.1.2\n")
+
+	builder = Builder(repo_dir=repo_dir, out_dir=tmp_pathplus / "dist")
+	builder.config["manifest_additional"] = ["include repo_helper_demo/*.bin"]
+	wheel_filename = builder.build_wheel()
+
+	# Nothing is staged in the build directory
+	assert not [file for file in builder.build_dir.rglob('*') if file.is_file()]
+
+	with zipfile.ZipFile(tmp_pathplus / "dist" / wheel_filename) as wheel:
+		assert wheel.read("repo_helper_demo/__init__.py") == b"print('hello world')\n"
+		assert wheel.read("repo_helper_demo/data.bin") == b"\x00\x01  \n\n"
+
+		dist_info = f"{builder.archive_name}.dist-info"
+		record = wheel.read(f"{dist_info}/RECORD").decode("UTF-8").splitlines()
+
+		assert sorted(entry.split(',')[0] for entry in record) == sorted(wheel.namelist())
+		assert f"{dist_info}/RECORD,," in record
+
+		for entry in record:
+			filename, digest, size = entry.split(',')
+			if filename.endswith("RECORD"):
+				continue
+
+			data = wheel.read(filename)
+			assert size == str(len(data))
+			sha256 = urlsafe_b64encode(hashlib.sha256(data).digest()).decode("latin1").rstrip('=')
+			assert digest == f"sha256={sha256}"
+
+
+def test_build_targets(temp_repo, tmp_pathplus: PathPlus):
+	repo_dir = PathPlus(temp_repo.path)
+	(repo_dir / "repo_helper_demo").mkdir()
+	(repo_dir / "repo_helper_demo" / "__init__.py").write_text("print('hello world')\n")
+	(repo_dir / "README.rst").write_text("This is the readme.\n")
+	(repo_dir / "requirements.txt").write_text("click>=7.1.2\n")
+	(repo_dir / "pyproject.toml").write_text("[build-system]\nrequires = []\n")
+
+	builder = Builder(repo_dir=repo_dir, out_dir=tmp_pathplus / "dist")
+	results = builder.build_targets(["sdist", "wheel"], jobs=2)
+
+	assert [result.target for result in results] == ["sdist", "wheel"]
+	assert results[0].filename == "repo_helper_demo-0.0.1.tar.gz"
+	assert results[1].filename == "repo_helper_demo-0.0.1-py3-none-any.whl"
+
+	for result in results:
+		assert (tmp_pathplus / "dist" / result.filename).is_file()
+		assert result.duration >= 0
+
+	with tarfile.open(tmp_pathplus / "dist" / results[0].filename) as sdist:
+		assert "repo_helper_demo/__init__.py" in sdist.getnames()
+		assert "PKG-INFO" in sdist.getnames()
+
+	with pytest.raises(ValueError, match="Unknown build target 'egg'."):
+		builder.build_targets(["wheel", "egg"])
+
+
+def test_build_conda(temp_repo, tmp_pathplus: PathPlus, monkeypatch):
+	monkeypatch.setattr(shippinglabel.conda, "get_channel_listing", lambda channel: ["click", "lxml"])
+
+	def popen(*args, **kwargs):
+		raise AssertionError("A subprocess was started.")
+
+	monkeypatch.setattr(subprocess, "Popen", popen)
+
+	repo_dir = PathPlus(temp_repo.path)
+	(repo_dir / "repo_helper_demo").mkdir()
+	(repo_dir / "repo_helper_demo" / "__init__.py").write_text("print('hello world')\n")
+	(repo_dir / "README.rst").write_text("This is the readme.\n")
+	(repo_dir / "LICENSE").write_text("This is the license.")
+	(repo_dir / "requirements.txt").write_text("click>=7.1.2\n")
+
+	builder = Builder(repo_dir=repo_dir, out_dir=tmp_pathplus / "dist")
+	conda_filename = builder.build_conda()
+	assert conda_filename == "repo_helper_demo-0.0.1-py_1.tar.bz2"
+
+	dist_info = f"site-packages/{builder.archive_name}.dist-info"
+
+	with tarfile.open(tmp_pathplus / "dist" / conda_filename) as conda_archive:
+		names = conda_archive.getnames()
+		assert "site-packages/repo_helper_demo/__init__.py" in names
+		assert "info/index.json" in names
+		assert "info/license.txt" in names
+
+		files = conda_archive.extractfile("info/files").read().decode("UTF-8").splitlines()  # type: ignore
+		assert files == [name for name in names if name.startswith("site-packages/")]
+
+		assert conda_archive.extractfile(f"{dist_info}/INSTALLER").read() == b"conda"  # type: ignore
+		record = conda_archive.extractfile(f"{dist_info}/RECORD").read().decode("UTF-8")  # type: ignore
+		assert f"{builder.archive_name}.dist-info/INSTALLER," in record
+
+
+def test_build_conda_v2(temp_repo, tmp_pathplus: PathPlus, monkeypatch):
+	zstandard = pytest.importorskip("zstandard")
+	monkeypatch.setattr(shippinglabel.conda, "get_channel_listing", lambda channel: ["click", "lxml"])
+
+	repo_dir = PathPlus(temp_repo.path)
+	(repo_dir / "repo_helper_demo").mkdir()
+	(repo_dir / "repo_helper_demo" / "__init__.py").write_text("print('hello world')\n")
+	(repo_dir / "README.rst").write_text("This is the readme.\n")
+	(repo_dir / "requirements.txt").write_text("click>=7.1.2\n")
+
+	builder = Builder(repo_dir=repo_dir, out_dir=tmp_pathplus / "dist", conda_format="conda", zstd_level=3)
+	conda_filename = builder.build_conda()
+	assert conda_filename == "repo_helper_demo-0.0.1-py_1.conda"
+
+	def read_tar(data: bytes) -> Dict[str, bytes]:
+		decompressed = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+		with tarfile.open(fileobj=io.BytesIO(decompressed)) as tar:
+			return {member.name: tar.extractfile(member).read() for member in tar}  # type: ignore
+
+	with zipfile.ZipFile(tmp_pathplus / "dist" / conda_filename) as conda_archive:
+		assert conda_archive.namelist() == [
+				"metadata.json",
+				"pkg-repo_helper_demo-0.0.1-py_1.tar.zst",
+				"info-repo_helper_demo-0.0.1-py_1.tar.zst",
+				]
+		assert json.loads(conda_archive.read("metadata.json")) == {"conda_pkg_format_version": 2}
+
+		pkg = read_tar(conda_archive.read("pkg-repo_helper_demo-0.0.1-py_1.tar.zst"))
+		info = read_tar(conda_archive.read("info-repo_helper_demo-0.0.1-py_1.tar.zst"))
+
+	assert pkg["site-packages/repo_helper_demo/__init__.py"] == b"print('hello world')\n"
+	assert info["info/files"].decode("UTF-8").splitlines() == list(pkg)
+	assert json.loads(info["info/index.json"])["name"] == "repo_helper_demo"
+
+
+def test_conda_format_invalid(temp_repo):
+	with pytest.raises(ValueError, match="Unknown conda package format 'zip'."):
+		Builder(repo_dir=temp_repo.path, conda_format="zip")
+
+
+@pytest.mark.parametrize(
+		"kwargs, message",
+		[
+				({"zstd_level": 0}, "'zstd_level' must be between 1 and 22."),
+				({"zstd_level": 23}, "'zstd_level' must be between 1 and 22."),
+				({"zstd_threads": -1}, "'zstd_threads' cannot be negative."),
+				]
+		)
+def test_zstd_options_invalid(temp_repo, kwargs: Dict[str, int], message: str):
+	with pytest.raises(ValueError, match=re.escape(message)):
+		Builder(repo_dir=temp_repo.path, **kwargs)
+
+
+@pytest.mark.parametrize(
+		"value, expected",
+		[
+				("deflated", Compression("deflated", None)),
+				("deflated:9", Compression("deflated", 9)),
+				("BZIP2:1", Compression("bzip2", 1)),
+				("gz:6", Compression("gz", 6)),
+				]
+		)
+def test_compression_parse(value: str, expected: Compression):
+	assert Compression.parse(value) == expected
+
+
+@pytest.mark.parametrize(
+		"compression, artefact, message",
+		[
+				(Compression("zstd"), "wheel", "Unknown compression method 'zstd' for wheels."),
+				(Compression("bz2", 9), "sdist", "Unknown compression method 'bz2' for sdists."),
+				(Compression("deflated", 10), "wheel", "The 'deflated' compression level must be between 0 and 9."),
+				(Compression("stored", 1), "wheel", "The 'stored' compression method does not take a level."),
+				]
+		)
+def test_compression_validate(compression: Compression, artefact: str, message: str):
+	with pytest.raises(ValueError, match=re.escape(message)):
+		compression.validate(artefact)
+
+
+def test_builder_options():
+	assert repo_helper.build._builder_options(None) == {"compression": {}}
+	assert repo_helper.build._builder_options({
+			"wheel-compression": "deflated:9",
+			"--sdist-compression": "gz:6",
+			"compression-threads": '4',
+			"zstd-level": "19",
+			"--zstd-threads": '2',
+			"--build-option": "--foo",
+			}) == {
+					"compression": {"wheel": Compression("deflated", 9), "sdist": Compression("gz", 6)},
+					"compression_threads": 4,
+					"zstd_level": 19,
+					"zstd_threads": 2,
+					}
+
+
+@pytest.mark.parametrize(
+		"compression, compress_type",
+		[
+				(Compression("stored"), zipfile.ZIP_STORED),
+				(Compression("deflated"), zipfile.ZIP_DEFLATED),
+				(Compression("deflated", 9), zipfile.ZIP_DEFLATED),
+				(Compression("bzip2", 9), zipfile.ZIP_BZIP2),
+				(Compression("lzma"), zipfile.ZIP_LZMA),
+				]
+		)
+@pytest.mark.parametrize("threads", [1, 4])
+def test_build_wheel_compression(
+		temp_repo,
+		tmp_pathplus: PathPlus,
+		compression: Compression,
+		compress_type: int,
+		threads: int,
+		):
+	repo_dir = PathPlus(temp_repo.path)
+	(repo_dir / "repo_helper_demo").mkdir()
+
+	for number in range(20):
+		(repo_dir / "repo_helper_demo" / f"module_{number}.py").write_lines([f"print({number})"] * number)
+
+	(repo_dir / "README.rst").write_text("This is the readme.\n")
+	(repo_dir / "requirements.txt").write_text("click>=7.1.2\n")
+
+	builder = Builder(
+			repo_dir=repo_dir,
+			out_dir=tmp_pathplus / "dist",
+			compression={"wheel": compression},
+			compression_threads=threads,
+			)
+	wheel_filename = builder.build_wheel()
+
+	with zipfile.ZipFile(tmp_pathplus / "dist" / wheel_filename) as wheel:
+		assert wheel.testzip() is None
+		assert {zinfo.compress_type for zinfo in wheel.infolist()} == {compress_type}
+
+		names = wheel.namelist()
+		assert sorted(names[:20]) == sorted(f"repo_helper_demo/module_{number}.py" for number in range(20))
+		assert names[-1].endswith(".dist-info/RECORD")
+
+		for number in range(20):
+			expected = ''.join(f"print({number})\n" for _ in range(number))
+			assert wheel.read(f"repo_helper_demo/module_{number}.py").decode("UTF-8") == expected
+
+
+@pytest.mark.parametrize("zip64", [False, True])
+def test_zip_writer(tmp_pathplus: PathPlus, monkeypatch, zip64: bool):
+	if zip64:
+		# Use the zip64 extension for every size and offset.
+		monkeypatch.setattr(repo_helper.build, "_zip64_limit", 0)
+
+	files = {"foo.py": b"print('foo')\n" * 100, "b\u00e4r/__init__.py": b'', "baz.txt": b"baz"}
+
+	with repo_helper.build._RecordingArchive(tmp_pathplus / "test.zip", Compression("deflated")) as archive:
+		for arcname, content in files.items():
+			archive.write_text(arcname, content.decode("UTF-8"))
+
+		archive.write_record("RECORD")
+
+	with zipfile.ZipFile(tmp_pathplus / "test.zip") as zip_file:
+		assert zip_file.testzip() is None
+		assert zip_file.namelist() == [*files, "RECORD"]
+
+		for arcname, content in files.items():
+			assert zip_file.read(arcname) == repo_helper.build._clean(content.decode("UTF-8")).encode("UTF-8")
+			assert zip_file.getinfo(arcname).external_attr == 0o644 << 16
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_build_wheel_incremental(temp_repo, tmp_pathplus: PathPlus, monkeypatch, threads: int):
+	repo_dir = PathPlus(temp_repo.path)
+	(repo_dir / "repo_helper_demo").mkdir()
+
+	for number in range(10):
+		(repo_dir / "repo_helper_demo" / f"module_{number}.py").write_text(f"print({number})   \n")
+
+	(repo_dir / "README.rst").write_text("This is the readme.\n")
+	(repo_dir / "requirements.txt").write_text("click>=7.1.2\n")
+
+	def build() -> Dict[str, bytes]:
+		builder = Builder(
+				repo_dir=repo_dir,
+				out_dir=tmp_pathplus / "dist",
+				compression_threads=threads,
+				incremental=True,
+				cache_dir=tmp_pathplus / "cache",
+				)
+		wheel_filename = builder.build_wheel()
+
+		with zipfile.ZipFile(tmp_pathplus / "dist" / wheel_filename) as wheel:
+			assert wheel.testzip() is None
+			return {name: wheel.read(name) for name in wheel.namelist() if not name.endswith("RECORD")}
+
+	first_build = build()
+	assert first_build["repo_helper_demo/module_3.py"] == b"print(3)\n"
+
+	# The metadata is not generated again unless its inputs change.
+	def metadata(self):
+		raise AssertionError("Metadata should not be generated again.")
+
+	monkeypatch.setattr(Builder, "_metadata", metadata)
+
+	# Unchanged files are neither read nor compressed again.
+	prepared = []
+	original_prepare = repo_helper.build._RecordingArchive._prepare
+
+	def prepare(self, zinfo, *args):
+		prepared.append(zinfo.filename)
+		return original_prepare(self, zinfo, *args)
+
+	monkeypatch.setattr(repo_helper.build._RecordingArchive, "_prepare", prepare)
+	assert build() == first_build
+	assert prepared
+	assert not [filename for filename in prepared if filename.startswith("repo_helper_demo/")]
+
+	(repo_dir / "repo_helper_demo" / "module_3.py").write_text("print('three')\n")
+	second_build = build()
+	assert second_build["repo_helper_demo/module_3.py"] == b"print('three')\n"
+	assert {k: v for k, v in second_build.items() if k != "repo_helper_demo/module_3.py"} == {
+			k: v
+			for k, v in first_build.items() if k != "repo_helper_demo/module_3.py"
+			}
+
+	# Only the hashes of the files in the last build are kept.
+	(repo_dir / "repo_helper_demo" / "module_9.py").unlink()
+	build()
+	index = json.loads((tmp_pathplus / "cache" / "index.json").read_text())
+	assert "repo_helper_demo/module_9.py" not in index["files"]
+	assert "repo_helper_demo/module_3.py" in index["files"]
+	assert len(index["objects"]) == len(index["files"])
+	assert [p.name for p in (tmp_pathplus / "cache").glob("*.pack")] == [index["pack"]]
+
+	monkeypatch.undo()
+	(repo_dir / "README.rst").write_text("This is the new readme.\n")
+	third_build = build()
+	assert "This is the new readme." in third_build[f"{Builder(repo_dir).archive_name}.dist-info/METADATA"].decode()
+
+
+def test_build_wheel_incremental_extras(temp_repo, tmp_pathplus: PathPlus):
+	repo_dir = PathPlus(temp_repo.path)
+	(repo_dir / "repo_helper_demo").mkdir()
+	(repo_dir / "repo_helper_demo" / "__init__.py").write_text("print('hello world')\n")
+	(repo_dir / "README.rst").write_text("This is the readme.\n")
+	(repo_dir / "requirements.txt").write_text("click>=7.1.2\n")
+	(repo_dir / "extras.txt").write_text("pytz>=2019.1\n")
+
+	config = (repo_dir / "repo_helper.yml").read_text()
+	(repo_dir / "repo_helper.yml").write_text(config.replace("  schema:\n    - lxml\n", "  dates: extras.txt\n"))
+
+	def metadata() -> str:
+		builder = Builder(
+				repo_dir=repo_dir,
+				out_dir=tmp_pathplus / "dist",
+				incremental=True,
+				cache_dir=tmp_pathplus / "cache",
+				)
+		wheel_filename = builder.build_wheel()
+
+		with zipfile.ZipFile(tmp_pathplus / "dist" / wheel_filename) as wheel:
+			return wheel.read(f"{builder.archive_name}.dist-info/METADATA").decode("UTF-8")
+
+	assert "Requires-Dist: pytz>=2019.1 ; extra == 'dates'" in metadata()
+
+	# Editing the requirements of an extra invalidates the cached metadata.
+	(repo_dir / "extras.txt").write_text("pytz>=2020.1\n")
+	assert "Requires-Dist: pytz>=2020.1 ; extra == 'dates'" in metadata()
+
+
+def test_build_wheel_error_stops_threads(temp_repo, tmp_pathplus: PathPlus, monkeypatch):
+	repo_dir = PathPlus(temp_repo.path)
+	(repo_dir / "repo_helper_demo").mkdir()
+	(repo_dir / "repo_helper_demo" / "__init__.py").write_text("print('hello world')\n")
+	(repo_dir / "README.rst").write_text("This is the readme.\n")
+	(repo_dir / "requirements.txt").write_text("click>=7.1.2\n")
+
+	executors = []
+	original_init = repo_helper.build._RecordingArchive.__init__
+
+	def init(self, *args, **kwargs):
+		original_init(self, *args, **kwargs)
+		executors.append(self._executor)
+
+	def write_record(self, arcname):
+		raise ValueError("Build failed")
+
+	monkeypatch.setattr(repo_helper.build._RecordingArchive, "__init__", init)
+	monkeypatch.setattr(repo_helper.build._RecordingArchive, "write_record", write_record)
+
+	builder = Builder(repo_dir=repo_dir, out_dir=tmp_pathplus / "dist", compression_threads=4)
+
+	with pytest.raises(ValueError, match="Build failed"):
+		builder.build_wheel()
+
+	assert len(executors) == 1
+	assert executors[0]._shutdown
+
+
+def test_prepare_metadata_for_build_wheel(temp_repo, tmp_pathplus: PathPlus, monkeypatch):
+	repo_dir = PathPlus(temp_repo.path)
+	(repo_dir / "repo_helper_demo").mkdir()
+	(repo_dir / "repo_helper_demo" / "__init__.py").write_text("print('hello world')\n")
+	(repo_dir / "README.rst").write_text("This is the readme.\n")
+	(repo_dir / "LICENSE").write_text("This is the license.")
+	(repo_dir / "requirements.txt").write_text("click>=7.1.2\n")
+	monkeypatch.chdir(repo_dir)
+
+	assert repo_helper.build.get_requires_for_build_wheel() == []
+
+	metadata_directory = tmp_pathplus / "metadata"
+	metadata_directory.mkdir()
+	dist_info = repo_helper.build.prepare_metadata_for_build_wheel(metadata_directory)
+	assert dist_info == "repo_helper_demo-0.0.1.dist-info"
+
+	prepared = {file.name: file.read_bytes() for file in (metadata_directory / dist_info).iterdir()}
+	assert sorted(prepared) == ["LICENSE", "METADATA", "WHEEL", "entry_points.txt", "top_level.txt"]
+	assert not (repo_dir / "dist").exists()
+
+	# The wheel built without the prepared metadata has the same metadata.
+	wheel_filename = repo_helper.build.build_wheel(tmp_pathplus / "dist")
+
+	with zipfile.ZipFile(tmp_pathplus / "dist" / wheel_filename) as wheel:
+		for filename, content in prepared.items():
+			assert wheel.read(f"{dist_info}/{filename}") == content
+
+	# The prepared metadata is used when building the wheel.
+	(metadata_directory / dist_info / "METADATA").write_bytes(prepared["METADATA"] + b"Extra line\n")
+	wheel_filename = repo_helper.build.build_wheel(
+			tmp_pathplus / "dist2",
+			metadata_directory=metadata_directory / dist_info,
+			)
+
+	with zipfile.ZipFile(tmp_pathplus / "dist2" / wheel_filename) as wheel:
+		assert wheel.read(f"{dist_info}/METADATA").endswith(b"Extra line\n")
+		record = wheel.read(f"{dist_info}/RECORD").decode("UTF-8")
+		assert f"{dist_info}/METADATA,sha256=" in record
+		assert sorted(wheel.namelist()) == sorted([
+				"repo_helper_demo/__init__.py",
+				*(f"{dist_info}/{filename}" for filename in prepared),
+				f"{dist_info}/RECORD",
+				])
+
+
+def test_build_editable(temp_repo, tmp_pathplus: PathPlus, monkeypatch):
+	repo_dir = PathPlus(temp_repo.path)
+	(repo_dir / "repo_helper_demo").mkdir()
+	(repo_dir / "repo_helper_demo" / "__init__.py").write_text("print('hello world')\n")
+	(repo_dir / "README.rst").write_text("This is the readme.\n")
+	(repo_dir / "requirements.txt").write_text("click>=7.1.2\n")
+	monkeypatch.chdir(repo_dir)
+
+	assert repo_helper.build.get_requires_for_build_editable() == []
+
+	metadata_directory = tmp_pathplus / "metadata"
+	metadata_directory.mkdir()
+	dist_info = repo_helper.build.prepare_metadata_for_build_editable(metadata_directory)
+	assert dist_info == "repo_helper_demo-0.0.1.dist-info"
+
+	wheel_filename = repo_helper.build.build_editable(
+			tmp_pathplus / "dist",
+			metadata_directory=metadata_directory / dist_info,
+			)
+	assert wheel_filename == "repo_helper_demo-0.0.1-py3-none-any.whl"
+
+	finder_name = "__editable___repo_helper_demo_0_0_1_finder"
+
+	with zipfile.ZipFile(tmp_pathplus / "dist" / wheel_filename) as wheel:
+		assert sorted(wheel.namelist()) == [
+				"__editable__.repo_helper_demo-0.0.1.pth",
+				f"{finder_name}.py",
+				f"{dist_info}/METADATA",
+				f"{dist_info}/RECORD",
+				f"{dist_info}/WHEEL",
+				f"{dist_info}/entry_points.txt",
+				f"{dist_info}/top_level.txt",
+				]
+
+		pth_file = wheel.read("__editable__.repo_helper_demo-0.0.1.pth").decode("UTF-8")
+		assert pth_file.splitlines() == [f"import {finder_name}; {finder_name}.install()"]
+
+		finder: Dict[str, Any] = {}
+		exec(wheel.read(f"{finder_name}.py"), finder)
+
+	# Only the package is importable, not the rest of the repository.
+	(repo_dir / "tests").mkdir()
+	(repo_dir / "tests" / "__init__.py").touch()
+	(repo_dir / "setup.py").touch()
+
+	spec = finder["EditableFinder"].find_spec("repo_helper_demo")
+	assert spec.origin == str(repo_dir.resolve() / "repo_helper_demo" / "__init__.py")
+	assert finder["EditableFinder"].find_spec("tests") is None
+	assert finder["EditableFinder"].find_spec("setup") is None
+
+
+def test_build_editable_source_dir(temp_repo, tmp_pathplus: PathPlus):
+	repo_dir = PathPlus(temp_repo.path)
+	(repo_dir / "src" / "repo_helper_demo").mkdir(parents=True)
+	(repo_dir / "src" / "repo_helper_demo" / "__init__.py").write_text("print('hello world')\n")
+	(repo_dir / "README.rst").write_text("This is the readme.\n")
+	(repo_dir / "requirements.txt").write_text("click>=7.1.2\n")
+
+	with (repo_dir / "repo_helper.yml").open('a') as fp:
+		fp.write("source_dir: src\n")
+
+	wheel_filename = Builder(repo_dir=repo_dir, out_dir=tmp_pathplus / "dist").build_editable()
+
+	with zipfile.ZipFile(tmp_pathplus / "dist" / wheel_filename) as wheel:
+		pth_file = wheel.read("__editable__.repo_helper_demo-0.0.1.pth").decode("UTF-8")
+		assert pth_file.splitlines() == [str(repo_dir.resolve() / "src")]
+		assert not [name for name in wheel.namelist() if name.endswith("_finder.py")]
+
+
+@pytest.mark.parametrize("conda_format", ["tar.bz2", "conda"])
+def test_reproducible(temp_repo, tmp_pathplus: PathPlus, monkeypatch, conda_format: str):
+	if conda_format == "conda":
+		pytest.importorskip("zstandard")
+
+	monkeypatch.setattr(shippinglabel.conda, "get_channel_listing", lambda channel: ["click", "lxml"])
+	monkeypatch.setenv("SOURCE_DATE_EPOCH", "1600000000")
+
+	repo_dir = PathPlus(temp_repo.path)
+	(repo_dir / "repo_helper_demo").mkdir()
+	(repo_dir / "repo_helper_demo" / "__init__.py").write_text("print('hello world')\n")
+	(repo_dir / "repo_helper_demo" / "__main__.py").write_text("print('hello world')\n")
+	(repo_dir / "README.rst").write_text("This is the readme.\n")
+	(repo_dir / "LICENSE").write_text("This is the license.")
+	(repo_dir / "requirements.txt").write_text("click>=7.1.2\n")
+	(repo_dir / "pyproject.toml").write_text("[build-system]\nrequires = []\n")
+
+	def build(out_dir: PathPlus):
+		builder = Builder(repo_dir=repo_dir, out_dir=out_dir, conda_format=conda_format)
+		assert builder.source_date_epoch == 1600000000
+		return [out_dir / builder.build_wheel(), out_dir / builder.build_sdist(), out_dir / builder.build_conda()]
+
+	first_build = build(tmp_pathplus / "first")
+
+	# Neither the files' timestamps and permissions nor the time of the build affect the archives.
+	(repo_dir / "repo_helper_demo" / "__main__.py").chmod(0o600)
+	for file in repo_dir.rglob("*.py"):
+		os.utime(file, (1700000000, 1700000000))
+	monkeypatch.setattr(time, "time", lambda: 1800000000.0)
+
+	second_build = build(tmp_pathplus / "second")
+
+	for first, second in zip(first_build, second_build):
+		assert first.name == second.name
+		assert first.read_bytes() == second.read_bytes(), first.name
+
+	with zipfile.ZipFile(first_build[0]) as wheel:
+		assert {zinfo.date_time for zinfo in wheel.infolist()} == {(2020, 9, 13, 12, 26, 40)}
+		assert {zinfo.external_attr >> 16 & 0o777 for zinfo in wheel.infolist()} == {0o644}
+
+	with tarfile.open(first_build[1]) as sdist:
+		assert sdist.getnames() == sorted(sdist.getnames())
+		assert {(member.mtime, member.uid, member.uname, member.mode) for member in sdist} == {(1600000000, 0, '', 0o644)}
+
+
+def test_reproducible_default(temp_repo, monkeypatch):
+	monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+	assert Builder(repo_dir=temp_repo.path).source_date_epoch is None
+	assert Builder(repo_dir=temp_repo.path, reproducible=True).source_date_epoch == 315532800
+
+	monkeypatch.setenv("SOURCE_DATE_EPOCH", "1600000000")
+	assert Builder(repo_dir=temp_repo.path).source_date_epoch == 1600000000
+	assert Builder(repo_dir=temp_repo.path, reproducible=False).source_date_epoch is None
+
+	monkeypatch.setenv("SOURCE_DATE_EPOCH", "yesterday")
+	with pytest.raises(ValueError, match="Invalid value for \\$SOURCE_DATE_EPOCH: 'yesterday'"):
+		Builder(repo_dir=temp_repo.path)
@@ -0,0 +1,79 @@
+# stdlib
+import re
+
+# 3rd party
+from consolekit.testing import CliRunner, Result
+from domdf_python_tools.paths import PathPlus
+from dulwich.repo import Repo
+
+# this package
+from repo_helper.cli.commands.fleet import fleet
+from repo_helper.fleet import discover_repositories, run_repository
+
+
+def make_repos(tmp_pathplus: PathPlus, example_config: str) -> PathPlus:
+	fleet_dir = tmp_pathplus / "fleet"
+
+	for name in ["alpha", "beta"]:
+		repo_dir = fleet_dir / name
+		repo_dir.maybe_make(parents=True)
+		Repo.init(repo_dir)
+		(repo_dir / "repo_helper.yml").write_text(example_config)
+		(repo_dir / "requirements.txt").touch()
+		(repo_dir / "README.rst").touch()
+
+	(fleet_dir / "not_a_repo").mkdir()
+
+	return fleet_dir
+
+
+def test_discover_repositories(tmp_pathplus: PathPlus, example_config: str):
+	fleet_dir = make_repos(tmp_pathplus, example_config)
+	expected = [fleet_dir / "alpha", fleet_dir / "beta"]
+
+	assert discover_repositories([fleet_dir]) == expected
+	assert discover_repositories([fleet_dir / "beta", fleet_dir]) == expected[::-1]
+
+	(tmp_pathplus / "repos.txt").write_lines(["# Repositories", "fleet/alpha", '', "fleet/beta"])
+	assert discover_repositories([tmp_pathplus / "repos.txt"]) == expected
+
+
+def test_run_repository(tmp_pathplus: PathPlus, example_config: str):
+	fleet_dir = make_repos(tmp_pathplus, example_config)
+
+	result = run_repository(fleet_dir / "alpha")
+	assert result.status == "changed"
+	assert result.path == str(fleet_dir / "alpha")
+	assert result.duration > 0
+
+	# The changes are staged but not committed
+	assert run_repository(fleet_dir / "alpha").status == "skipped"
+	assert run_repository(fleet_dir / "alpha", force=True).status == "changed"
+
+	result = run_repository(fleet_dir / "beta", commit=True)
+	assert result.status == "changed"
+	assert result.details.startswith("Committed as ")
+	assert run_repository(fleet_dir / "beta").status == "unchanged"
+
+	(fleet_dir / "beta" / "repo_helper.yml").write_text("modname: [")
+	result = run_repository(fleet_dir / "beta", force=True)
+	assert result.status == "failed"
+	assert result.details.startswith("ParserError: ")
+
+
+def test_fleet(tmp_pathplus: PathPlus, example_config: str):
+	fleet_dir = make_repos(tmp_pathplus, example_config)
+
+	runner = CliRunner()
+	result: Result = runner.invoke(fleet, args=[str(fleet_dir), "--jobs", '1', "--commit"])
+	assert result.exit_code == 0
+
+	lines = result.stdout.splitlines()
+	assert lines[0].split() == ["Repository", "Status", "Time", "(s)", "Details"]
+	assert lines[2].startswith(str(fleet_dir / "alpha"))
+	assert lines[3].startswith(str(fleet_dir / "beta"))
+
+	for line in lines[2:4]:
+		assert re.match(r".* changed +\d+\.\d+ +Committed as [0-9a-f]{40}$", line)
+
+	assert lines[-1] == "2 changed, 0 unchanged, 0 skipped, 0 failed"
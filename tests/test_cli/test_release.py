@@ -1,8 +1,10 @@
 # stdlib
+import os
 import re
 from typing import TYPE_CHECKING, Callable, List, Optional
 
 # 3rd party
+import pytest
 from coincidence.regressions import check_file_regression
 from consolekit.testing import CliRunner, Result
 from domdf_python_tools.paths import PathPlus, in_directory
@@ -12,6 +14,7 @@ from southwark.repo import Repo
 
 # this package
 from repo_helper.cli.commands.release import major, minor, patch, release
+from repo_helper.release import Bumper, FileEdit, apply_edits
 from tests import pypy_windows_dulwich
 
 if TYPE_CHECKING:
@@ -21,15 +24,8 @@ else:
 	from click import Command
 
 
-def do_test_release(
-		temp_repo: Repo,
-		file_regression: FileRegressionFixture,
-		expected_version: str,
-		command: Command,
-		args: Optional[List[str]] = None,
-		force: bool = False
-		):
-	(temp_repo.path / ".bumpversion.cfg").write_lines([
+def write_release_files(repo_path: PathPlus):
+	(repo_path / ".bumpversion.cfg").write_lines([
 			"[bumpversion]",
 			"current_version = 0.0.1",
 			"commit = True",
@@ -37,26 +33,37 @@ def do_test_release(
 			'',
 			"[bumpversion:file:repo_helper.yml]",
 			])
-	(temp_repo.path / "pyproject.toml").write_lines([
+	(repo_path / "pyproject.toml").write_lines([
 			"[project]",
 			'name = "modname: repo_helper_demo"',
 			'version = "0.0.1"',
 			])
-	(temp_repo.path / "__pkginfo__.py").write_text('__version__ = "0.0.1"')
-	(temp_repo.path / "repo_helper_demo").maybe_make()
-	(temp_repo.path / "repo_helper_demo" / "__init__.py").write_text('__version__ = "0.0.1"')
-	(temp_repo.path / "README.rst").write_lines([
+	(repo_path / "__pkginfo__.py").write_text('__version__ = "0.0.1"')
+	(repo_path / "repo_helper_demo").maybe_make()
+	(repo_path / "repo_helper_demo" / "__init__.py").write_text('__version__ = "0.0.1"')
+	(repo_path / "README.rst").write_lines([
 			".. image:: https://img.shields.io/github/commits-since/domdfcoding/repo_helper/v0.0.1",
 			"\t:target: https://github.com/domdfcoding/repo_helper/pulse",
 			"\t:alt: GitHub commits since tagged version",
 			])
-	(temp_repo.path / "doc-source").maybe_make()
-	(temp_repo.path / "doc-source" / "index.rst").write_lines([
+	(repo_path / "doc-source").maybe_make()
+	(repo_path / "doc-source" / "index.rst").write_lines([
 			".. github-shield::",
 			"\t:commits-since: v0.0.1",
 			"\t:alt: GitHub commits since tagged version",
 			])
 
+
+def do_test_release(
+		temp_repo: Repo,
+		file_regression: FileRegressionFixture,
+		expected_version: str,
+		command: Command,
+		args: Optional[List[str]] = None,
+		force: bool = False
+		):
+	write_release_files(temp_repo.path)
+
 	if args is None:
 		args = []
 
@@ -182,6 +189,122 @@ def test_release_unclean(temp_repo, file_regression: FileRegressionFixture):
 		assert not result.stdout
 
 
+@pypy_windows_dulwich
+def test_release_multiple_repos(temp_repo, example_config, tmp_pathplus: PathPlus):
+	second_repo = Repo.init(tmp_pathplus / "second", mkdir=True)
+	(second_repo.path / "repo_helper.yml").write_text(example_config)
+
+	for repo in (temp_repo, second_repo):
+		write_release_files(repo.path)
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+		result: Result = runner.invoke(
+				minor,
+				args=["--repo", temp_repo.path, "--repo", second_repo.path],
+				catch_exceptions=False,
+				)
+		assert result.exit_code == 0
+		assert result.stdout.count("Bump version v0.0.1 -> v0.1.0") == 2
+
+	for repo in (temp_repo, second_repo):
+		assert 'version = "0.1.0"' in (PathPlus(repo.path) / "pyproject.toml").read_text()
+		assert "current_version = 0.1.0" in (PathPlus(repo.path) / ".bumpversion.cfg").read_text()
+		assert "v0.1.0" in get_tags(repo).values()
+
+
+@pypy_windows_dulwich
+def test_release_missing_file(temp_repo, example_config, tmp_pathplus: PathPlus):
+	second_repo = Repo.init(tmp_pathplus / "second", mkdir=True)
+	(second_repo.path / "repo_helper.yml").write_text(example_config)
+
+	for repo in (temp_repo, second_repo):
+		write_release_files(repo.path)
+
+	(second_repo.path / "pyproject.toml").unlink()
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner(mix_stderr=False)
+
+		with pytest.raises(FileNotFoundError, match="pyproject.toml"):
+			runner.invoke(minor, args=["--repo", temp_repo.path, "--repo", second_repo.path])
+
+	# Neither repository has been changed
+	assert 'version = "0.0.1"' in (temp_repo.path / "pyproject.toml").read_text()
+	assert "current_version = 0.0.1" in (temp_repo.path / ".bumpversion.cfg").read_text()
+	assert not get_tags(temp_repo)
+
+
+def test_plan_duplicate_files(temp_repo):
+	write_release_files(temp_repo.path)
+
+	with (temp_repo.path / ".bumpversion.cfg").open('a') as fp:
+		fp.write("# Released as 0.0.1\n\n[bumpversion:file:.bumpversion.cfg]\n\n[bumpversion:file:./pyproject.toml]\n")
+
+	bumper = Bumper(temp_repo.path, force=True)
+	plan = bumper.plan(bumper.next_version("minor"))
+
+	filenames = [edit.filename for edit in plan.edits]
+	assert len(filenames) == len(set(filenames))
+
+	# The edit to .bumpversion.cfg includes both the new current version and the file's own search and replace.
+	bumpversion_cfg = [edit for edit in plan.edits if edit.filename.name == ".bumpversion.cfg"][0]
+	assert "current_version = 0.1.0" in bumpversion_cfg.content
+	assert "# Released as 0.1.0" in bumpversion_cfg.content
+
+	apply_edits(plan.edits)
+	assert 'version = "0.1.0"' in (temp_repo.path / "pyproject.toml").read_text()
+
+
+def test_bump_version_for_file(temp_repo):
+	write_release_files(temp_repo.path)
+
+	bumper = Bumper(temp_repo.path, force=True)
+	bumper.bump_version_for_file("pyproject.toml", {"search": "0.0.1", "replace": "0.1.0"})
+
+	assert 'version = "0.1.0"' in (temp_repo.path / "pyproject.toml").read_text()
+	assert "current_version = 0.0.1" in (temp_repo.path / ".bumpversion.cfg").read_text()
+
+
+def test_apply_edits(tmp_pathplus: PathPlus, monkeypatch):
+	edits = []
+
+	for filename in ("a.txt", "b.txt", "c.txt"):
+		(tmp_pathplus / filename).write_text("0.0.1")
+		edits.append(FileEdit(tmp_pathplus / filename, "0.0.1", "0.1.0"))
+
+	(tmp_pathplus / "c.txt").chmod(0o755)
+
+	apply_edits(edits)
+
+	assert [edit.filename.read_text() for edit in edits] == ["0.1.0", "0.1.0", "0.1.0"]
+	assert (tmp_pathplus / "c.txt").stat().st_mode & 0o777 == 0o755
+	assert sorted(os.listdir(tmp_pathplus)) == ["a.txt", "b.txt", "c.txt"]
+
+
+def test_apply_edits_rollback(tmp_pathplus: PathPlus, monkeypatch):
+	edits = []
+
+	for filename in ("a.txt", "b.txt", "c.txt"):
+		(tmp_pathplus / filename).write_text("0.0.1")
+		edits.append(FileEdit(tmp_pathplus / filename, "0.0.1", "0.1.0"))
+
+	replace = os.replace
+
+	def failing_replace(src, dst):
+		if os.path.basename(dst) == "c.txt":
+			raise OSError("Disk full")
+		replace(src, dst)
+
+	monkeypatch.setattr(os, "replace", failing_replace)
+
+	with pytest.raises(OSError, match="Disk full"):
+		apply_edits(edits)
+
+	assert [edit.filename.read_text() for edit in edits] == ["0.0.1", "0.0.1", "0.0.1"]
+	assert sorted(os.listdir(tmp_pathplus)) == ["a.txt", "b.txt", "c.txt"]
+
+
 #
 # def test_release_coward(temp_repo, file_regression: FileRegressionFixture):
 #
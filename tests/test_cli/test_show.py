@@ -1,3 +1,7 @@
+# stdlib
+import json
+from datetime import datetime
+
 # 3rd party
 import pytest
 from coincidence.regressions import check_file_regression
@@ -5,8 +9,10 @@ from coincidence.selectors import min_version, not_pypy, only_version
 from consolekit.testing import CliRunner, Result
 from domdf_python_tools.paths import PathPlus, in_directory
 from pytest_regressions.file_regression import FileRegressionFixture
+from southwark.log import Log as SouthwarkLog
 
 # this package
+from repo_helper._log import Log
 from repo_helper.cli.commands import show
 from tests import pypy_windows_dulwich
 
@@ -159,3 +165,87 @@ def test_log(tmp_repo, file_regression: FileRegressionFixture):
 
 	assert result.exit_code == 0
 	result.check_stdout(file_regression)
+
+
+@pypy_windows_dulwich
+@pytest.mark.parametrize(
+		"kwargs",
+		[
+				pytest.param({}, id="all"),
+				pytest.param({"max_entries": 2}, id="max_entries"),
+				pytest.param({"reverse": True}, id="reverse"),
+				pytest.param({"colour": False}, id="no_colour"),
+				pytest.param({"from_tag": "v2.0.0"}, id="from_tag"),
+				pytest.param({"from_date": datetime(2020, 1, 1)}, id="from_date"),
+				]
+		)
+def test_iter_log(tmp_repo, kwargs):
+	assert ''.join(Log(tmp_repo).iter_log(**kwargs)) == SouthwarkLog(tmp_repo).log(**kwargs)
+
+
+@pypy_windows_dulwich
+def test_iter_log_from_tag_reverse(tmp_repo):
+	entries = [entry.lstrip('\n') for entry in Log(tmp_repo).iter_log(from_tag="v2.0.0")]
+	assert len(entries) == 2
+	assert ''.join(Log(tmp_repo).iter_log(from_tag="v2.0.0", reverse=True)) == '\n'.join(reversed(entries))
+
+
+@pypy_windows_dulwich
+def test_iter_log_lazy(tmp_repo, monkeypatch):
+	formatted = []
+	log = Log(tmp_repo)
+	format_commit = log.format_commit
+
+	def record_format_commit(commit):
+		formatted.append(commit.id)
+		return format_commit(commit)
+
+	monkeypatch.setattr(log, "format_commit", record_format_commit)
+
+	entries = log.iter_log()
+	assert not formatted
+
+	next(entries)
+	assert len(formatted) == 1
+
+
+@pypy_windows_dulwich
+def test_iter_log_errors(tmp_repo):
+	with pytest.raises(ValueError, match="No such tag 'v3.0.0'"):
+		Log(tmp_repo).iter_log(from_tag="v3.0.0")
+
+	with pytest.raises(ValueError, match="'from_date' and 'from_tag' are exclusive."):
+		Log(tmp_repo).iter_log(from_tag="v2.0.0", from_date=datetime(2020, 1, 1))
+
+
+@pypy_windows_dulwich
+def test_log_no_pager(tmp_repo):
+	with in_directory(tmp_repo):
+		runner = CliRunner()
+		result: Result = runner.invoke(show.log, catch_exceptions=False, args=["--no-pager", "--from-tag", "v2.0.0"])
+
+	assert result.exit_code == 0
+	assert result.stdout == SouthwarkLog(tmp_repo).log(from_tag="v2.0.0", colour=False) + '\n'
+
+
+@not_pypy("Output differs on PyPy.")
+def test_requirements_formats():
+	with in_directory(show_directories[0]):
+		runner = CliRunner()
+		result: Result = runner.invoke(
+				show.requirements, catch_exceptions=False, args=["--format", "json", "--no-venv", "-d", "1"]
+				)
+		assert result.exit_code == 0
+
+		data = json.loads(result.stdout)
+		assert data["requirement"].startswith("repo_helper==")
+		assert "click==7.1.2" in [node["requirement"] for node in data["requirements"]]
+		assert all(not node["requirements"] for node in data["requirements"])
+
+		result = runner.invoke(show.requirements, catch_exceptions=False, args=["-f", "dot", "--no-venv", "-d", "1"])
+		assert result.exit_code == 0
+
+		lines = result.stdout.splitlines()
+		assert lines[0] == "digraph requirements {"
+		assert '\t"repo_helper" -> "click" [label="==7.1.2"];' in lines
+		assert lines[-1] == '}'
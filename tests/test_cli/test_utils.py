@@ -0,0 +1,40 @@
+# 3rd party
+import pre_commit.main  # type: ignore
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from repo_helper.cli.utils import install_pre_commit_hook
+
+
+def test_install_pre_commit_hook(temp_empty_repo, monkeypatch):
+	repo_path = PathPlus(temp_empty_repo.path)
+	hook = repo_path / ".git" / "hooks" / "pre-commit"
+	(repo_path / ".pre-commit-config.yaml").write_text("repos: []\n")
+
+	calls = []
+	original_main = pre_commit.main.main
+
+	def main(argv):
+		calls.append(argv)
+		return original_main(argv)
+
+	monkeypatch.setattr(pre_commit.main, "main", main)
+
+	assert install_pre_commit_hook(repo_path)
+	assert hook.is_file()
+	assert calls == [["install"]]
+
+	# Nothing has changed, so pre-commit is not run again.
+	assert not install_pre_commit_hook(repo_path)
+	assert calls == [["install"]]
+
+	(repo_path / ".pre-commit-config.yaml").write_text("repos: []\nexclude: ^tests/\n")
+	assert install_pre_commit_hook(repo_path)
+	assert not install_pre_commit_hook(repo_path)
+	assert len(calls) == 2
+
+	# The hook has been overwritten by another tool.
+	hook.write_text("#!/bin/sh\nexit 0\n")
+	assert install_pre_commit_hook(repo_path)
+	assert "pre-commit" in hook.read_text()
+	assert len(calls) == 3
@@ -1,9 +1,13 @@
+# stdlib
+import os
+
 # 3rd party
 import pytest
 from pytest_regressions.data_regression import DataRegressionFixture
 
 # this package
-from repo_helper.configuration import get_tox_python_versions, parse_yaml
+from repo_helper import configuration
+from repo_helper.configuration import RepoHelperParser, get_tox_python_versions, migrate_config, parse_yaml
 
 
 @pytest.mark.parametrize(
@@ -25,3 +29,80 @@ def test_get_tox_python_versions(data_regression: DataRegressionFixture, python_
 def test_parse_yaml(tmp_pathplus, data_regression, example_config):
 	(tmp_pathplus / "repo_helper.yml").write_text(example_config)
 	data_regression.check(parse_yaml(tmp_pathplus))
+
+
+@pytest.fixture()
+def config_cache(tmp_pathplus, monkeypatch):
+	monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_pathplus / "cache"))
+	monkeypatch.setattr(configuration, "_config_cache", {})
+	return tmp_pathplus / "cache" / "repo_helper" / "config"
+
+
+def test_parse_yaml_no_side_effects(tmp_pathplus, example_config, config_cache):
+	(tmp_pathplus / "git_helper.yml").write_text(f"use_travis: true\n{example_config}\n\n\n")
+
+	assert parse_yaml(tmp_pathplus)["modname"] == "repo_helper_demo"
+	assert (tmp_pathplus / "git_helper.yml").read_text() == f"use_travis: true\n{example_config}\n\n\n"
+	assert not (tmp_pathplus / "repo_helper.yml").exists()
+
+
+def test_migrate_config(tmp_pathplus, example_config):
+	(tmp_pathplus / "git_helper.yml").write_text(f"use_travis: true\n{example_config}\n\n\n")
+
+	assert migrate_config(tmp_pathplus)
+	assert not (tmp_pathplus / "git_helper.yml").exists()
+	lines = (tmp_pathplus / "repo_helper.yml").read_lines()
+	assert not [line for line in lines if line.startswith(("use_travis", "travis_pypi_secure"))]
+
+	os.utime(tmp_pathplus / "repo_helper.yml", ns=(0, 0))
+	assert not migrate_config(tmp_pathplus)
+	assert (tmp_pathplus / "repo_helper.yml").stat().st_mtime_ns == 0
+
+
+def test_parse_yaml_cached(tmp_pathplus, example_config, config_cache, monkeypatch):
+	(tmp_pathplus / "repo_helper.yml").write_text(example_config)
+	expected = parse_yaml(tmp_pathplus)
+
+	assert len(list(config_cache.iterdir())) == 1
+
+	def parse(*args, **kwargs):
+		raise AssertionError("The configuration was parsed again")
+
+	with monkeypatch.context() as m:
+		m.setattr(RepoHelperParser, "parse", parse)
+
+		# From memory
+		assert parse_yaml(tmp_pathplus) == expected
+
+		# From disk
+		m.setattr(configuration, "_config_cache", {})
+		assert parse_yaml(tmp_pathplus) == expected
+
+	# The returned values are not shared between calls
+	parse_yaml(tmp_pathplus)["classifiers"].append("Foo")
+	assert parse_yaml(tmp_pathplus) == expected
+
+	# Creating a file which affects the configuration invalidates the cache
+	(tmp_pathplus / "repo_helper_demo").mkdir()
+	(tmp_pathplus / "repo_helper_demo" / "py.typed").touch()
+	assert "Typing :: Typed" in parse_yaml(tmp_pathplus)["classifiers"]
+
+	# As does changing the configuration file
+	(tmp_pathplus / "repo_helper.yml").write_text(example_config.replace("0.0.1", "0.0.2"))
+	assert parse_yaml(tmp_pathplus)["version"] == "0.0.2"
+
+	# The new configuration replaces the old one in the cache
+	assert len(list(config_cache.iterdir())) == 1
+
+
+def test_parse_yaml_cached_patched_validator(tmp_pathplus, example_config, config_cache, fixed_version_number):
+	(tmp_pathplus / "repo_helper.yml").write_text(example_config)
+	assert parse_yaml(tmp_pathplus)["version"] == "2020.12.18"
+
+
+def test_parse_yaml_no_disk_cache(tmp_pathplus, example_config, config_cache, monkeypatch):
+	monkeypatch.setenv("REPO_HELPER_NO_CONFIG_CACHE", '1')
+	(tmp_pathplus / "repo_helper.yml").write_text(example_config)
+	parse_yaml(tmp_pathplus)
+
+	assert not config_cache.exists()
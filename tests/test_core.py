@@ -13,7 +13,8 @@ from southwark import status
 
 # this package
 from repo_helper.cli.utils import run_repo_helper
-from repo_helper.core import RepoHelper
+from repo_helper.core import RepoHelper, order_managers, run_managers
+from repo_helper.files import Management
 
 
 def test_via_run_repo_helper(
@@ -92,6 +93,126 @@ def test_via_Repo_class(
 	assert capsys.readouterr().err == ''
 
 
+def test_via_Repo_class_jobs(temp_repo, example_config):
+
+	with in_directory(temp_repo.path):
+		(temp_repo.path / "repo_helper.yml").write_text(example_config)
+		(temp_repo.path / "requirements.txt").touch()
+		(temp_repo.path / "tests").maybe_make()
+		(temp_repo.path / "tests" / "requirements.txt").touch()
+		(temp_repo.path / "README.rst").touch()
+		(temp_repo.path / "doc-source").mkdir()
+		(temp_repo.path / "doc-source" / "index.rst").touch()
+		(temp_repo.path / ".pre-commit-config.yaml").touch()
+
+		rh = RepoHelper(temp_repo.path)
+		rh.load_settings()
+		html_theme_options = dict(rh.templates.globals["html_theme_options"])
+		serial_files = rh.run()
+		serial_contents = {f: (temp_repo.path / f).read_bytes() for f in serial_files if (temp_repo.path / f).is_file()}
+
+		assert rh.run(jobs=4) == serial_files
+
+		# The managers must not modify the shared globals.
+		assert rh.templates.globals["html_theme_options"] == html_theme_options
+
+	for filename, content in serial_contents.items():
+		assert (temp_repo.path / filename).read_bytes() == content
+
+
+def test_via_Repo_class_cache(temp_repo, example_config):
+
+	def run_cached():
+		rh = RepoHelper(temp_repo.path)
+		rh.load_settings()
+		return rh.run(cache=True)
+
+	with in_directory(temp_repo.path):
+		(temp_repo.path / "repo_helper.yml").write_text(example_config)
+		(temp_repo.path / "requirements.txt").touch()
+		(temp_repo.path / "README.rst").touch()
+		(temp_repo.path / "doc-source").mkdir()
+		(temp_repo.path / "doc-source" / "index.rst").touch()
+
+		managed_files = run_cached()
+
+		assert (temp_repo.path / ".repo_helper_cache" / "manifest.json").is_file()
+
+		pylintrc = temp_repo.path / ".pylintrc"
+		pylintrc_content = pylintrc.read_text()
+		style_yapf_mtime = (temp_repo.path / ".style.yapf").stat().st_mtime_ns
+
+		# Unchanged; nothing is rewritten
+		assert run_cached() == managed_files
+		assert (temp_repo.path / ".style.yapf").stat().st_mtime_ns == style_yapf_mtime
+
+		# Changed output
+		pylintrc.write_text("[MASTER]\n")
+		assert run_cached() == managed_files
+		assert pylintrc.read_text() == pylintrc_content
+		assert (temp_repo.path / ".style.yapf").stat().st_mtime_ns == style_yapf_mtime
+
+		# Changed input
+		(temp_repo.path / "requirements.txt").write_text("domdf-python-tools>=2.0.0\n")
+		assert run_cached() == managed_files
+		assert (temp_repo.path / ".style.yapf").stat().st_mtime_ns != style_yapf_mtime
+
+
+def _make_management():
+	registry = Management()
+	calls = []
+
+	@registry.register("c", run_after=["b"])
+	def c(repo_path, templates):
+		calls.append('c')
+		return ['c']
+
+	@registry.register('a')
+	def a(repo_path, templates):
+		calls.append('a')
+		return ['a']
+
+	@registry.register('b', run_after=['a', "not_registered"])
+	def b(repo_path, templates):
+		calls.append('b')
+		return ['b']
+
+	return registry, calls
+
+
+def test_order_managers():
+	registry, calls = _make_management()
+	managers = [entry[0] for entry in registry]
+
+	assert [f.__name__ for f in order_managers(managers)] == ['a', 'b', 'c']
+	assert [f.__name__ for f in order_managers(managers[:2])] == ['c', 'a']
+
+
+@pytest.mark.parametrize("jobs", [0, 1, 4])
+def test_run_managers(jobs: int):
+	registry, calls = _make_management()
+	managers = [entry[0] for entry in registry]
+
+	outputs = run_managers(managers, None, None, jobs=jobs)  # type: ignore
+	assert list(outputs.values()) == [['a'], ['b'], ['c']]
+	assert calls == ['a', 'b', 'c']
+
+
+def test_order_managers_circular():
+	registry = Management()
+
+	@registry.register('a', run_after=['b'])
+	def a(repo_path, templates):
+		return []
+
+	@registry.register('b', run_after=['a'])
+	def b(repo_path, templates):
+		return []
+
+	with pytest.raises(ValueError, match="Circular dependency between managers 'a', 'b'"):
+		order_managers([a, b])
+
+
 def test_managed_message(temp_repo):
 	rh = RepoHelper(temp_repo.path)
 	managed_message = "This file is managed by 'repo_helper'. Don't edit it directly."
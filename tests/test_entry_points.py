@@ -0,0 +1,75 @@
+# stdlib
+import json
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from repo_helper import _entry_points
+from repo_helper._entry_points import EntryPoint, distributions_fingerprint, get_entry_points, load_entry_points
+
+
+@pytest.fixture()
+def cache_dir(tmp_pathplus: PathPlus, monkeypatch) -> PathPlus:
+	monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_pathplus))
+	monkeypatch.setattr(_entry_points, "_index", None)
+	return tmp_pathplus / "repo_helper"
+
+
+def test_get_entry_points(cache_dir: PathPlus):
+	entry_points = get_entry_points("console_scripts")
+	assert EntryPoint("pytest", "pytest", "pytest:console_main") in entry_points
+
+	cached = json.loads((cache_dir / "entry_points.json").read_text())
+	assert cached["fingerprint"] == distributions_fingerprint()
+	assert ["pytest", "pytest", "pytest:console_main"] in cached["groups"]["console_scripts"]
+
+
+def test_get_entry_points_from_cache(cache_dir: PathPlus, monkeypatch):
+	cache_dir.mkdir()
+	(cache_dir / "entry_points.json").dump_json({
+			"version": _entry_points._cache_version,
+			"fingerprint": distributions_fingerprint(),
+			"groups": {
+					"my_group": [
+							["repo_helper", "main", "repo_helper.__main__:main"],
+							["other", "main", "repo_helper.__main__:main"],
+							]
+					},
+			})
+
+	assert get_entry_points("my_group") == [
+			EntryPoint("repo_helper", "main", "repo_helper.__main__:main"),
+			EntryPoint("other", "main", "repo_helper.__main__:main"),
+			]
+	assert get_entry_points("console_scripts") == []
+
+	# this package
+	from repo_helper.__main__ import main
+
+	# Entry points with the same name from different distributions are all loaded.
+	assert load_entry_points("my_group") == [main, main]
+	assert load_entry_points("my_group", lambda obj: False) == []
+
+
+def test_get_entry_points_stale_cache(cache_dir: PathPlus):
+	cache_dir.mkdir()
+	(cache_dir / "entry_points.json").dump_json({
+			"version": _entry_points._cache_version,
+			"fingerprint": "0000",
+			"groups": {"my_group": [["repo_helper", "main", "repo_helper.__main__:main"]]},
+			})
+
+	assert get_entry_points("my_group") == []
+	assert EntryPoint("pytest", "pytest", "pytest:console_main") in get_entry_points("console_scripts")
+
+
+def test_get_entry_points_old_cache(cache_dir: PathPlus):
+	cache_dir.mkdir()
+	(cache_dir / "entry_points.json").dump_json({
+			"fingerprint": distributions_fingerprint(),
+			"groups": {"my_group": {"main": "repo_helper.__main__:main"}},
+			})
+
+	assert get_entry_points("my_group") == []
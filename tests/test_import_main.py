@@ -1,6 +1,123 @@
-# Test that __main__ can be imported
+# Test that __main__ can be imported, and that doing so is fast and only imports what is needed
+
+# stdlib
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+# this package
+import repo_helper
 
 
 def test_import_main():
 	# this package
 	import repo_helper.__main__  # noqa: F401
+
+
+_script = """
+import sys
+from repo_helper.__main__ import main
+
+try:
+	main()
+except SystemExit:
+	pass
+
+sys.stderr.write("\\n" + " ".join(sys.modules))
+"""
+
+
+def _run(*args: str) -> str:
+	env = dict(os.environ)
+	env["PYTHONPATH"] = os.pathsep.join([os.path.dirname(os.path.dirname(repo_helper.__file__)), *sys.path])
+
+	process = subprocess.run(
+			[sys.executable, "-X", "importtime", "-c", _script, *args],
+			stdout=subprocess.PIPE,
+			stderr=subprocess.PIPE,
+			universal_newlines=True,
+			env=env,
+			)
+
+	return process.stderr
+
+
+def _loaded_modules(*args: str) -> List[str]:
+	"""
+	Run ``repo_helper`` in a new interpreter and return the names of the modules it imported.
+	"""
+
+	return _run(*args).splitlines()[-1].split()
+
+
+def _import_times(*args: str) -> Dict[str, int]:
+	"""
+	Run ``repo_helper`` with ``python -X importtime`` and
+	return a mapping of module names to their cumulative import times in microseconds.
+	"""  # noqa: D400
+
+	times = {}
+
+	for line in _run(*args).splitlines():
+		if line.startswith("import time:") and "cumulative" not in line:
+			_, cumulative, name = line[len("import time:"):].split('|')
+			times[name.strip()] = int(cumulative)
+
+	return times
+
+
+heavy_modules: List[str] = [
+		"apeye",
+		"dulwich",
+		"isort",
+		"jinja2",
+		"pre_commit",
+		"requests",
+		"southwark",
+		"yapf_isort",
+		"repo_helper.core",
+		"repo_helper.cli.commands.add",
+		"repo_helper.cli.commands.init",
+		"repo_helper.cli.commands.show",
+		]
+
+
+def test_deferred_imports():
+	modules = _loaded_modules("--version")
+
+	assert "repo_helper.cli" in modules
+	assert not [module for module in heavy_modules if module in modules]
+
+
+def test_lazy_command():
+	modules = _loaded_modules("show", "--help")
+
+	assert "repo_helper.cli.commands.show" in modules
+	assert "repo_helper.cli.commands.add" not in modules
+	assert "repo_helper.core" not in modules
+
+
+def test_own_modules():
+	modules = _loaded_modules("--version")
+
+	# Only the modules needed to set up the command line interface are imported.
+	assert sorted(module for module in modules if module.startswith("repo_helper")) == [
+			"repo_helper",
+			"repo_helper.__main__",
+			"repo_helper.cli",
+			]
+
+
+def test_import_time_budget():
+
+	def own_time() -> int:
+		times = _import_times("--version")
+		# consolekit's own import time is dominated by the markdown parser it uses for help text,
+		# which is outside of repo_helper's control.
+		return times["repo_helper.__main__"] - times.get("consolekit", 0)
+
+	# The budget is several times the usual import time, and the fastest of a few runs is used,
+	# so a busy machine does not cause failures but importing something heavy again does.
+	fastest = min(own_time() for _ in range(3))
+	assert fastest < 250_000, f"Importing repo_helper took {fastest / 1000:.0f} ms"
@@ -0,0 +1,169 @@
+# stdlib
+import os
+import re
+from typing import List
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from repo_helper._manifest import ManifestRules, translate_pattern
+
+
+@pytest.fixture()
+def tree(tmp_pathplus: PathPlus) -> PathPlus:
+	for filename in [
+			"README.rst",
+			"setup.py",
+			"pkg/__init__.py",
+			"pkg/data/a.txt",
+			"pkg/data/b.json",
+			"pkg/data/nested/c.txt",
+			"pkg/__pycache__/__init__.cpython-38.pyc",
+			"docs/index.rst",
+			"docs/_build/index.html",
+			".git/HEAD",
+			]:
+		(tmp_pathplus / filename).parent.maybe_make(parents=True)
+		(tmp_pathplus / filename).touch()
+
+	return tmp_pathplus
+
+
+@pytest.mark.parametrize(
+		"pattern, matches, non_matches",
+		[
+				("*.txt", ["a.txt", ".txt"], ["a/b.txt", "a.txt.bak"]),
+				("pkg/*.py", ["pkg/a.py"], ["pkg/a/b.py", "a.py"]),
+				("pkg/**/*.py", ["pkg/a.py", "pkg/a/b/c.py"], ["a.py"]),
+				("?.py", ["a.py"], ["ab.py"]),
+				("[ab].py", ["a.py", "b.py"], ["c.py"]),
+				("[!ab].py", ["c.py"], ["a.py"]),
+				("./a+b.py", ["a+b.py"], ["aab.py"]),
+				]
+		)
+def test_translate_pattern(pattern, matches, non_matches):
+	regex = translate_pattern(pattern)
+
+	for filename in matches:
+		assert re.fullmatch(regex, filename), filename
+	for filename in non_matches:
+		assert not re.fullmatch(regex, filename), filename
+
+
+def _files(tree: PathPlus, *entries: str):
+	return [filename for filename, rule in ManifestRules(entries).iter_files(tree)]
+
+
+def test_include(tree: PathPlus):
+	assert _files(tree, "include README.rst setup.py") == ["README.rst", "setup.py"]
+	assert _files(tree, "include pkg/data/*.txt") == ["pkg/data/a.txt"]
+	assert _files(tree, "include pkg/**/*.txt") == ["pkg/data/a.txt", "pkg/data/nested/c.txt"]
+
+
+def test_recursive_include(tree: PathPlus):
+	assert _files(tree, "recursive-include pkg *.txt *.json") == [
+			"pkg/data/a.txt",
+			"pkg/data/b.json",
+			"pkg/data/nested/c.txt",
+			]
+	assert _files(tree, "recursive-include pkg *.txt", "recursive-exclude pkg/data/nested *") == ["pkg/data/a.txt"]
+
+
+def test_global(tree: PathPlus):
+	assert _files(tree, "global-include *.rst") == ["README.rst", "docs/index.rst"]
+	assert _files(tree, "global-include *.rst", "global-exclude README.*") == ["docs/index.rst"]
+
+
+def test_graft_prune(tree: PathPlus):
+	assert _files(tree, "graft pkg") == [
+			"pkg/__init__.py",
+			"pkg/data/a.txt",
+			"pkg/data/b.json",
+			"pkg/data/nested/c.txt",
+			]
+	assert _files(tree, "graft pkg", "prune pkg/data") == ["pkg/__init__.py"]
+	assert _files(tree, "graft docs", "prune docs/_build") == ["docs/index.rst"]
+
+
+def test_last_match_wins(tree: PathPlus):
+	assert _files(tree, "graft pkg/data", "exclude pkg/data/*.txt", "include pkg/data/a.txt") == [
+			"pkg/data/a.txt",
+			"pkg/data/b.json",
+			"pkg/data/nested/c.txt",
+			]
+
+
+def test_should_walk():
+	rules = ManifestRules(["recursive-include pkg/data *", "graft docs", "prune docs/_build"])
+
+	assert rules.should_walk("pkg")
+	assert rules.should_walk("pkg/data")
+	assert rules.should_walk("pkg/data/nested")
+	assert not rules.should_walk("tests")
+	assert rules.should_walk("docs")
+	assert not rules.should_walk("docs/_build")
+	assert not rules.should_walk("docs/_build/html")
+
+
+def test_should_walk_fixed_depth():
+	rules = ManifestRules(["include LICENSE", "include pkg/__init__.py", "include pkg/*/data.json"])
+
+	assert rules.should_walk("pkg")
+	assert rules.should_walk("pkg/data")
+	assert not rules.should_walk("pkg/data/nested")
+	assert not rules.should_walk(".tox")
+	assert not rules.should_walk(".tox/py/lib")
+	assert not rules.should_walk("venv")
+
+	rules = ManifestRules(["include LICENSE", "global-include *.txt"])
+	assert rules.should_walk(".tox/py/lib")
+
+
+def test_root_rule_does_not_walk(tree: PathPlus, monkeypatch):
+	for filename in ["LICENSE", ".tox/py/lib/site.py", "venv/lib/site.py"]:
+		(tree / filename).parent.maybe_make(parents=True)
+		(tree / filename).touch()
+
+	scanned: List[str] = []
+	scandir = os.scandir
+
+	def record_scandir(path):
+		scanned.append(PathPlus(path).relative_to(tree).as_posix())
+		return scandir(path)
+
+	monkeypatch.setattr(os, "scandir", record_scandir)
+
+	assert _files(tree, "include LICENSE", "recursive-include pkg *.py") == ["LICENSE", "pkg/__init__.py"]
+	assert scanned == ['.', "pkg", "pkg/data", "pkg/data/nested"]
+
+
+def test_clean(tree: PathPlus):
+	rules = ManifestRules()
+	rules.add("recursive-include pkg *.py", clean=True)
+	rules.add("include README.rst")
+
+	assert [(filename, rule.clean) for filename, rule in rules.iter_files(tree)] == [
+			("README.rst", False),
+			("pkg/__init__.py", True),
+			]
+
+
+@pytest.mark.parametrize(
+		"entry, message",
+		[
+				("include", "Not enough arguments for 'include' in manifest entry 'include'."),
+				("recursive-include pkg", "Not enough arguments for 'recursive-include' in manifest entry"),
+				]
+		)
+def test_invalid_entry(entry: str, message: str):
+	with pytest.raises(ValueError, match=message):
+		ManifestRules([entry])
+
+
+def test_unknown_directive(tree: PathPlus):
+	message = "Ignored unknown directive 'recursive-include:' in manifest entry 'recursive-include: pkg \\*'."
+
+	with pytest.warns(UserWarning, match=message):
+		assert _files(tree, "recursive-include: pkg *", "include README.rst") == ["README.rst"]
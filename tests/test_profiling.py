@@ -0,0 +1,99 @@
+# stdlib
+import sys
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from repo_helper.core import run_managers
+from repo_helper.files import Management
+from repo_helper.profiling import Profiler, get_profiler, span
+
+requires_audit_hooks = pytest.mark.skipif(
+		not hasattr(sys, "addaudithook"),
+		reason="File access can only be traced on Python 3.8+",
+		)
+
+
+def test_span_inactive():
+	assert get_profiler() is None
+
+	with span("foo", "bar"):
+		pass
+
+	profiler = Profiler()
+
+	with profiler.activate():
+		assert get_profiler() is profiler
+
+	assert get_profiler() is None
+	assert profiler.spans == []
+
+
+@requires_audit_hooks
+def test_span_files(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "input.txt").write_text("Hello World")
+	profiler = Profiler()
+
+	with profiler.activate():
+		with span("copy", "manager"):
+			content = (tmp_pathplus / "input.txt").read_text()
+			(tmp_pathplus / "output.txt").write_text(content * 2)
+			(tmp_pathplus / "output.txt").read_text()
+
+	assert len(profiler.spans) == 1
+	assert profiler.spans[0].name == "copy"
+	assert profiler.spans[0].category == "manager"
+	assert profiler.spans[0].files_read == 1
+	assert profiler.spans[0].files_written == 1
+	assert profiler.spans[0].bytes_written == 22
+	assert profiler.spans[0].wall_time >= 0
+	assert profiler.spans[0].cpu_time >= 0
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_run_managers_profiled(jobs: int):
+	registry = Management()
+
+	@registry.register('a')
+	def a(repo_path, templates):
+		return ['a']
+
+	@registry.register('b', run_after=['a'])
+	def b(repo_path, templates):
+		return ['b']
+
+	profiler = Profiler()
+
+	with profiler.activate():
+		run_managers([a, b], None, None, jobs=jobs)  # type: ignore
+
+	assert [s.name for s in profiler.spans] == ['a', 'b']
+	assert {s.category for s in profiler.spans} == {"manager"}
+
+	table = profiler.format_table()
+	assert table.splitlines()[0].split() == [
+			"Name", "Category", "Wall", "(ms)", "CPU", "(ms)", "Read", "Written", "Bytes", "written"
+			]
+	assert len(table.splitlines()) == 4
+
+
+def test_write_trace(tmp_pathplus: PathPlus):
+	profiler = Profiler()
+
+	with profiler.activate():
+		with span("parse_yaml", "config"):
+			pass
+		with span("make_tox", "manager"):
+			pass
+
+	profiler.write_trace(tmp_pathplus / "trace.json")
+	events = (tmp_pathplus / "trace.json").load_json()["traceEvents"]
+
+	assert [(e["name"], e["cat"], e["ph"]) for e in events] == [
+			("parse_yaml", "config", 'X'),
+			("make_tox", "manager", 'X'),
+			]
+	assert events[0]["ts"] <= events[1]["ts"]
+	assert set(events[0]["args"]) == {"cpu_time_ms", "files_read", "files_written", "bytes_written"}
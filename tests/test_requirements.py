@@ -0,0 +1,79 @@
+# stdlib
+import json
+
+# 3rd party
+import pytest
+from shippinglabel.requirements import list_requirements
+
+# this package
+from repo_helper._requirements import DistributionIndex, tree_to_dot, tree_to_json
+
+
+@pytest.mark.parametrize("name", ["click", "apeye>=0.4.0", "domdf-python-tools", "pytest", "not-installed"])
+@pytest.mark.parametrize("depth", [0, 1, 2, -1])
+def test_list_requirements(name: str, depth: int):
+	index = DistributionIndex()
+
+	# Once from the index, and once from the cache.
+	assert index.list_requirements(name, depth) == list(list_requirements(name, depth))
+	assert index.list_requirements(name, depth) == list(list_requirements(name, depth))
+
+
+def test_list_requirements_cycle(tmp_pathplus):
+	for name, requires in [("foo", ["bar"]), ("bar", ["baz>=1.0", "foo"]), ("baz", [])]:
+		dist_info = tmp_pathplus / f"{name}-1.0.0.dist-info"
+		dist_info.mkdir()
+		(dist_info / "METADATA").write_lines([
+				"Metadata-Version: 2.1",
+				f"Name: {name}",
+				"Version: 1.0.0",
+				*(f"Requires-Dist: {requirement}" for requirement in requires),
+				])
+
+	foo = ["bar", ["baz>=1.0", "foo"]]
+	bar = ["baz>=1.0", "foo", ["bar"]]
+
+	index = DistributionIndex([str(tmp_pathplus)])
+	assert index.list_requirements("foo", depth=-1) == foo
+	assert index.list_requirements("bar", depth=-1) == bar
+
+	# The result does not depend on the order the requirements are resolved in.
+	index = DistributionIndex([str(tmp_pathplus)])
+	assert index.list_requirements("bar", depth=-1) == bar
+	assert index.list_requirements("foo", depth=-1) == foo
+	assert index.list_requirements("bar", depth=-1) == bar
+
+
+tree = ["apeye>=0.4.0", ["appdirs>=1.4.4", "requests>=2.24.0", ["idna<4,>=2.5"]], "click>=7.1.2"]
+
+
+def test_tree_to_json():
+	assert json.loads(tree_to_json("repo_helper==2021.3.12", tree)) == {
+			"requirement": "repo_helper==2021.3.12",
+			"requirements": [
+					{
+							"requirement": "apeye>=0.4.0",
+							"requirements": [
+									{"requirement": "appdirs>=1.4.4", "requirements": []},
+									{
+											"requirement": "requests>=2.24.0",
+											"requirements": [{"requirement": "idna<4,>=2.5", "requirements": []}],
+											},
+									],
+							},
+					{"requirement": "click>=7.1.2", "requirements": []},
+					],
+			}
+
+
+def test_tree_to_dot():
+	assert tree_to_dot("repo_helper==2021.3.12", [*tree, "requests"]).splitlines() == [
+			"digraph requirements {",
+			'\t"repo_helper" -> "apeye" [label=">=0.4.0"];',
+			'\t"apeye" -> "appdirs" [label=">=1.4.4"];',
+			'\t"apeye" -> "requests" [label=">=2.24.0"];',
+			'\t"requests" -> "idna" [label="<4,>=2.5"];',
+			'\t"repo_helper" -> "click" [label=">=7.1.2"];',
+			'\t"repo_helper" -> "requests";',
+			'}',
+			]
@@ -0,0 +1,71 @@
+# 3rd party
+import jinja2
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from repo_helper import templates
+from repo_helper.templates import SharedBytecodeCache, get_bytecode_cache, make_environment, template_dir
+
+
+def make_cached_environment(bytecode_cache: SharedBytecodeCache, searchpath: PathPlus) -> jinja2.Environment:
+	return jinja2.Environment(
+			loader=jinja2.FileSystemLoader(str(searchpath)),
+			bytecode_cache=bytecode_cache,
+			)
+
+
+def test_make_environment(tmp_pathplus: PathPlus, monkeypatch):
+	monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_pathplus))
+	monkeypatch.delenv("REPO_HELPER_NO_BYTECODE_CACHE", raising=False)
+	monkeypatch.setattr(templates, "_bytecode_cache", None)
+
+	environment = make_environment()
+	assert isinstance(environment.loader, jinja2.FileSystemLoader)
+	assert environment.loader.searchpath == [str(template_dir)]
+	assert environment.undefined is jinja2.StrictUndefined
+	assert environment.bytecode_cache is get_bytecode_cache()
+
+	environment.get_template("CONTRIBUTING.rst")
+	assert list((tmp_pathplus / "repo_helper" / "jinja2").iterdir())
+
+	# Globals are not shared between environments
+	environment.globals["foo"] = "bar"
+	assert "foo" not in make_environment().globals
+
+
+def test_shared_bytecode_cache_memory(tmp_pathplus: PathPlus, monkeypatch):
+	(tmp_pathplus / "template.txt").write_text("Hello {{ name }}")
+	bytecode_cache = SharedBytecodeCache()
+
+	environment = make_cached_environment(bytecode_cache, tmp_pathplus)
+	assert environment.get_template("template.txt").render(name="World") == "Hello World"
+
+	def compile(*args, **kwargs):  # noqa: A001  # pylint: disable=redefined-builtin
+		raise AssertionError("Template was compiled")
+
+	with monkeypatch.context() as m:
+		m.setattr(jinja2.Environment, "compile", compile)
+		environment = make_cached_environment(bytecode_cache, tmp_pathplus)
+		assert environment.get_template("template.txt").render(name="Octocat") == "Hello Octocat"
+
+	# Changing the source invalidates the cached template
+	(tmp_pathplus / "template.txt").write_text("Goodbye {{ name }}")
+	environment = make_cached_environment(bytecode_cache, tmp_pathplus)
+	assert environment.get_template("template.txt").render(name="World") == "Goodbye World"
+
+
+def test_shared_bytecode_cache_disk(tmp_pathplus: PathPlus, monkeypatch):
+	(tmp_pathplus / "templates").mkdir()
+	(tmp_pathplus / "templates" / "template.txt").write_text("Hello {{ name }}")
+
+	environment = make_cached_environment(SharedBytecodeCache(tmp_pathplus / "cache"), tmp_pathplus / "templates")
+	assert environment.get_template("template.txt").render(name="World") == "Hello World"
+	assert list((tmp_pathplus / "cache").iterdir())
+
+	def compile(*args, **kwargs):  # noqa: A001  # pylint: disable=redefined-builtin
+		raise AssertionError("Template was compiled")
+
+	monkeypatch.setattr(jinja2.Environment, "compile", compile)
+
+	environment = make_cached_environment(SharedBytecodeCache(tmp_pathplus / "cache"), tmp_pathplus / "templates")
+	assert environment.get_template("template.txt").render(name="Octocat") == "Hello Octocat"
@@ -21,15 +21,26 @@
 #
 
 # stdlib
+import os
 from textwrap import dedent
 
 # 3rd party
 import pytest
+from domdf_python_tools.paths import PathPlus
 from pytest_regressions.data_regression import DataRegressionFixture
+from southwark import status
 
 # this package
 from repo_helper.configuration.utils import get_version_classifiers
-from repo_helper.utils import indent_with_tab, pformat_tabs
+from repo_helper.utils import (
+		assert_clean,
+		commit_changes,
+		indent_with_tab,
+		path_status,
+		pformat_tabs,
+		stage_changes,
+		working_tree_status
+		)
 
 
 def test_indent_with_tab():
@@ -92,3 +103,127 @@ def test_pformat_tabs():
 		)
 def test_get_version_classifiers(python_versions, data_regression: DataRegressionFixture):
 	data_regression.check(get_version_classifiers(python_versions))
+
+
+@pytest.fixture()
+def changed_repo(temp_empty_repo):
+	repo_path = PathPlus(temp_empty_repo.path)
+
+	for filename in ["unchanged.txt", "modified.txt", "deleted.txt", "staged.txt", "dir/nested.txt"]:
+		(repo_path / filename).parent.maybe_make()
+		(repo_path / filename).write_text(f"This is {filename}\n")
+
+	(repo_path / ".gitignore").write_lines(["ignored.txt", "venv/"])
+	stage_changes(temp_empty_repo, [".gitignore", "unchanged.txt", "modified.txt", "deleted.txt", "staged.txt"])
+	stage_changes(temp_empty_repo, ["dir/nested.txt"])
+	commit_changes(temp_empty_repo, "Initial commit")
+
+	(repo_path / "modified.txt").write_text("This file has been modified.\n")
+	(repo_path / "deleted.txt").unlink()
+	(repo_path / "staged.txt").write_text("This file has been staged.\n")
+	stage_changes(temp_empty_repo, ["staged.txt"])
+	(repo_path / "untracked.txt").write_text("This file is untracked.\n")
+	(repo_path / "ignored.txt").write_text("This file is ignored.\n")
+	(repo_path / "venv" / "lib").mkdir(parents=True)
+	(repo_path / "venv" / "lib" / "module.py").write_text("print('hello world')\n")
+
+	return temp_empty_repo
+
+
+def test_path_status(changed_repo):
+	filenames = [
+			"unchanged.txt",
+			"modified.txt",
+			"deleted.txt",
+			"staged.txt",
+			"untracked.txt",
+			"ignored.txt",
+			"dir",
+			"dir/nested.txt",
+			"missing.txt",
+			]
+	stat = path_status(changed_repo, filenames)
+
+	assert stat.staged == {"add": [], "delete": [], "modify": [PathPlus("staged.txt")]}
+	assert stat.unstaged == [PathPlus("modified.txt"), PathPlus("deleted.txt")]
+	assert stat.untracked == [PathPlus("untracked.txt")]
+
+	# The same as southwark.status(), but limited to the given files.
+	full_stat = status(changed_repo)
+	assert sorted(stat.unstaged) == sorted(full_stat.unstaged)
+	assert stat.staged == full_stat.staged
+	assert stat.untracked == [PathPlus(filename) for filename in full_stat.untracked if filename.name in filenames]
+
+
+def test_stage_changes(changed_repo):
+	repo_path = PathPlus(changed_repo.path)
+
+	staged_files = stage_changes(
+			changed_repo,
+			["unchanged.txt", "modified.txt", repo_path / "deleted.txt", "staged.txt", "untracked.txt", "ignored.txt"],
+			)
+
+	assert staged_files == [
+			PathPlus("modified.txt"),
+			PathPlus("deleted.txt"),
+			PathPlus("staged.txt"),
+			PathPlus("untracked.txt"),
+			]
+
+	stat = status(changed_repo)
+	assert stat.unstaged == []
+	assert stat.untracked == []
+	assert stat.staged == {
+			"add": [PathPlus("untracked.txt")],
+			"delete": [PathPlus("deleted.txt")],
+			"modify": [PathPlus("modified.txt"), PathPlus("staged.txt")],
+			}
+
+
+def test_working_tree_status(changed_repo):
+	stat = working_tree_status(changed_repo)
+
+	assert stat.staged == {"add": [], "delete": [], "modify": [PathPlus("staged.txt")]}
+	assert stat.unstaged == [PathPlus("deleted.txt"), PathPlus("modified.txt")]
+	assert stat.untracked == [PathPlus("untracked.txt")]
+
+	full_stat = status(changed_repo)
+	assert stat.staged == full_stat.staged
+	assert sorted(stat.unstaged) == sorted(full_stat.unstaged)
+	assert stat.untracked == sorted(full_stat.untracked)
+
+	assert working_tree_status(changed_repo, untracked=False).untracked == []
+
+
+def test_working_tree_status_stat_cache(temp_empty_repo):
+	repo_path = PathPlus(temp_empty_repo.path)
+	(repo_path / "file.txt").write_text("Hello World\n")
+
+	# Make the file older than the index, so its stat data can be trusted.
+	os.utime(repo_path / "file.txt", (1_000_000_000, 1_000_000_000))
+	stage_changes(temp_empty_repo, ["file.txt"])
+	commit_changes(temp_empty_repo, "Initial commit")
+
+	assert working_tree_status(temp_empty_repo).unstaged == []
+
+	# Same size and mtime, so the change is not noticed, as with git.
+	(repo_path / "file.txt").write_text("Hello Earth\n")
+	os.utime(repo_path / "file.txt", (1_000_000_000, 1_000_000_000))
+	assert working_tree_status(temp_empty_repo).unstaged == []
+
+	(repo_path / "file.txt").write_text("Hello Everyone\n")
+	os.utime(repo_path / "file.txt", (1_000_000_000, 1_000_000_000))
+	assert working_tree_status(temp_empty_repo).unstaged == [PathPlus("file.txt")]
+
+
+def test_assert_clean(changed_repo, capsys):
+	assert not assert_clean(changed_repo.path)
+	assert capsys.readouterr().err.splitlines() == [
+			"Git working directory is not clean:",
+			"  M deleted.txt",
+			"  M modified.txt",
+			"  M staged.txt",
+			]
+
+	assert assert_clean(changed_repo.path, allow_config=["deleted.txt", "modified.txt", "staged.txt"])
+	assert not capsys.readouterr().err